@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Benchmark: asyncio frame delivery — AsyncAriaBridgeObserver vs thread + poll.
+
+Starts ``src/receiver/mock_receiver.py`` and consumes its frames from an
+asyncio task in two ways:
+
+* ``thread-poll`` — today's bridge: AriaBridgeObserver plus a polling
+  thread that hands new frames to the loop with ``call_soon_threadsafe``
+* ``async``       — AsyncAriaBridgeObserver.aiter_frames()
+
+Reports frame age at consumption (mock timestamp → coroutine), delivered
+FPS and process CPU%.
+
+Usage:
+    python3 benchmarks/bench_async.py
+    python3 benchmarks/bench_async.py --fps 30 --width 1408 --height 1408 --duration 10 --json
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+from aria_arm64_bridge import AriaBridgeObserver, AsyncAriaBridgeObserver
+
+MOCK_RECEIVER = ROOT / "src" / "receiver" / "mock_receiver.py"
+
+
+def summarize(name, ages_ns, frames, wall, cpu):
+    ages_ms = np.asarray(ages_ns, dtype=np.float64) / 1e6
+    return {
+        "mode": name,
+        "frames": frames,
+        "fps": frames / wall if wall > 0 else 0.0,
+        "age_p50_ms": float(np.percentile(ages_ms, 50)) if frames else None,
+        "age_p99_ms": float(np.percentile(ages_ms, 99)) if frames else None,
+        "cpu_percent": 100.0 * cpu / wall if wall > 0 else 0.0,
+    }
+
+
+async def run_thread_poll(endpoint, duration, poll_interval):
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    observer = AriaBridgeObserver(zmq_endpoint=endpoint)
+    stop = threading.Event()
+
+    def poller():
+        version = -1
+        while not stop.is_set():
+            frame, new_version = observer.get_frame_if_new("rgb", version)
+            if frame is not None:
+                version = new_version
+                loop.call_soon_threadsafe(queue.put_nowait,
+                                          (frame, observer.get_timestamp("rgb")))
+            else:
+                time.sleep(poll_interval)
+
+    thread = threading.Thread(target=poller, daemon=True)
+    thread.start()
+
+    ages = []
+    wall0, cpu0 = time.monotonic(), time.process_time()
+    deadline = wall0 + duration
+    try:
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                _, ts = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            ages.append(time.monotonic_ns() - ts)
+    finally:
+        wall, cpu = time.monotonic() - wall0, time.process_time() - cpu0
+        stop.set()
+        thread.join(timeout=2)
+        observer.stop()
+    return summarize("thread-poll", ages, len(ages), wall, cpu)
+
+
+async def run_async(endpoint, duration):
+    ages = []
+    async with AsyncAriaBridgeObserver(zmq_endpoint=endpoint) as observer:
+        wall0, cpu0 = time.monotonic(), time.process_time()
+        deadline = wall0 + duration
+        version = -1
+        while (remaining := deadline - time.monotonic()) > 0:
+            frame, version = await observer.next_frame("rgb", version, timeout=remaining)
+            if frame is None:
+                break
+            ages.append(time.monotonic_ns() - observer.get_timestamp("rgb"))
+        wall, cpu = time.monotonic() - wall0, time.process_time() - cpu0
+    return summarize("async", ages, len(ages), wall, cpu)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Async vs thread+poll frame delivery")
+    parser.add_argument("--zmq-endpoint", default="tcp://127.0.0.1:5580")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per mode")
+    parser.add_argument("--poll-interval", type=float, default=0.01,
+                        help="thread-poll sleep between empty polls (s)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    mock = subprocess.Popen(
+        [sys.executable, str(MOCK_RECEIVER), "--zmq-endpoint", args.zmq_endpoint,
+         "--fps", str(args.fps), "--width", str(args.width), "--height", str(args.height)],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        time.sleep(1.0)  # let the mock bind
+        results = [
+            asyncio.run(run_thread_poll(args.zmq_endpoint, args.duration, args.poll_interval)),
+            asyncio.run(run_async(args.zmq_endpoint, args.duration)),
+        ]
+    finally:
+        mock.terminate()
+        mock.wait(timeout=5)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<12} {'frames':>7} {'fps':>7} {'age p50':>9} {'age p99':>9} {'cpu':>7}")
+    for r in results:
+        if not r["frames"]:
+            print(f"{r['mode']:<12} {0:>7}  (no frames)")
+            continue
+        print(f"{r['mode']:<12} {r['frames']:>7} {r['fps']:>7.1f} "
+              f"{r['age_p50_ms']:>7.2f}ms {r['age_p99_ms']:>7.2f}ms {r['cpu_percent']:>6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
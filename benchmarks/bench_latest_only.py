@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark: frame age at consumption — HWM queues vs ``latest_only``.
+
+Starts ``src/receiver/mock_receiver.py`` and runs a slow "detector" loop
+against it: busy Python work (holds the GIL, like a real model's pre/post
+processing) followed by ``get_latest("rgb")``. Two observer modes:
+
+* ``hwm``         — today's default: frames queue up to the HWM on both
+  sides and are processed in order while the detector hogs the GIL
+* ``latest_only`` — each recv drains the channel to its newest frame
+
+Reports the age of the frame the detector gets (mock timestamp → read),
+how many frames the observer processed and how many it skipped.
+
+Usage:
+    python3 benchmarks/bench_latest_only.py
+    python3 benchmarks/bench_latest_only.py --fps 60 --detect-ms 80 --duration 10 --json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+from aria_arm64_bridge import AriaBridgeObserver
+
+MOCK_RECEIVER = ROOT / "src" / "receiver" / "mock_receiver.py"
+
+
+def busy(ms):
+    """Pure-Python work for *ms* milliseconds — keeps the GIL busy."""
+    end = time.perf_counter() + ms / 1000
+    x = 0
+    while time.perf_counter() < end:
+        for i in range(1000):
+            x += i
+    return x
+
+
+def run_mode(name, endpoint, duration, detect_ms, hwm):
+    observer = AriaBridgeObserver(zmq_endpoint=endpoint, hwm=hwm,
+                                  latest_only=(name == "latest_only"))
+    try:
+        observer.wait_for_frame("rgb", timeout=5)
+        frames0 = observer.get_stats()["frames"]["rgb"]
+        ages = []
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            busy(detect_ms)
+            frame = observer.get_latest("rgb")
+            if frame is not None:
+                ages.append(time.monotonic_ns() - frame.timestamp)
+        stats = observer.get_stats()
+    finally:
+        observer.stop()
+
+    ages_ms = np.asarray(ages, dtype=np.float64) / 1e6
+    return {
+        "mode": name,
+        "reads": len(ages),
+        "age_p50_ms": float(np.percentile(ages_ms, 50)) if ages else None,
+        "age_p99_ms": float(np.percentile(ages_ms, 99)) if ages else None,
+        "processed": stats["frames"]["rgb"] - frames0,
+        "superseded": stats.get("superseded", {}).get("rgb", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HWM queues vs latest_only frame age")
+    parser.add_argument("--zmq-endpoint", default="tcp://127.0.0.1:5580")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--width", type=int, default=1408)
+    parser.add_argument("--height", type=int, default=1408)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per mode")
+    parser.add_argument("--detect-ms", type=float, default=100.0,
+                        help="busy work per detector iteration (ms)")
+    parser.add_argument("--hwm", type=int, default=2, help="observer receive HWM")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    mock = subprocess.Popen(
+        [sys.executable, str(MOCK_RECEIVER), "--zmq-endpoint", args.zmq_endpoint,
+         "--fps", str(args.fps), "--width", str(args.width), "--height", str(args.height)],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        time.sleep(1.0)  # let the mock bind
+        results = [run_mode(name, args.zmq_endpoint, args.duration, args.detect_ms, args.hwm)
+                   for name in ("hwm", "latest_only")]
+    finally:
+        mock.terminate()
+        mock.wait(timeout=5)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<12} {'reads':>6} {'age p50':>9} {'age p99':>9} {'processed':>10} "
+          f"{'superseded':>11}")
+    for r in results:
+        if not r["reads"]:
+            print(f"{r['mode']:<12} {0:>6}  (no frames)")
+            continue
+        print(f"{r['mode']:<12} {r['reads']:>6} {r['age_p50_ms']:>7.2f}ms "
+              f"{r['age_p99_ms']:>7.2f}ms {r['processed']:>10} {r['superseded']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Microbenchmark: ``_process_frame`` transforms, NumPy vs tiled path.
+
+Times :func:`aria_arm64_bridge.transforms.process_frame` on this CPU for
+every camera (Aria gen1 shapes: RGB at ``--rgb``, SLAM 640x480, eye
+640x240) and output layout, with each implementation forced, and shows
+which one ``path="auto"`` settles on. Frames are written into a reused
+output buffer, as the observer's frame pool does. Reports ms/frame
+(median over ``--frames`` calls).
+
+Usage:
+    python3 benchmarks/bench_transforms.py
+    python3 benchmarks/bench_transforms.py --rgb 2880x2880 --formats bgr_hwc,rgb_chw --json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+from aria_arm64_bridge.transforms import (
+    CALIBRATION_FRAMES, OUTPUT_FORMATS, output_shape, process_frame, selected_path,
+)
+
+# (width, height) of the mono cameras; raw frames are (height, width[, 3])
+MONO_SHAPES = {"slam1": (640, 480), "slam2": (640, 480), "eye": (640, 240)}
+
+
+def time_path(cam, raw, fmt, mono, path, frames):
+    out = np.empty(output_shape(cam, raw, fmt, mono), dtype=np.uint8)
+    process_frame(cam, raw, fmt, out, mono, path=path)  # warm-up
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter_ns()
+        process_frame(cam, raw, fmt, out, mono, path=path)
+        times.append(time.perf_counter_ns() - start)
+    return float(np.median(times)) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="process_frame microbenchmark")
+    parser.add_argument("--rgb", default="1408x1408", help="RGB resolution (WxH)")
+    parser.add_argument("--cameras", default="rgb,slam1,slam2,eye")
+    parser.add_argument("--formats", default=",".join(OUTPUT_FORMATS))
+    parser.add_argument("--mono", default="stack", choices=("stack", "single"),
+                        help="Mono mode for SLAM / eye frames")
+    parser.add_argument("--frames", type=int, default=30, help="Timed calls per case")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    width, height = (int(v) for v in args.rgb.split("x"))
+    results = []
+    for cam in args.cameras.split(","):
+        if cam == "rgb":
+            raw = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        else:
+            w, h = MONO_SHAPES[cam]
+            raw = rng.integers(0, 256, (h, w), dtype=np.uint8)
+        for fmt in args.formats.split(","):
+            numpy_ms = time_path(cam, raw, fmt, args.mono, "numpy", args.frames)
+            tiled_ms = time_path(cam, raw, fmt, args.mono, "tiled", args.frames)
+            for _ in range(2 * CALIBRATION_FRAMES):
+                process_frame(cam, raw, fmt, mono=args.mono)
+            result = {
+                "camera": cam, "shape": list(raw.shape), "format": fmt, "mono": args.mono,
+                "numpy_ms": numpy_ms, "tiled_ms": tiled_ms,
+                "speedup": numpy_ms / tiled_ms if tiled_ms else None,
+                "auto": selected_path(cam, raw, fmt, args.mono),
+            }
+            results.append(result)
+            if not args.json:
+                print(f"{cam:<6} {fmt:<8} numpy {numpy_ms:>7.3f} ms  tiled {tiled_ms:>7.3f} ms  "
+                      f"x{result['speedup']:.2f}  auto → {result['auto']}", flush=True)
+
+    if args.json:
+        print(json.dumps({
+            "host": {"machine": platform.machine(), "processor": platform.processor(),
+                     "python": platform.python_version(), "numpy": np.__version__,
+                     "cpus": os.cpu_count()},
+            "results": results,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
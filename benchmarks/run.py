@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark suite: sender → transport → AriaBridgeObserver.
+
+Runs every combination of
+
+* transport        — ``tcp``, ``ipc``, ``shm``
+* queue setting    — a socket HWM (``2``, ``8``, ...) or ``latest``
+  (``latest_only=True``, the bridge's conflation mode)
+* RGB resolution   — e.g. ``1408x1408``
+* camera mix       — ``+``-joined cameras, e.g. ``rgb+slam1+slam2``
+
+against ``src/receiver/mock_receiver.py`` (or a recording served by
+``aria-bridge-replay`` with ``--replay``). Each scenario runs in a fresh
+process, so CPU and memory figures are its own. Per scenario it reports,
+measured after a warm-up:
+
+* frames/s per camera and the drop rate (send + transport drops over
+  frames offered; ``latest`` skips are reported apart, as superseded)
+* transport and end-to-end latency p50/p99 (last 1024 frames)
+* CPU% and RSS of the observer process and of the sender
+
+Results are JSON (``--output``). ``--compare BASELINE.json`` flags
+scenarios whose throughput fell or whose p99 latency grew by more than
+``--tolerance`` and exits non-zero, so a slower ``_receive_loop`` or
+``_process_frame`` shows up before deployment.
+
+Usage:
+    python3 benchmarks/run.py --quick --output bench.json
+    python3 benchmarks/run.py --transports shm --queues 2,latest --mixes rgb,rgb+slam1+slam2+eye
+    python3 benchmarks/run.py --quick --compare bench.json
+    python3 benchmarks/run.py --replay /data/session-01 --transports tcp,shm
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+from aria_arm64_bridge import AriaBridgeObserver
+from aria_arm64_bridge.protocol import CHANNEL_STREAMS
+
+MOCK_RECEIVER = ROOT / "src" / "receiver" / "mock_receiver.py"
+ENDPOINTS = {
+    "tcp": "tcp://127.0.0.1:5620",  # other cameras on 5621..5624
+    "ipc": "ipc:///tmp/aria-bench",
+    "shm": "shm://aria-bench",
+}
+QUICK = {"transports": "tcp,ipc,shm", "queues": "2,latest", "resolutions": "704x704",
+         "mixes": "rgb,rgb+slam1+slam2", "duration": 2.0, "warmup": 0.5}
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def usage(pid):
+    """``(cpu seconds, RSS bytes)`` of process *pid*, from /proc."""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS  # utime + stime
+    with open(f"/proc/{pid}/status") as f:
+        rss = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmRSS:"))
+    return cpu, rss
+
+
+def sender_command(scenario):
+    endpoint = ENDPOINTS[scenario["transport"]]
+    hwm = scenario["hwm"]
+    if scenario.get("replay"):
+        return [sys.executable, "-m", "aria_arm64_bridge.replay", scenario["replay"],
+                "--zmq-endpoint", endpoint, "--mode", scenario["replay_mode"], "--loop", "0",
+                "--hwm", str(hwm), "--wait", "0"]
+    width, height = scenario["resolution"].split("x")
+    return [sys.executable, str(MOCK_RECEIVER), "--zmq-endpoint", endpoint,
+            "--cameras", ",".join(scenario["cameras"]), "--fps", scenario["fps"],
+            "--scale", str(scenario["scale"]), "--width", width, "--height", height,
+            "--hwm", str(hwm)]
+
+
+def run_scenario(scenario):
+    """Run one scenario (in its own process) and return its results."""
+    cameras = scenario["cameras"]
+    streams = tuple(dict.fromkeys(CHANNEL_STREAMS[c] for c in cameras))
+    env = {**os.environ, "PYTHONPATH": str(ROOT / "src")}
+    sender = subprocess.Popen(sender_command(scenario), stdout=subprocess.DEVNULL, env=env)
+    observer = AriaBridgeObserver(zmq_endpoint=ENDPOINTS[scenario["transport"]],
+                                  streams=streams, cameras=cameras, hwm=scenario["hwm"],
+                                  latest_only=scenario["latest_only"])
+    try:
+        frame, _ = observer.wait_for_frame(cameras[0], timeout=15)
+        if frame is None:
+            return {**scenario, "error": "no frames from the sender"}
+        time.sleep(scenario["warmup"])
+
+        before = observer.get_stats()
+        wall0, cpu0, sender_cpu0 = time.monotonic(), usage(os.getpid())[0], usage(sender.pid)[0]
+        time.sleep(scenario["duration"])
+        wall = time.monotonic() - wall0
+        cpu, rss = usage(os.getpid())
+        sender_cpu, sender_rss = usage(sender.pid)
+        after = observer.get_stats()
+    finally:
+        observer.stop()
+        sender.terminate()
+        sender.wait(timeout=5)
+
+    result = {**scenario, "cameras": {}}
+    for camera in cameras:
+        frames = after["frames"][camera] - before["frames"][camera]
+        drops0 = before.get("drops", {}).get(camera, {})
+        drops1 = after.get("drops", {}).get(camera, {})
+        lost = sum((drops1.get(k) or 0) - (drops0.get(k) or 0) for k in ("send", "transport"))
+        superseded = (after.get("superseded", {}).get(camera, 0)
+                      - before.get("superseded", {}).get(camera, 0))
+        result["cameras"][camera] = {
+            "fps": frames / wall,
+            "drop_rate": lost / (frames + lost) if frames + lost else 0.0,
+            "superseded": superseded,
+        }
+    latency = after.get("latency", {})
+    for stage in ("transport", "end_to_end"):
+        if stage in latency:
+            result[f"{stage}_p50_ms"] = latency[stage]["p50_ms"]
+            result[f"{stage}_p99_ms"] = latency[stage]["p99_ms"]
+    result["fps"] = sum(c["fps"] for c in result["cameras"].values())
+    result["observer_cpu_percent"] = 100.0 * (cpu - cpu0) / wall
+    result["observer_rss_mb"] = rss / 2**20
+    result["sender_cpu_percent"] = 100.0 * (sender_cpu - sender_cpu0) / wall
+    result["sender_rss_mb"] = sender_rss / 2**20
+    return result
+
+
+def scenarios(args):
+    if args.replay:
+        from aria_arm64_bridge.record import SessionReader
+        reader = SessionReader(args.replay)
+        mixes = ["+".join(c for c in reader.metadata.get("channels", ()) if c != "imu")]
+        resolutions = ["recorded"]
+        reader.close()
+    else:
+        mixes = args.mixes.split(",")
+        resolutions = args.resolutions.split(",")
+    for transport, queue, resolution, mix in itertools.product(
+            args.transports.split(","), args.queues.split(","), resolutions, mixes):
+        latest_only = queue == "latest"
+        yield {
+            "name": f"{transport}/{queue}/{resolution}/{mix}",
+            "transport": transport,
+            "queue": queue,
+            "hwm": 2 if latest_only else int(queue),
+            "latest_only": latest_only,
+            "resolution": resolution,
+            "cameras": mix.split("+"),
+            "fps": args.fps,
+            "scale": args.scale,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "replay": args.replay,
+            "replay_mode": args.replay_mode,
+        }
+
+
+def compare(results, baseline, tolerance):
+    """Scenarios that got slower than *baseline* by more than *tolerance*."""
+    old = {r["name"]: r for r in baseline["results"] if "error" not in r}
+    regressions = []
+    for r in results:
+        b = old.get(r["name"])
+        if b is None or "error" in r:
+            continue
+        if r["fps"] < b["fps"] * (1 - tolerance):
+            regressions.append(f"{r['name']}: {b['fps']:.1f} → {r['fps']:.1f} fps")
+        for key in ("transport_p99_ms", "end_to_end_p99_ms"):
+            if key in r and key in b and r[key] > b[key] * (1 + tolerance):
+                regressions.append(f"{r['name']}: {key} {b[key]:.2f} → {r[key]:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end bridge benchmark suite")
+    parser.add_argument("--transports", default="tcp,ipc,shm")
+    parser.add_argument("--queues", default="2,8,latest",
+                        help="Socket HWMs and/or 'latest' (latest_only)")
+    parser.add_argument("--resolutions", default="1408x1408,704x704", help="RGB resolutions")
+    parser.add_argument("--mixes", default="rgb,rgb+slam1+slam2,rgb+slam1+slam2+eye",
+                        help="Camera mixes, cameras joined by '+'")
+    parser.add_argument("--fps", default="rgb=30,slam=49,eye=30",
+                        help="Mock rates per stream or camera")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply the mock rates")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds measured per scenario")
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--replay", default=None,
+                        help="Benchmark against this recording (aria-bridge-replay) "
+                             "instead of the mock")
+    parser.add_argument("--replay-mode", default="fast", choices=("realtime", "rate", "fast"))
+    parser.add_argument("--quick", action="store_true",
+                        help=f"Small matrix for CI: {QUICK}")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    parser.add_argument("--compare", default=None, help="Baseline JSON to check against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed fps drop / p99 increase vs the baseline (default: 0.2)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    if args.quick:
+        for key, value in QUICK.items():
+            if getattr(args, key) == parser.get_default(key):  # explicit flags win
+                setattr(args, key, value)
+
+    # A fresh process per scenario: its CPU and RSS are the scenario's own
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for scenario in scenarios(args):
+        with ctx.Pool(1) as pool:
+            result = pool.apply(run_scenario, (scenario,))
+        results.append(result)
+        if not args.json:
+            if "error" in result:
+                print(f"{result['name']:<40} ERROR: {result['error']}")
+                continue
+            drops = max(c["drop_rate"] for c in result["cameras"].values())
+            print(f"{result['name']:<40} {result['fps']:>7.1f} fps "
+                  f"p50 {result.get('end_to_end_p50_ms', float('nan')):>7.2f}ms "
+                  f"p99 {result.get('end_to_end_p99_ms', float('nan')):>7.2f}ms "
+                  f"drops {100 * drops:>5.1f}% cpu {result['observer_cpu_percent']:>5.1f}% "
+                  f"rss {result['observer_rss_mb']:>6.1f}MB", flush=True)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": {"machine": platform.machine(), "python": platform.python_version(),
+                 "cpus": os.cpu_count()},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,12 +27,13 @@ def main():
         print("Streaming — press Ctrl+C to stop\n")
 
         count = 0
+        version = -1
         t0 = time.monotonic()
 
         while bridge.is_running:
-            frame = bridge.get_frame("rgb")
+            # Blocks until the next frame — no polling; timeout re-checks is_running
+            frame, version = bridge.wait_for_frame("rgb", version, timeout=1.0)
             if frame is None:
-                time.sleep(0.01)
                 continue
 
             count += 1
@@ -6,8 +6,14 @@
 #   ./scripts/launch_pipeline.sh wifi 192.168.1.42
 #
 # Starts two processes:
-#   1. FEX-Emu receiver (Aria SDK → ZMQ)
-#   2. Docker aria-guard (ZMQ → YOLO + Depth + Dashboard)
+#   1. FEX-Emu receiver (Aria SDK → ZMQ), src/aria_arm64_bridge/receiver.py:
+#      protocol v3, one channel per camera, control socket on port + 5.
+#      Extra receiver flags go in RECEIVER_EXTRA, e.g.
+#      RECEIVER_EXTRA="--streams rgb,slam --hwm slam=4" ./scripts/launch_pipeline.sh
+#   2. Docker aria-guard (ZMQ → YOLO + Depth + Dashboard). The package is
+#      mounted at /bridge-src; the aria:bridge source must use
+#      aria_arm64_bridge.AriaBridgeObserver (the v2 src/bridge observer
+#      cannot parse v3 headers).
 #
 # Dashboard: http://<jetson-ip>:5000
 
@@ -20,7 +26,7 @@ DEVICE_IP="${2:-}"
 MODE="${3:-all}"
 
 # Receiver args
-RECEIVER_ARGS="--interface $INTERFACE"
+RECEIVER_ARGS="--interface $INTERFACE ${RECEIVER_EXTRA:-}"
 if [ "$INTERFACE" = "wifi" ] && [ -n "$DEVICE_IP" ]; then
     RECEIVER_ARGS="$RECEIVER_ARGS --device-ip $DEVICE_IP"
 elif [ "$INTERFACE" = "wifi" ] && [ -z "$DEVICE_IP" ]; then
@@ -96,7 +102,7 @@ trap cleanup EXIT INT TERM
 
 # 1. Start FEX-Emu receiver
 echo "[pipeline] Starting FEX-Emu receiver..."
-PYTHONNOUSERSITE=1 FEXBash -c "python3 $PROJECT_DIR/src/receiver/aria_receiver.py $RECEIVER_ARGS" &
+PYTHONNOUSERSITE=1 FEXBash -c "python3 $PROJECT_DIR/src/aria_arm64_bridge/receiver.py $RECEIVER_ARGS" &
 RECEIVER_PID=$!
 sleep 3
 
@@ -109,9 +115,10 @@ echo "[pipeline] Telemetry → $TELEMETRY_LOG"
 echo "[pipeline] Starting aria-guard in Docker..."
 docker run --runtime nvidia --network host --rm \
     -v "$PROJECT_DIR/src/bridge":/bridge \
+    -v "$PROJECT_DIR/src":/bridge-src \
     -v "$HOME/Projects/aria-guard":/app \
     aria-demo:jetson bash -c \
-    "pip3 install -q pyzmq 'numpy<2' --force-reinstall && PYTHONPATH=/bridge python3 run.py aria:bridge $MODE --no-tts" &
+    "pip3 install -q pyzmq 'numpy<2' --force-reinstall && PYTHONPATH=/bridge-src:/bridge python3 run.py aria:bridge $MODE --no-tts" &
 GUARD_PID=$!
 
 echo "[pipeline] All processes started."
@@ -8,9 +8,11 @@ Quick start::
         frame = bridge.get_frame("rgb")  # numpy BGR uint8
 
 For lower-level access, use :class:`AriaBridgeObserver` directly
-(requires running the receiver separately).
+(requires running the receiver separately), or
+:class:`AsyncAriaBridgeObserver` from asyncio code.
 """
 
+from .aio import AsyncAriaBridgeObserver
 from .bridge import AriaBridge
 from .observer import AriaBridgeObserver, Frame
 from .protocol import (
@@ -24,6 +26,7 @@ __version__ = "0.1.0"
 __all__ = [
     "AriaBridge",
     "AriaBridgeObserver",
+    "AsyncAriaBridgeObserver",
     "Frame",
     "DEFAULT_ZMQ_ENDPOINT",
     "PROFILE_STREAMING",
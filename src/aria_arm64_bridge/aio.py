@@ -0,0 +1,162 @@
+"""asyncio frame stream — receive Aria frames on the event loop.
+
+:class:`AsyncAriaBridgeObserver` is an :class:`AriaBridgeObserver` without
+a receive thread: the transport socket's file descriptor is registered
+with the running event loop (``loop.add_reader``), messages are decoded
+in the reader callback and awaiting coroutines are resumed directly — no
+polling thread and no cross-thread hand-off per frame.
+
+Usage::
+
+    async def main():
+        async with AsyncAriaBridgeObserver(lazy=True) as observer:
+            async for frame in observer.aiter_frames("rgb"):
+                await broadcast(frame)
+
+The synchronous API (``get_frame``, ``wait_for_frame``, ...) keeps working
+from other threads. Frames are processed on the event loop, so prefer
+``lazy=True`` (processing then happens on first read) when the loop has
+other latency-sensitive work.
+"""
+
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import numpy as np
+import zmq
+
+from .observer import AriaBridgeObserver
+
+# Upper bound on messages handled per reader callback, so a burst cannot
+# starve the other tasks on the loop
+_MAX_BATCH = 16
+
+
+class AsyncAriaBridgeObserver(AriaBridgeObserver):
+    """:class:`AriaBridgeObserver` driven by the running asyncio event loop.
+
+    Must be created inside a running loop and stopped from the loop thread.
+    Accepts the same arguments as :class:`AriaBridgeObserver`.
+    """
+
+    def _start_receiver(self):
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            raise RuntimeError(
+                "AsyncAriaBridgeObserver must be created inside a running event loop"
+            ) from None
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._closed = False
+        self._ctx = zmq.Context()
+        # ZMQ's FD is edge-triggered: drain until EVENTS clears on every wakeup
+        self._fds = []
+        for source in self._open_sources(self._ctx).values():
+            fd = source.socket.getsockopt(zmq.FD)
+            self._loop.add_reader(fd, self._drain, source)
+            self._loop.call_soon(self._drain, source)
+            self._fds.append(fd)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def next_frame(self, camera: str = "rgb", after_version: int = -1,
+                         timeout: Optional[float] = None,
+                         output_format: Optional[str] = None) -> Tuple[Optional[np.ndarray], int]:
+        """Await a frame newer than *after_version*.
+
+        Coroutine counterpart of :meth:`wait_for_frame`: returns
+        ``(frame, version)``, or ``(None, after_version)`` on timeout or stop.
+        """
+        deadline = None if timeout is None else self._loop.time() + timeout
+        while True:
+            frame, v = self.get_frame_if_new(camera, after_version, output_format)
+            if frame is not None:
+                return frame, v
+            if self._closed:
+                return None, after_version
+
+            waiter = self._loop.create_future()
+            self._waiters.setdefault(camera, []).append(waiter)
+            remaining = None if deadline is None else deadline - self._loop.time()
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                return None, after_version
+            finally:
+                if waiter in self._waiters.get(camera, ()):
+                    self._waiters[camera].remove(waiter)
+
+    async def aiter_frames(self, camera: str = "rgb",
+                           output_format: Optional[str] = None) -> AsyncIterator[np.ndarray]:
+        """Async-iterate over new frames for *camera* until the observer stops.
+
+        Like :meth:`frames`, skips frames published while you were busy.
+        """
+        version = -1
+        while True:
+            frame, version = await self.next_frame(camera, version, output_format=output_format)
+            if frame is None:
+                return
+            yield frame
+
+    def stop(self):
+        """Unregister from the event loop and close the transport."""
+        if self._closed:
+            return
+        self._closed = True
+        with self._new_frame:
+            self._stop_event.set()
+            self._new_frame.notify_all()
+        for fd in self._fds:
+            self._loop.remove_reader(fd)
+        for source in self._sources.values():
+            source.close()
+        self._ctx.term()
+        self._wake_all()
+        self._close_callbacks()
+        if self._telemetry:
+            self._telemetry.stop()
+
+    async def aclose(self):
+        self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        return not self._closed
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _drain(self, source):
+        if self._closed:
+            return
+        socket = source.socket
+        for _ in range(_MAX_BATCH):
+            if not socket.getsockopt(zmq.EVENTS) & zmq.POLLIN:
+                return
+            received = source.recv()
+            if received is None:
+                continue
+            cam_name = self._handle_message(*received, superseded=source.skipped)
+            if cam_name is not None:
+                self._wake(cam_name)
+        # Batch limit hit with messages still queued — continue next iteration
+        self._loop.call_soon(self._drain, source)
+
+    def _wake(self, camera: str):
+        for waiter in self._waiters.pop(camera, ()):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _wake_all(self):
+        for camera in list(self._waiters):
+            self._wake(camera)
@@ -16,6 +16,21 @@ Example::
             print(frame.shape)
 
     bridge.stop()
+
+To keep the receiver (and the device session) alive across application
+restarts, run ``aria-bridge-daemon`` once and attach to it instead::
+
+    bridge = AriaBridge(attach=True)
+    bridge.start()   # no receiver launch — first frame in milliseconds
+
+The running receiver can be reconfigured without a restart, e.g. to shed
+SLAM while the glasses are thermally throttled::
+
+    bridge = AriaBridge(streams=("rgb", "slam"))
+    bridge.start()
+    bridge.unsubscribe("slam")   # or pause("slam") — RGB keeps streaming
+    ...
+    bridge.subscribe("slam")
 """
 
 import os
@@ -24,12 +39,18 @@ import subprocess
 import threading
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
+from .control import control_request, daemon_request
+from .imu import IMU_DTYPE
 from .observer import AriaBridgeObserver, Frame
-from .protocol import DEFAULT_ZMQ_ENDPOINT, PROFILE_STREAMING
+from .protocol import (
+    DEFAULT_DAEMON_ENDPOINT, DEFAULT_HWM, DEFAULT_QUEUE_SIZES, DEFAULT_ZMQ_ENDPOINT,
+    PROFILE_STREAMING, parse_cameras, parse_stream_settings, parse_streams,
+)
+from .transport import control_endpoint
 
 
 class AriaBridge:
@@ -45,10 +66,41 @@ class AriaBridge:
         Streaming profile.  ``"profile12"`` (default) is streaming-optimised
         and delivers ~12 FPS RGB at 1408x1408.
     zmq_endpoint : str
-        ZMQ endpoint for the internal bridge.
+        Endpoint for the internal bridge.  ``tcp://`` / ``ipc://`` send
+        frames over ZMQ; ``shm://<name>`` uses a shared-memory slot ring
+        and only sends the header over ZMQ.
     receiver_script : str or None
         Path to the receiver script.  ``None`` auto-detects from the
         installed package location.
+    streams : sequence of str
+        Receiver streams to subscribe: ``"rgb"``, ``"slam"`` (both SLAM
+        cameras), ``"et"`` (eye tracking), ``"imu"``.  Each camera gets its
+        own socket.
+    cameras : sequence of str or None
+        Cameras actually used (e.g. ``("rgb", "slam1")``).  The receiver
+        drops the others before packing them.  ``None`` = all of *streams*.
+    queue_sizes, hwm : int or dict
+        SDK ``message_queue_size`` per stream and socket high-water mark,
+        for all streams or per stream (e.g. ``hwm={"slam": 4}``); *hwm* may
+        also name single cameras (``{"slam2": 1}``).
+    latest_only : bool
+        Only ever deliver the newest frame: SDK queues of 1 in the receiver
+        and latest-value channels in the observer (see
+        :class:`AriaBridgeObserver`).
+    fanout : bool
+        Publish frames so other local processes can attach their own
+        ``AriaBridgeObserver(zmq_endpoint=..., fanout=True)`` and see every
+        frame too, without a second receiver.
+    attach : bool
+        Don't launch a receiver: join the session of the
+        ``aria-bridge-daemon`` at *daemon_endpoint*.  The receiver settings
+        (interface, profile, endpoint, streams, ...) are the daemon's;
+        *cameras*, *latest_only* and the observer options still apply.
+        :meth:`stop` detaches and leaves the receiver streaming.
+    daemon_endpoint : str
+        Control socket of the daemon to attach to.
+    **observer_options
+        Passed through to :class:`AriaBridgeObserver` (e.g. ``frame_pool=3``).
     """
 
     def __init__(
@@ -58,18 +110,43 @@ class AriaBridge:
         profile: str = PROFILE_STREAMING,
         zmq_endpoint: str = DEFAULT_ZMQ_ENDPOINT,
         receiver_script: Optional[str] = None,
+        streams: Sequence[str] = ("rgb",),
+        cameras: Optional[Sequence[str]] = None,
+        queue_sizes: Union[int, Dict[str, int], None] = None,
+        hwm: Union[int, Dict[str, int], None] = None,
+        latest_only: bool = False,
+        fanout: bool = False,
+        attach: bool = False,
+        daemon_endpoint: str = DEFAULT_DAEMON_ENDPOINT,
+        **observer_options,
     ):
-        if interface == "wifi" and not device_ip:
+        if interface == "wifi" and not device_ip and not attach:
             raise ValueError("device_ip is required for wifi interface")
 
         self._interface = interface
         self._device_ip = device_ip
         self._profile = profile
         self._zmq_endpoint = zmq_endpoint
-        self._receiver_script = receiver_script or self._find_receiver()
+        self._receiver_script = None if attach else receiver_script or self._find_receiver()
+        self._streams = parse_streams(streams)
+        self._requested_cameras = cameras
+        self._cameras = parse_cameras(cameras, self._streams) if not attach else ()
+        self._queue_sizes = parse_stream_settings(queue_sizes, DEFAULT_QUEUE_SIZES)
+        self._hwm = parse_stream_settings(hwm, DEFAULT_HWM, channels=True)
+        if latest_only:
+            self._queue_sizes.update({s: 1 for s in self._streams if s != "imu"})
+        self._latest_only = latest_only
+        self._fanout = fanout
+        self._attach = attach
+        self._daemon_endpoint = daemon_endpoint
+        self._observer_options = observer_options
 
         self._process: Optional[subprocess.Popen] = None
         self._observer: Optional[AriaBridgeObserver] = None
+        self._session: Optional[Dict[str, Any]] = None  # daemon's, when attached
+        self._client_id: Optional[int] = None
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -78,16 +155,43 @@ class AriaBridge:
     def start(self, timeout: float = 15.0):
         """Launch the FEX-Emu receiver and start consuming frames.
 
+        With ``attach=True``, join the daemon's session instead.
         Blocks until the first frame arrives or *timeout* seconds elapse.
 
         Raises
         ------
         RuntimeError
-            If FEXBash is not available or the receiver fails to start.
+            If FEXBash is not available, the receiver fails to start or no
+            daemon answers.
         """
-        if self._process is not None:
+        if self._process is not None or self._observer is not None:
             raise RuntimeError("Bridge already started")
 
+        if self._attach:
+            self._attach_to_daemon(timeout)
+        else:
+            self.start_receiver()
+            # Start native observer — pass receiver PID so telemetry can track it
+            self._observer = AriaBridgeObserver(
+                zmq_endpoint=self._zmq_endpoint,
+                telemetry_pid_fex=self._process.pid,
+                streams=self._streams,
+                cameras=self._cameras,
+                hwm=self._hwm,
+                latest_only=self._latest_only,
+                fanout=self._fanout,
+                **self._observer_options,
+            )
+        self._wait_for_first_frame(timeout)
+
+    def start_receiver(self):
+        """Launch only the FEX-Emu receiver, without consuming frames here.
+
+        This is what ``aria-bridge-daemon`` runs; :meth:`start` calls it too.
+        """
+        if self._process is not None:
+            raise RuntimeError("Receiver already started")
+
         self._check_fex_emu()
 
         # Build receiver command
@@ -96,6 +200,13 @@ class AriaBridge:
         cmd += f" --profile {self._profile}"
         if self._device_ip:
             cmd += f" --device-ip {self._device_ip}"
+        cmd += f" --streams {','.join(self._streams)}"
+        if self._cameras:
+            cmd += f" --cameras {','.join(self._cameras)}"
+        cmd += " --queue-size " + ",".join(f"{s}={self._queue_sizes[s]}" for s in self._streams)
+        cmd += " --hwm " + ",".join(f"{k}={v}" for k, v in self._hwm.items())
+        if self._fanout:
+            cmd += " --fanout"
 
         env = os.environ.copy()
         env["PYTHONNOUSERSITE"] = "1"
@@ -114,32 +225,29 @@ class AriaBridge:
             daemon=True,
         ).start()
 
-        # Start native observer — pass receiver PID so telemetry can track it
-        self._observer = AriaBridgeObserver(
-            zmq_endpoint=self._zmq_endpoint,
-            telemetry_pid_fex=self._process.pid,
-        )
-
-        # Wait for first frame
-        deadline = time.monotonic() + timeout
-        while time.monotonic() < deadline:
-            if self._observer.get_frame("rgb") is not None:
-                return
-            if self._process.poll() is not None:
-                raise RuntimeError(
-                    f"Receiver exited with code {self._process.returncode}"
-                )
-            time.sleep(0.2)
-
-        print("[aria-bridge] Warning: no frames received within timeout, "
-              "but receiver is still running")
-
     def stop(self):
-        """Stop the receiver subprocess and observer thread."""
+        """Stop the observer thread and the receiver subprocess.
+
+        When attached, detach from the daemon instead; its receiver keeps
+        streaming for the next application.
+        """
         if self._observer:
             self._observer.stop()
             self._observer = None
 
+        if self._heartbeat_thread is not None:
+            self._heartbeat_stop.set()
+            self._heartbeat_thread.join(timeout=2.0)
+            self._heartbeat_thread = None
+
+        if self._client_id is not None:
+            try:
+                daemon_request(self._daemon_endpoint, {"cmd": "detach", "client": self._client_id},
+                               timeout=1.0)
+            except RuntimeError:
+                pass  # daemon already gone — nothing to detach from
+            self._client_id = None
+
         if self._process:
             self._process.send_signal(signal.SIGTERM)
             try:
@@ -148,11 +256,96 @@ class AriaBridge:
                 self._process.kill()
             self._process = None
 
-    def get_frame(self, camera: str = "rgb") -> Optional[np.ndarray]:
-        """Latest frame as a BGR ``uint8`` numpy array, or ``None``."""
+    # ------------------------------------------------------------------
+    # Runtime control of the receiver
+    # ------------------------------------------------------------------
+
+    def subscribe(self, *streams: str) -> Dict[str, Any]:
+        """Subscribe the receiver to *streams* again (after :meth:`unsubscribe`).
+
+        Only streams given as ``streams=`` can be subscribed, since the
+        observer's channels are fixed at start, so the SDK is already
+        subscribed to them and the other streams are never interrupted.
+        Returns the receiver's subscription state.
+        """
+        return self._control("subscribe", streams=self._configured_streams(streams))
+
+    def unsubscribe(self, *streams: str) -> Dict[str, Any]:
+        """Stop sending *streams*; the other streams are not interrupted.
+
+        The receiver keeps the SDK subscription and drops these frames
+        before packing, so :meth:`subscribe` brings them back without a
+        resubscribe.
+        """
+        return self._control("unsubscribe", streams=self._configured_streams(streams))
+
+    def set_queue_size(self, stream: str, size: int) -> Dict[str, Any]:
+        """Change the SDK ``message_queue_size`` of *stream* (resubscribes)."""
+        (stream,) = self._configured_streams((stream,))
+        reply = self._control("set_queue_size", stream=stream, size=size)
+        self._queue_sizes[stream] = size
+        return reply
+
+    def pause(self, *streams: str) -> Dict[str, Any]:
+        """Stop sending *streams* (all if none given), keeping the subscription.
+
+        Instant and gapless for the other streams; the paused cameras
+        simply stop producing frames until :meth:`resume`.
+        """
+        return self._control("pause", streams=self._configured_streams(streams))
+
+    def resume(self, *streams: str) -> Dict[str, Any]:
+        """Resume sending *streams* (all if none given)."""
+        return self._control("resume", streams=self._configured_streams(streams))
+
+    def receiver_stats(self) -> Dict[str, Any]:
+        """Receiver-side counters: subscription, frames sent, drops, clock sync."""
+        return self._control("stats")
+
+    def session(self) -> Dict[str, Any]:
+        """What another process needs to consume this bridge's receiver.
+
+        Served to attaching applications by ``aria-bridge-daemon``; when
+        attached, the daemon's session.
+        """
+        if self._session is not None:
+            return dict(self._session)
+        return {
+            "zmq_endpoint": self._zmq_endpoint,
+            "streams": list(self._streams),
+            "cameras": list(self._cameras),
+            "hwm": dict(self._hwm),
+            "fanout": self._fanout,
+            "interface": self._interface,
+            "profile": self._profile,
+            "queue_sizes": {s: self._queue_sizes[s] for s in self._streams},
+            "receiver_pid": self._process.pid if self._process else None,
+        }
+
+    def get_frame(self, camera: str = "rgb",
+                  output_format: Optional[str] = None) -> Optional[np.ndarray]:
+        """Latest frame as a ``uint8`` numpy array (BGR by default), or ``None``."""
         if self._observer is None:
             return None
-        return self._observer.get_frame(camera)
+        return self._observer.get_frame(camera, output_format)
+
+    def wait_for_frame(self, camera: str = "rgb", after_version: int = -1,
+                       timeout: Optional[float] = None,
+                       output_format: Optional[str] = None) -> Tuple[Optional[np.ndarray], int]:
+        """Block until a frame newer than *after_version* arrives.
+
+        See :meth:`AriaBridgeObserver.wait_for_frame`.
+        """
+        if self._observer is None:
+            return None, after_version
+        return self._observer.wait_for_frame(camera, after_version, timeout, output_format)
+
+    def frames(self, camera: str = "rgb", timeout: Optional[float] = None,
+               output_format: Optional[str] = None) -> Iterator[np.ndarray]:
+        """Iterate over new frames as they arrive (see :meth:`AriaBridgeObserver.frames`)."""
+        if self._observer is None:
+            return iter(())
+        return self._observer.frames(camera, timeout, output_format)
 
     def get_latest(self, camera: str = "rgb") -> Optional[Frame]:
         """Latest :class:`Frame` object, or ``None``."""
@@ -160,22 +353,39 @@ class AriaBridge:
             return None
         return self._observer.get_latest(camera)
 
+    def get_imu(self, since_ns: Optional[int] = None, imu: int = 0) -> np.ndarray:
+        """IMU samples newer than *since_ns* (see :meth:`AriaBridgeObserver.get_imu`)."""
+        if self._observer is None:
+            return np.zeros(0, dtype=IMU_DTYPE)
+        return self._observer.get_imu(since_ns, imu)
+
     def get_stats(self) -> Dict[str, Any]:
         """Runtime statistics (FPS per camera, uptime, endpoint)."""
         if self._observer is None:
             return {}
         stats = self._observer.get_stats()
-        stats["receiver_pid"] = self._process.pid if self._process else None
-        stats["interface"] = self._interface
-        stats["profile"] = self._profile
+        session = self.session()
+        stats["receiver_pid"] = session["receiver_pid"]
+        stats["interface"] = session["interface"]
+        stats["profile"] = session["profile"]
+        stats["queue_sizes"] = session["queue_sizes"]
+        if self._attach:
+            stats["daemon"] = {"endpoint": self._daemon_endpoint, "client": self._client_id}
         return stats
 
+    @property
+    def receiver_running(self) -> bool:
+        """``True`` while the receiver subprocess launched here is alive."""
+        return self._process is not None and self._process.poll() is None
+
     @property
     def is_running(self) -> bool:
         """``True`` if the receiver process and observer thread are alive."""
-        if self._process is None or self._observer is None:
+        if self._observer is None:
             return False
-        return self._process.poll() is None and self._observer.is_running
+        if self._attach:
+            return self._observer.is_running
+        return self.receiver_running and self._observer.is_running
 
     # ------------------------------------------------------------------
     # Context manager
@@ -192,6 +402,78 @@ class AriaBridge:
     # Internals
     # ------------------------------------------------------------------
 
+    def _attach_to_daemon(self, timeout: float):
+        """Join the daemon's session: its endpoint and streams, our observer."""
+        reply = daemon_request(self._daemon_endpoint, {"cmd": "attach"}, timeout=min(timeout, 5.0))
+        session = reply["session"]
+        streams = parse_streams(session["streams"])
+        cameras = (parse_cameras(self._requested_cameras, streams)
+                   if self._requested_cameras is not None else tuple(session["cameras"]))
+        self._session, self._client_id = session, reply["client"]
+        self._zmq_endpoint, self._streams, self._cameras = session["zmq_endpoint"], streams, cameras
+        self._observer = AriaBridgeObserver(
+            zmq_endpoint=self._zmq_endpoint,
+            telemetry_pid_fex=session["receiver_pid"],
+            streams=streams,
+            cameras=cameras,
+            hwm=session["hwm"],
+            latest_only=self._latest_only,
+            fanout=True,
+            **self._observer_options,
+        )
+        # Keep the attachment alive; the daemon drops clients silent for ``ttl``
+        self._heartbeat_stop.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat, args=(reply["ttl"] / 3,), daemon=True)
+        self._heartbeat_thread.start()
+
+    def _heartbeat(self, interval: float):
+        while not self._heartbeat_stop.wait(interval):
+            try:
+                daemon_request(self._daemon_endpoint,
+                               {"cmd": "heartbeat", "client": self._client_id},
+                               timeout=min(interval, 2.0))
+            except RuntimeError as e:
+                print(f"[aria-bridge] Warning: daemon heartbeat failed: {e}")
+
+    def _control(self, cmd: str, **args) -> Dict[str, Any]:
+        if self._observer is None:
+            raise RuntimeError("Bridge not started")
+        return control_request(control_endpoint(self._zmq_endpoint), {"cmd": cmd, **args})
+
+    def _configured_streams(self, streams: Sequence[str]) -> list:
+        streams = parse_streams(streams) if streams else ()
+        missing = [s for s in streams if s not in self._streams]
+        if missing:
+            raise ValueError(f"Streams {missing} were not configured at start "
+                             f"(streams={self._streams})")
+        return list(streams)
+
+    def _wait_for_first_frame(self, timeout: float):
+        if not self._cameras:
+            return  # IMU only — no frames to wait for
+        # Woken as soon as the frame arrives; the short slices only bound
+        # how late we notice a crashed receiver
+        first_camera = self._cameras[0]
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            slice_end = time.monotonic() + min(0.2, remaining)
+            frame, _ = self._observer.wait_for_frame(first_camera, timeout=min(0.2, remaining))
+            if frame is not None:
+                return
+            if self._process is not None and self._process.poll() is not None:
+                raise RuntimeError(
+                    f"Receiver exited with code {self._process.returncode}"
+                )
+            if not self._observer.is_running:
+                raise RuntimeError("Observer stopped before the first frame arrived")
+            # wait_for_frame can return early (e.g. a lazy frame overwritten
+            # before it was read) — never spin
+            time.sleep(max(0.0, slice_end - time.monotonic()))
+
+        print("[aria-bridge] Warning: no frames received within timeout, "
+              "but receiver is still running")
+
     @staticmethod
     def _drain_stdout(stream):
         """Read and print receiver stdout so the pipe never fills and blocks."""
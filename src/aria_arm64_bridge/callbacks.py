@@ -0,0 +1,144 @@
+"""Push-style frame delivery — per-callback mailboxes drained by worker threads.
+
+Registered with :meth:`AriaBridgeObserver.on_frame`. The receive thread
+only drops each new frame into the callback's bounded mailbox; the
+callback runs on its own workers. NumPy / TensorRT release the GIL, so
+callbacks for different cameras (or several workers of one callback)
+really run in parallel on the Orin's cores.
+
+Drop policies, applied when the mailbox is full:
+
+* ``latest`` — evict the oldest queued frame. A callback never starts
+  on a frame that already has a newer one waiting behind it.
+* ``skip``   — drop the incoming frame and keep what is queued.
+"""
+
+import collections
+import threading
+import traceback
+from typing import Any, Callable, Dict, Optional
+
+DROP_POLICIES = ("latest", "skip")
+
+
+class FrameCallback:
+    """One ``on_frame`` registration: a bounded mailbox plus its workers.
+
+    Returned by :meth:`AriaBridgeObserver.on_frame`; pass it to
+    :meth:`AriaBridgeObserver.remove_callback` to unregister.
+    """
+
+    def __init__(self, camera: str, fn: Callable, workers: int = 1,
+                 drop_policy: str = "latest", queue_size: int = 1,
+                 resolve: Optional[Callable[[Any], Any]] = None,
+                 release: Optional[Callable[[Any], None]] = None):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if queue_size < 1:
+            raise ValueError("queue_size must be >= 1")
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop_policy {drop_policy!r}; expected one of {DROP_POLICIES}")
+
+        self.camera = camera
+        self._fn = fn
+        self._drop_policy = drop_policy
+        self._queue_size = queue_size
+        # Turns a queued item (lazy mode: a raw frame entry) into the frame
+        # to deliver, on the worker; ``None`` = not deliverable
+        self._resolve = resolve
+        # Called with each item the mailbox is done with: dropped, discarded
+        # or (resolved) after the call — gives back a pooled buffer
+        self._release = release
+
+        self._queue: collections.deque = collections.deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._busy = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+
+        name = getattr(fn, "__name__", "callback")
+        self._threads = [
+            threading.Thread(target=self._worker, daemon=True,
+                             name=f"aria-{camera}-{name}-{i}")
+            for i in range(workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, item) -> bool:
+        """Queue *item* for the workers. Returns ``False`` if it was dropped."""
+        evicted = None
+        with self._cond:
+            if self._closed:
+                evicted, item = item, None
+            elif len(self._queue) >= self._queue_size:
+                self.dropped += 1
+                if self._drop_policy == "skip":
+                    evicted, item = item, None
+                else:
+                    evicted = self._queue.popleft()  # latest: the stale one goes
+            if item is not None:
+                self._queue.append(item)
+                self._cond.notify()
+        if evicted is not None and self._release is not None:
+            self._release(evicted)
+        return item is not None
+
+    def close(self, timeout: float = 2.0):
+        """Stop the workers. Queued frames are discarded; running calls finish."""
+        with self._cond:
+            self._closed = True
+            discarded = list(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+        if self._release is not None:
+            for item in discarded:
+                self._release(item)
+        for t in self._threads:
+            if t is not threading.current_thread():
+                t.join(timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "camera": self.camera,
+                "callback": getattr(self._fn, "__name__", repr(self._fn)),
+                "workers": len(self._threads),
+                "drop_policy": self._drop_policy,
+                "queue_depth": len(self._queue),
+                "queue_size": self._queue_size,
+                "busy": self._busy,
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+                "errors": self.errors,
+            }
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if self._closed:
+                    return
+                item = self._queue.popleft()
+                self._busy += 1
+            failed = False
+            try:
+                if self._resolve is not None:
+                    item = self._resolve(item)
+                if item is not None:
+                    self._fn(item)
+            except Exception:
+                failed = True
+                print(f"[aria-bridge] ERROR in {self.camera} frame callback:", flush=True)
+                traceback.print_exc()
+            finally:
+                if item is not None and self._release is not None:
+                    self._release(item)
+                with self._cond:
+                    self._busy -= 1
+                    if failed:
+                        self.errors += 1
+                    elif item is not None:
+                        self.delivered += 1
@@ -0,0 +1,103 @@
+"""Device → host clock mapping for capture timestamps.
+
+The Aria SDK stamps frames with the glasses' own clock. To compare them
+with anything on the Jetson, the receiver maps them to host
+``CLOCK_MONOTONIC`` with :class:`ClockSync`.
+
+Each frame gives one sample ``host_ns - device_ns`` taken in the SDK
+callback. That is the true offset plus the delivery delay, which is never
+negative and is occasionally huge (DDS retransmits, FEX-Emu scheduling).
+So the estimator keeps only the *minimum* sample of each time bucket — the
+frames that got through fastest — and fits offset + drift with a line
+through those minima, discarding buckets far above the fit.
+
+The mapped time is when the fastest frames *arrived*; the irreducible
+minimum delivery delay cannot be observed from one side and stays in it.
+Pass ``min_delay_ns`` if you have measured it.
+"""
+
+import collections
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class ClockSync:
+    """Online offset + drift estimate between a device clock and the host.
+
+    Call :meth:`observe` for every frame with its device capture time and
+    the host time it arrived; :meth:`to_host` maps device times.
+    """
+
+    def __init__(self, bucket_ns: int = 500_000_000, buckets: int = 64,
+                 min_delay_ns: int = 0):
+        if bucket_ns <= 0 or buckets < 2:
+            raise ValueError("bucket_ns must be > 0 and buckets >= 2")
+        self._bucket_ns = bucket_ns
+        self._min_delay_ns = min_delay_ns
+        # (bucket id, device_ns, offset_ns) — the minimum-offset sample per bucket
+        self._minima: collections.deque = collections.deque(maxlen=buckets)
+        self._ref_device_ns: Optional[int] = None
+        self._offset_ns = 0.0   # offset at _ref_device_ns
+        self._drift = 0.0       # ns of offset per ns of device time
+        self._samples = 0
+        self._outliers = 0
+
+    @property
+    def synced(self) -> bool:
+        return bool(self._minima)
+
+    def observe(self, device_ns: int, host_ns: int):
+        """Add one ``(device capture time, host arrival time)`` sample."""
+        self._samples += 1
+        offset = host_ns - device_ns
+        bucket = device_ns // self._bucket_ns
+        if self._minima and self._minima[-1][0] == bucket:
+            if offset >= self._minima[-1][2]:
+                return  # slower than the bucket's best — no new information
+            self._minima[-1] = (bucket, device_ns, offset)
+        elif self._minima and bucket < self._minima[-1][0]:
+            return  # out of order (another camera's late frame)
+        else:
+            self._minima.append((bucket, device_ns, offset))
+        self._fit()
+
+    def to_host(self, device_ns: int) -> Optional[int]:
+        """Host ``CLOCK_MONOTONIC`` time of device time *device_ns*, or ``None``."""
+        if not self._minima:
+            return None
+        dt = device_ns - self._ref_device_ns
+        return int(device_ns + self._offset_ns + self._drift * dt) - self._min_delay_ns
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "synced": self.synced,
+            "offset_ns": int(self._offset_ns),
+            "drift_ppm": float(self._drift * 1e6),
+            "buckets": len(self._minima),
+            "samples": self._samples,
+            "outliers": self._outliers,
+        }
+
+    def _fit(self):
+        minima = np.array([(d, o) for _, d, o in self._minima], dtype=np.int64)
+        self._ref_device_ns = int(minima[-1, 0])
+        if len(minima) < 3:
+            self._offset_ns, self._drift = float(minima[:, 1].min()), 0.0
+            return
+
+        # Relative to the newest sample so float64 keeps ns precision
+        t = (minima[:, 0] - self._ref_device_ns).astype(np.float64)
+        y = (minima[:, 1] - minima[-1, 1]).astype(np.float64)
+        drift, offset = np.polyfit(t, y, 1)
+
+        # A bucket whose best frame was still slow (a long stall) sits above
+        # the line — drop it and refit
+        residual = y - (drift * t + offset)
+        mad = np.median(np.abs(residual - np.median(residual)))
+        keep = residual <= np.median(residual) + 3 * max(mad, 1e3)
+        self._outliers = int((~keep).sum())
+        if self._outliers and keep.sum() >= 2:
+            drift, offset = np.polyfit(t[keep], y[keep], 1)
+        self._offset_ns = float(offset) + float(minima[-1, 1])
+        self._drift = float(drift)
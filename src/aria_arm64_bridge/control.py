@@ -0,0 +1,153 @@
+"""Runtime control of a running receiver — JSON requests over ZMQ REQ/REP.
+
+Restarting the receiver under FEX-Emu costs seconds of dead time, so the
+receiver serves a control socket next to its frame channels
+(:func:`.transport.control_endpoint`) and applies changes in place:
+
+* ``{"cmd": "subscribe", "streams": ["slam"]}`` / ``"unsubscribe"`` —
+  start / stop sending streams. The SDK subscription only ever grows to
+  the superset of streams seen so far: unsubscribed streams are dropped
+  per stream in the receiver, like paused ones, so toggling a stream
+  never interrupts the others. Only subscribing a stream outside that
+  superset resubscribes the SDK, which may briefly interrupt the other
+  streams. At least one stream stays subscribed.
+* ``{"cmd": "set_queue_size", "stream": "slam", "size": 2}`` — SDK
+  ``message_queue_size`` of a stream (a resubscribe if the SDK delivers it)
+* ``{"cmd": "pause", "streams": [...]}`` / ``"resume"`` — stop / restart
+  sending streams (all if ``streams`` is omitted). The subscription is
+  untouched, so this is instant and gapless for the other streams; paused
+  frames are dropped before packing.
+* ``{"cmd": "stats"}`` — receiver-side counters
+
+Every reply is a JSON object, ``{"error": "..."}`` on failure. The daemon
+(:mod:`.daemon`) speaks the same request/reply convention.
+"""
+
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional
+
+import zmq
+
+from .protocol import parse_streams
+
+
+def control_request(endpoint: str, request: Dict[str, Any], timeout: float = 5.0,
+                    name: str = "receiver") -> Dict[str, Any]:
+    """Send one control request to *endpoint* and return the reply.
+
+    Raises
+    ------
+    RuntimeError
+        If no *name* answers within *timeout* seconds or it returns an error.
+    """
+    ctx = zmq.Context.instance()
+    socket = ctx.socket(zmq.REQ)
+    socket.setsockopt(zmq.LINGER, 0)
+    try:
+        socket.connect(endpoint)
+        socket.send_json(request)
+        if not socket.poll(int(timeout * 1000), zmq.POLLIN):
+            raise RuntimeError(f"No {name} answering at {endpoint}")
+        reply = socket.recv_json()
+    finally:
+        socket.close()
+    if "error" in reply:
+        raise RuntimeError(f"{name}: {reply['error']}")
+    return reply
+
+
+def daemon_request(endpoint: str, request: Dict[str, Any], timeout: float = 5.0) -> Dict[str, Any]:
+    """Send one request to the ``aria-bridge-daemon`` at *endpoint* (see :mod:`.daemon`).
+
+    Raises
+    ------
+    RuntimeError
+        If no daemon answers within *timeout* seconds or it returns an error.
+    """
+    return control_request(endpoint, request, timeout, name="aria-bridge-daemon")
+
+
+def serve_request(socket: zmq.Socket, handle: Callable[[Any], Dict[str, Any]]):
+    """Answer one pending request on REP *socket* with *handle*."""
+    try:
+        request = socket.recv_json()
+    except ValueError:
+        request = None
+    try:
+        reply = handle(request)
+    except Exception as e:  # never leave the REQ side without an answer
+        reply = {"error": f"{type(e).__name__}: {e}"}
+    socket.send_json(reply)
+
+
+class ReceiverControl:
+    """Receiver-side state changed by control requests.
+
+    :attr:`streams` are the streams sent, :attr:`subscribed` the SDK
+    subscription (a superset). *resubscribe* is called with
+    ``(subscribed, queue_sizes)`` whenever the SDK subscription must
+    change; *stats* returns the receiver's counters. The frame callbacks
+    read :attr:`muted` — paused or unsubscribed streams — which is
+    replaced, never mutated, so no lock is needed.
+    """
+
+    def __init__(self, streams: Iterable[str], queue_sizes: Dict[str, int],
+                 resubscribe: Callable[[tuple, Dict[str, int]], None],
+                 stats: Optional[Callable[[], Dict[str, Any]]] = None):
+        self.streams = tuple(streams)
+        self.subscribed = self.streams
+        self.queue_sizes = dict(queue_sizes)
+        self.paused: FrozenSet[str] = frozenset()
+        self.muted: FrozenSet[str] = frozenset()
+        self._resubscribe = resubscribe
+        self._stats = stats
+
+    def handle(self, request: Any) -> Dict[str, Any]:
+        cmd = request.get("cmd") if isinstance(request, dict) else None
+        try:
+            if cmd in ("subscribe", "unsubscribe"):
+                changed = parse_streams(request.get("streams", ()))
+                if cmd == "subscribe":
+                    streams = self.streams + tuple(s for s in changed if s not in self.streams)
+                else:
+                    streams = tuple(s for s in self.streams if s not in changed)
+                if not streams:
+                    return {"error": "cannot unsubscribe every stream; pause them instead"}
+                added = tuple(s for s in streams if s not in self.subscribed)
+                if added:
+                    self._resubscribe(self.subscribed + added, self.queue_sizes)
+                    self.subscribed += added
+                self.streams = streams
+                self._update_muted()
+                return self.state()
+            if cmd == "set_queue_size":
+                stream, size = request.get("stream"), int(request.get("size", 0))
+                if stream not in self.queue_sizes or size < 1:
+                    return {"error": f"invalid queue size {size} for stream {stream!r}"}
+                queue_sizes = {**self.queue_sizes, stream: size}
+                if stream in self.subscribed:
+                    self._resubscribe(self.subscribed, queue_sizes)
+                self.queue_sizes = queue_sizes
+                return self.state()
+            if cmd in ("pause", "resume"):
+                streams = request.get("streams")
+                changed = set(parse_streams(streams)) if streams else set(self.queue_sizes)
+                self.paused = frozenset(self.paused | changed if cmd == "pause"
+                                        else self.paused - changed)
+                self._update_muted()
+                return self.state()
+            if cmd == "stats":
+                return {**self.state(), **(self._stats() if self._stats else {})}
+        except ValueError as e:
+            return {"error": str(e)}
+        return {"error": f"unknown command {cmd!r}"}
+
+    def _update_muted(self):
+        self.muted = frozenset(self.paused | (set(self.subscribed) - set(self.streams)))
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "streams": list(self.streams),
+            "subscribed": list(self.subscribed),
+            "queue_sizes": {s: self.queue_sizes[s] for s in self.streams},
+            "paused": sorted(self.paused),
+        }
@@ -0,0 +1,214 @@
+"""``aria-bridge-daemon`` — keep one receiver streaming across app restarts.
+
+Connecting to the glasses and starting the stream under FEX-Emu takes
+seconds. The daemon does it once: it owns the receiver subprocess (and so
+the device session), runs it in fan-out mode and restarts it if it dies.
+Applications attach with ``AriaBridge(attach=True)``, which only opens an
+observer on the running stream, and detach on ``stop()``.
+
+Control requests are JSON objects over a ZMQ REQ/REP socket
+(*control_endpoint*, default ``ipc:///tmp/aria-bridge-daemon``):
+
+* ``{"cmd": "attach"}``  → ``{"client": id, "session": {...}, "ttl": s}`` —
+  the session is :meth:`AriaBridge.session` (endpoint, streams, HWMs, ...)
+* ``{"cmd": "heartbeat", "client": id}`` — the client is still alive
+* ``{"cmd": "detach", "client": id}``
+* ``{"cmd": "status"}``  → session, attached clients, receiver restarts
+* ``{"cmd": "shutdown"}`` — stop the receiver and exit
+
+Errors come back as ``{"error": "..."}``.
+
+A client that crashes never detaches, so attachments expire: a client not
+heard from (attach or heartbeat) for *client_ttl* seconds is dropped.
+``AriaBridge(attach=True)`` sends a heartbeat every ``ttl / 3`` seconds.
+
+Usage::
+
+    aria-bridge-daemon --interface usb --streams rgb,slam
+    aria-bridge-daemon --external-receiver    # front a receiver run elsewhere,
+                                              # e.g. mock_receiver.py --fanout
+"""
+
+import argparse
+import signal
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import zmq
+
+from .bridge import AriaBridge
+from .control import daemon_request, serve_request  # noqa: F401 (re-exported)
+from .protocol import (
+    DEFAULT_DAEMON_ENDPOINT, DEFAULT_HWM, DEFAULT_QUEUE_SIZES, DEFAULT_ZMQ_ENDPOINT,
+    PROFILE_STREAMING, parse_cameras, parse_stream_settings, parse_streams,
+)
+
+# Seconds an attached client may go without a heartbeat before it is dropped
+DEFAULT_CLIENT_TTL = 10.0
+
+
+class BridgeDaemon:
+    """Owns a fan-out receiver and serves attach/detach on a control socket.
+
+    *bridge_options* are :class:`AriaBridge` receiver options (interface,
+    profile, streams, ...). With ``launch_receiver=False`` the daemon only
+    serves the session of a receiver started elsewhere. Clients not heard
+    from for *client_ttl* seconds are dropped.
+    """
+
+    def __init__(self, control_endpoint: str = DEFAULT_DAEMON_ENDPOINT,
+                 launch_receiver: bool = True, restart_delay: float = 2.0,
+                 client_ttl: float = DEFAULT_CLIENT_TTL, **bridge_options):
+        if client_ttl <= 0:
+            raise ValueError("client_ttl must be positive")
+        self._control_endpoint = control_endpoint
+        self._launch = launch_receiver
+        self._restart_delay = restart_delay
+        self._client_ttl = client_ttl
+        self._bridge = AriaBridge(fanout=True, **bridge_options)
+        self._clients: Dict[int, float] = {}  # client id → attach time (monotonic)
+        self._last_seen: Dict[int, float] = {}  # client id → last attach/heartbeat
+        self._expired = 0
+        self._next_client = 1
+        self._restarts = 0
+        self._exited_at: Optional[float] = None
+        self._start_time = time.monotonic()
+        self._stop_event = threading.Event()
+
+    def status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "session": self._bridge.session(),
+            "clients": {str(c): round(now - t, 1) for c, t in self._clients.items()},
+            "clients_expired": self._expired,
+            "client_ttl": self._client_ttl,
+            "receiver_running": self._receiver_running(),
+            "receiver_restarts": self._restarts,
+            "uptime": round(now - self._start_time, 1),
+        }
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one control request."""
+        cmd = request.get("cmd") if isinstance(request, dict) else None
+        if cmd == "attach":
+            client = self._next_client
+            self._next_client += 1
+            self._clients[client] = self._last_seen[client] = time.monotonic()
+            print(f"[daemon] client {client} attached ({len(self._clients)} attached)")
+            return {"client": client, "session": self._bridge.session(),
+                    "ttl": self._client_ttl}
+        if cmd == "heartbeat":
+            if request.get("client") not in self._clients:
+                return {"error": f"unknown client {request.get('client')!r}"}
+            self._last_seen[request["client"]] = time.monotonic()
+            return {"ok": True}
+        if cmd == "detach":
+            if self._clients.pop(request.get("client"), None) is None:
+                return {"error": f"unknown client {request.get('client')!r}"}
+            del self._last_seen[request["client"]]
+            print(f"[daemon] client {request['client']} detached ({len(self._clients)} attached)")
+            return {"ok": True}
+        if cmd == "status":
+            return self.status()
+        if cmd == "shutdown":
+            self._stop_event.set()
+            return {"ok": True}
+        return {"error": f"unknown command {cmd!r}"}
+
+    def serve_forever(self):
+        """Run the receiver and the control socket until shutdown or :meth:`stop`."""
+        ctx = zmq.Context()
+        socket = ctx.socket(zmq.REP)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.bind(self._control_endpoint)
+        print(f"[daemon] Control socket on {self._control_endpoint}")
+        if self._launch:
+            self._bridge.start_receiver()
+        try:
+            while not self._stop_event.is_set():
+                if socket.poll(200, zmq.POLLIN):
+                    serve_request(socket, self.handle)
+                self._expire_clients()
+                self._supervise()
+        finally:
+            print("[daemon] Shutting down...")
+            self._bridge.stop()
+            socket.close()
+            ctx.term()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _receiver_running(self) -> bool:
+        return self._bridge.receiver_running if self._launch else True  # not ours to watch
+
+    def _expire_clients(self):
+        """Drop clients that crashed without detaching (no heartbeat within the TTL)."""
+        now = time.monotonic()
+        for client, seen in list(self._last_seen.items()):
+            if now - seen > self._client_ttl:
+                del self._clients[client], self._last_seen[client]
+                self._expired += 1
+                print(f"[daemon] client {client} expired after {now - seen:.0f}s without "
+                      f"a heartbeat ({len(self._clients)} attached)")
+
+    def _supervise(self):
+        """Restart the receiver *restart_delay* seconds after it exits."""
+        if self._receiver_running():
+            return
+        now = time.monotonic()
+        if self._exited_at is None:
+            self._exited_at = now
+            print(f"[daemon] Receiver exited; restarting in {self._restart_delay:.0f}s")
+        elif now - self._exited_at >= self._restart_delay:
+            self._bridge.stop()
+            self._bridge.start_receiver()
+            self._restarts += 1
+            self._exited_at = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep an Aria receiver streaming for "
+                                                 "AriaBridge(attach=True) applications")
+    parser.add_argument("--control-endpoint", default=DEFAULT_DAEMON_ENDPOINT)
+    parser.add_argument("--interface", choices=["usb", "wifi"], default="usb")
+    parser.add_argument("--device-ip", help="Aria glasses IP (required for wifi)")
+    parser.add_argument("--profile", default=PROFILE_STREAMING)
+    parser.add_argument("--zmq-endpoint", default=DEFAULT_ZMQ_ENDPOINT,
+                        help="tcp://, ipc:// or shm://<name> (shared-memory ring)")
+    parser.add_argument("--receiver-script", default=None)
+    parser.add_argument("--streams", default="rgb")
+    parser.add_argument("--cameras", default=None)
+    parser.add_argument("--queue-size", default=None)
+    parser.add_argument("--hwm", default=None)
+    parser.add_argument("--latest-only", action="store_true")
+    parser.add_argument("--client-ttl", type=float, default=DEFAULT_CLIENT_TTL,
+                        help="Drop attached clients silent for this many seconds")
+    parser.add_argument("--external-receiver", action="store_true",
+                        help="Don't launch a receiver; serve one started with --fanout elsewhere")
+    args = parser.parse_args()
+
+    try:
+        streams = parse_streams(args.streams)
+        cameras = parse_cameras(args.cameras, streams)
+        queue_sizes = parse_stream_settings(args.queue_size, DEFAULT_QUEUE_SIZES)
+        hwm = parse_stream_settings(args.hwm, DEFAULT_HWM, channels=True)
+        daemon = BridgeDaemon(
+            args.control_endpoint, launch_receiver=not args.external_receiver,
+            client_ttl=args.client_ttl,
+            interface=args.interface, device_ip=args.device_ip, profile=args.profile,
+            zmq_endpoint=args.zmq_endpoint, receiver_script=args.receiver_script,
+            streams=streams, cameras=cameras, queue_sizes=queue_sizes, hwm=hwm,
+            latest_only=args.latest_only,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    signal.signal(signal.SIGINT, lambda *_: daemon.stop())
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    daemon.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
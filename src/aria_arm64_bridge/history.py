@@ -0,0 +1,188 @@
+"""Short per-camera frame history, indexed by capture timestamp.
+
+Two storages with the same lookup interface:
+
+* :class:`FrameHistory` keeps references to frames that were allocated
+  elsewhere. Timestamps are kept in a *mirrored* ring: each entry is
+  written at ``i`` and ``i + depth``, so the last ``depth`` timestamps are
+  always one contiguous, sorted slice and nearest-timestamp lookups are a
+  plain ``np.searchsorted``.
+* :class:`FrameRing` preallocates the frames themselves — images plus
+  header metadata in one contiguous structured array, sized once and
+  capped in bytes. The observer processes each frame straight into the
+  next slot, so keeping history costs no extra copy and no allocation.
+"""
+
+from typing import Any, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+class FrameHistory:
+    """The last *depth* frames of one camera, searchable by timestamp.
+
+    Entries must be pushed in capture order (the Aria SDK delivers each
+    camera in order); out-of-order timestamps would break the search.
+    """
+
+    def __init__(self, depth: int):
+        if depth < 1:
+            raise ValueError("history depth must be >= 1")
+        self.depth = depth
+        self._ts = np.zeros(2 * depth, dtype=np.int64)
+        self._versions = np.zeros(2 * depth, dtype=np.int64)
+        self._items = [None] * depth
+        self._count = 0  # total pushes
+
+    def __len__(self) -> int:
+        return min(self._count, self.depth)
+
+    def _start(self) -> int:
+        """Mirror index of the oldest entry."""
+        return self._count % self.depth if self._count >= self.depth else 0
+
+    def push(self, timestamp_ns: int, version: int, item: Any) -> Any:
+        """Add the newest entry; returns the item it evicted (``None`` if none)."""
+        i = self._count % self.depth
+        self._ts[i] = self._ts[i + self.depth] = timestamp_ns
+        self._versions[i] = self._versions[i + self.depth] = version
+        evicted, self._items[i] = self._items[i], item
+        self._count += 1
+        return evicted
+
+    def newest_timestamp(self) -> int:
+        return int(self._ts[(self._count - 1) % self.depth])
+
+    def nbytes(self) -> int:
+        return sum(getattr(item, "nbytes", 0) for item in self._items if item is not None)
+
+    def timestamps(self) -> np.ndarray:
+        """Sorted timestamps, oldest first — a view, valid until the next push."""
+        start = self._start()
+        return self._ts[start:start + len(self)]
+
+    def entry(self, k: int) -> Tuple[int, int, Any]:
+        """``(timestamp_ns, version, item)`` of the *k*-th oldest entry."""
+        i = (self._start() + k) % self.depth
+        return int(self._ts[i]), int(self._versions[i]), self._items[i]
+
+    def nearest(self, timestamp_ns: int) -> int:
+        """Index (0 = oldest) of the entry closest in time to *timestamp_ns*."""
+        ts = self.timestamps()
+        k = int(np.searchsorted(ts, timestamp_ns))
+        if k == len(ts):
+            return k - 1
+        if k > 0 and timestamp_ns - ts[k - 1] <= ts[k] - timestamp_ns:
+            return k - 1
+        return k
+
+    def newest_first(self) -> Iterator[int]:
+        return iter(range(len(self) - 1, -1, -1))
+
+    def clear(self):
+        self._items = [None] * self.depth
+        self._count = 0
+
+
+class FrameRing:
+    """Preallocated ring of the last *depth* frames of one camera.
+
+    One structured array holds ``timestamp_ns``, ``version`` and the
+    ``image`` of every slot. It is allocated on the first frame (when the
+    output shape is known) and reallocated only if the shape changes.
+    One extra slot is always reserved for the frame being written, so
+    readers never see a half-written entry.
+
+    Images handed out are views into the ring. Each slot is rewritten
+    *depth* frames after it was filled — the oldest entry is the next to
+    go — so copy a frame you need to keep longer.
+
+    *max_bytes* caps the allocation; *depth* is reduced to fit, but never
+    below *min_depth*: :meth:`reserve` raises ``ValueError`` instead, so
+    the cap is never exceeded.
+    """
+
+    def __init__(self, depth: int, max_bytes: Optional[int] = None, min_depth: int = 1):
+        if depth < min_depth or min_depth < 1:
+            raise ValueError(f"history depth must be >= {max(min_depth, 1)}")
+        self.requested_depth = depth
+        self.depth = depth
+        self.min_depth = min_depth
+        self._max_bytes = max_bytes
+        self._data: Optional[np.ndarray] = None
+        self._shape = None
+        self._write = 0   # slot reserved for the next frame
+        self._count = 0   # committed frames since (re)allocation
+
+    def __len__(self) -> int:
+        return min(self._count, self.depth)
+
+    def _allocate(self, shape: Tuple[int, ...], dtype):
+        record = np.dtype([
+            ("timestamp_ns", np.int64),
+            ("version", np.int64),
+            ("image", dtype, shape),
+        ])
+        slots = self.requested_depth + 1
+        if self._max_bytes is not None and slots * record.itemsize > self._max_bytes:
+            slots = self._max_bytes // record.itemsize
+            if slots - 1 < self.min_depth:
+                raise ValueError(
+                    f"history_max_bytes={self._max_bytes} cannot hold {self.min_depth + 1} "
+                    f"frames of shape {shape} ({record.itemsize} bytes each)")
+        self.depth = slots - 1
+        self._data = np.zeros(slots, dtype=record)
+        self._shape = shape
+        self._write = 0
+        self._count = 0
+
+    def reserve(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Writable image buffer of the next slot; :meth:`commit` publishes it."""
+        if self._data is None or shape != self._shape:
+            self._allocate(shape, dtype)
+        return self._data["image"][self._write]
+
+    def commit(self, timestamp_ns: int, version: int):
+        record = self._data[self._write]
+        record["timestamp_ns"] = timestamp_ns
+        record["version"] = version
+        self._write = (self._write + 1) % len(self._data)
+        self._count += 1
+
+    def _slot(self, k: int) -> int:
+        """Physical slot of the *k*-th oldest visible entry."""
+        return (self._write - len(self) + k) % len(self._data)
+
+    def _ts(self, k: int) -> int:
+        return int(self._data["timestamp_ns"][self._slot(k)])
+
+    def newest_timestamp(self) -> int:
+        return self._ts(len(self) - 1)
+
+    def nbytes(self) -> int:
+        return 0 if self._data is None else self._data.nbytes
+
+    def entry(self, k: int) -> Tuple[int, int, np.ndarray]:
+        """``(timestamp_ns, version, image view)`` of the *k*-th oldest entry."""
+        record = self._data[self._slot(k)]
+        image = self._data["image"][self._slot(k)]
+        image.flags.writeable = False
+        return int(record["timestamp_ns"]), int(record["version"]), image
+
+    def nearest(self, timestamp_ns: int) -> int:
+        """Index (0 = oldest) of the entry closest in time to *timestamp_ns*."""
+        lo, hi = 0, len(self)
+        while lo < hi:  # first entry >= timestamp_ns; the ring wraps, so no searchsorted
+            mid = (lo + hi) // 2
+            if self._ts(mid) < timestamp_ns:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(self):
+            return lo - 1
+        if lo > 0 and timestamp_ns - self._ts(lo - 1) <= self._ts(lo) - timestamp_ns:
+            return lo - 1
+        return lo
+
+    def newest_first(self) -> Iterator[int]:
+        return iter(range(len(self) - 1, -1, -1))
@@ -0,0 +1,157 @@
+"""IMU stream — batched columnar wire messages and a zero-copy sample ring.
+
+The Aria IMUs run at up to 1 kHz. One ZMQ message per sample from an
+emulated Python callback would cost more than the data is worth, so the
+receiver collects samples in an :class:`ImuBatcher` and sends one
+struct-of-arrays message per IMU every few milliseconds (see the IMU
+batch layout in :mod:`.protocol`).
+
+The observer appends each batch to an :class:`ImuRing`: a NumPy
+structured array written *mirrored* (every sample at ``i`` and
+``i + capacity``), so the newest samples are always one contiguous slice
+and :meth:`ImuRing.since` can return a view instead of a copy.
+"""
+
+import time
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from .protocol import IMU_SAMPLE_BYTES, pack_imu_header
+
+IMU_DTYPE = np.dtype([
+    ("timestamp_ns", np.int64),   # device clock, like Frame.timestamp
+    ("host_ns", np.int64),        # host CLOCK_MONOTONIC, 0 if unknown
+    ("accel", np.float32, (3,)),  # m/s²
+    ("gyro", np.float32, (3,)),   # rad/s
+])
+
+
+def pack_imu_body(timestamps: np.ndarray, accel: np.ndarray, gyro: np.ndarray) -> bytes:
+    """Columnar body from ``(n,)`` timestamps and ``(3, n)`` accel / gyro."""
+    return (timestamps.astype(np.int64, copy=False).tobytes()
+            + accel.astype(np.float32, copy=False).tobytes()
+            + gyro.astype(np.float32, copy=False).tobytes())
+
+
+def unpack_imu_body(body, count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(timestamps (n,), accel (3, n), gyro (3, n))`` — views on *body*."""
+    if len(body) != count * IMU_SAMPLE_BYTES:
+        raise ValueError(f"IMU body is {len(body)} bytes, expected {count * IMU_SAMPLE_BYTES}")
+    timestamps = np.frombuffer(body, dtype=np.int64, count=count)
+    accel = np.frombuffer(body, dtype=np.float32, count=3 * count, offset=8 * count)
+    gyro = np.frombuffer(body, dtype=np.float32, count=3 * count, offset=20 * count)
+    return timestamps, accel.reshape(3, count), gyro.reshape(3, count)
+
+
+class ImuBatcher:
+    """Receiver side: collects one IMU's samples and sends them in batches.
+
+    A batch goes out when it holds *max_samples* samples or its first
+    sample is *interval_ms* old, whichever comes first. *send* is called
+    with ``(header, body)``; it returns ``False`` if the socket dropped it.
+    """
+
+    def __init__(self, imu_id: int, send: Callable[[bytes, np.ndarray], bool],
+                 max_samples: int = 64, interval_ms: float = 10.0,
+                 host_offset: Optional[Callable[[int], Optional[int]]] = None):
+        self.imu_id = imu_id
+        self._send = send
+        self._interval_ns = int(interval_ms * 1e6)
+        self._host_offset = host_offset
+        self._timestamps = np.zeros(max_samples, dtype=np.int64)
+        self._accel = np.zeros((3, max_samples), dtype=np.float32)
+        self._gyro = np.zeros((3, max_samples), dtype=np.float32)
+        self._count = 0
+        self._first_ns = 0
+        self.seq = 0
+        self.sent_samples = 0
+        self.dropped_batches = 0
+
+    def add(self, timestamp_ns: int, accel, gyro, now_ns: Optional[int] = None):
+        i = self._count
+        self._timestamps[i] = timestamp_ns
+        self._accel[:, i] = accel
+        self._gyro[:, i] = gyro
+        self._count += 1
+        now_ns = time.monotonic_ns() if now_ns is None else now_ns
+        if i == 0:
+            self._first_ns = now_ns
+        if self._count == len(self._timestamps) or now_ns - self._first_ns >= self._interval_ns:
+            self.flush()
+
+    def flush(self):
+        n = self._count
+        if not n:
+            return
+        self._count = 0
+        offset = self._host_offset(int(self._timestamps[n - 1])) if self._host_offset else None
+        header = pack_imu_header(self.imu_id, n, self.seq, time.monotonic_ns(), offset)
+        body = pack_imu_body(self._timestamps[:n], self._accel[:, :n], self._gyro[:, :n])
+        self.seq += 1
+        if self._send(header, np.frombuffer(body, dtype=np.uint8)):
+            self.sent_samples += n
+        else:
+            self.dropped_batches += 1
+
+
+class ImuRing:
+    """Observer side: the last *capacity* samples of one IMU, zero-copy readable.
+
+    Batches must arrive in timestamp order (each IMU is one ordered stream).
+    """
+
+    def __init__(self, capacity: int = 4096):
+        if capacity < 1:
+            raise ValueError("IMU ring capacity must be >= 1")
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=IMU_DTYPE)
+        self._count = 0  # total samples pushed
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total(self) -> int:
+        """Samples pushed since creation."""
+        return self._count
+
+    def push(self, timestamps: np.ndarray, accel: np.ndarray, gyro: np.ndarray,
+             host_offset_ns: Optional[int] = None):
+        """Append a batch: ``(n,)`` timestamps, ``(3, n)`` accel and gyro."""
+        n = len(timestamps)
+        if n > self.capacity:  # only the newest fit
+            timestamps, accel, gyro = timestamps[-self.capacity:], accel[:, -self.capacity:], \
+                gyro[:, -self.capacity:]
+            self._count += n - self.capacity
+            n = self.capacity
+        start = self._count % self.capacity
+        first = min(n, self.capacity - start)  # up to the wrap point
+        for lo, hi, src in ((start, start + first, slice(0, first)),
+                            (0, n - first, slice(first, n))):
+            if hi <= lo:
+                continue
+            for base in (lo, lo + self.capacity):  # the mirror
+                rows = self._data[base:base + hi - lo]
+                rows["timestamp_ns"] = timestamps[src]
+                rows["host_ns"] = 0 if host_offset_ns is None else timestamps[src] + host_offset_ns
+                rows["accel"] = accel[:, src].T
+                rows["gyro"] = gyro[:, src].T
+        self._count += n
+
+    def samples(self) -> np.ndarray:
+        """All kept samples, oldest first — a view into the ring."""
+        start = self._count % self.capacity if self._count >= self.capacity else 0
+        return self._data[start:start + len(self)]
+
+    def since(self, since_ns: Optional[int] = None) -> np.ndarray:
+        """Samples with ``timestamp_ns > since_ns`` — a view, not a copy.
+
+        Each sample in the view is overwritten once *capacity* newer
+        samples have arrived; copy what you need to keep longer.
+        """
+        samples = self.samples()
+        if since_ns is None:
+            return samples
+        k = int(np.searchsorted(samples["timestamp_ns"], since_ns, side="right"))
+        return samples[k:]
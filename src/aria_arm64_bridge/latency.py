@@ -0,0 +1,75 @@
+"""Per-frame latency tracing — rolling percentiles per pipeline stage.
+
+Every timestamp is ``CLOCK_MONOTONIC`` (``time.monotonic_ns()``). FEX-Emu
+passes ``clock_gettime`` through to the host kernel, so the receiver's
+timestamps and the observer's are on the same clock without any sync.
+Device capture times join that clock once the receiver has mapped them to
+the host domain (``capture_host_ns`` in the v3 header, see :mod:`.clock`;
+0 = unknown).
+
+Stages, in pipeline order:
+
+* ``sdk``        — capture → receiver callback (SDK + DDS delivery)
+* ``receiver``   — callback → send (receiver packing under emulation)
+* ``transport``  — send → observer receive
+* ``process``    — receive → post-processing done
+* ``end_to_end`` — capture → post-processing done
+"""
+
+import threading
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+STAGES = ("sdk", "receiver", "transport", "process", "end_to_end")
+
+
+class FrameTiming(NamedTuple):
+    """Host-clock timestamps (ns) of one frame; ``None`` where unknown."""
+
+    capture_ns: Optional[int]
+    callback_ns: Optional[int]
+    send_ns: Optional[int]
+    receive_ns: int
+    processed_ns: Optional[int] = None
+
+    def stages(self) -> Dict[str, int]:
+        """Duration of every stage whose two endpoints are known."""
+        points = (self.capture_ns, self.callback_ns, self.send_ns,
+                  self.receive_ns, self.processed_ns)
+        durations = {}
+        for stage, start, end in zip(STAGES, points, points[1:]):
+            if start is not None and end is not None:
+                durations[stage] = end - start
+        if self.capture_ns is not None and self.processed_ns is not None:
+            durations["end_to_end"] = self.processed_ns - self.capture_ns
+        return durations
+
+
+class LatencyTracker:
+    """Last *window* durations of each stage, summarised as p50/p95/p99."""
+
+    def __init__(self, window: int = 1024):
+        self._window = window
+        self._samples = {s: np.zeros(window, dtype=np.int64) for s in STAGES}
+        self._counts = {s: 0 for s in STAGES}
+        self._lock = threading.Lock()
+
+    def record(self, timing: FrameTiming):
+        durations = timing.stages()
+        with self._lock:
+            for stage, ns in durations.items():
+                self._samples[stage][self._counts[stage] % self._window] = ns
+                self._counts[stage] += 1
+
+    def percentiles(self) -> Dict[str, Dict[str, float]]:
+        """``{stage: {"p50_ms", "p95_ms", "p99_ms", "samples"}}`` for stages seen."""
+        with self._lock:
+            windows = {s: self._samples[s][:min(n, self._window)].copy()
+                       for s, n in self._counts.items() if n}
+        result = {}
+        for stage, samples in windows.items():
+            p50, p95, p99 = np.percentile(samples, (50, 95, 99)) / 1e6
+            result[stage] = {"p50_ms": round(float(p50), 3), "p95_ms": round(float(p95), 3),
+                             "p99_ms": round(float(p99), 3), "samples": len(samples)}
+        return result
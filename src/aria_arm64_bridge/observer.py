@@ -5,19 +5,29 @@ frame per camera, with optional rotation/color conversion to match the
 Aria SDK's standard output orientation.
 """
 
-import struct
 import threading
 import time
 import traceback
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import zmq
 
 from .protocol import (
-    HEADER_FORMAT, HEADER_SIZE, HEADER_MAGIC,
-    DEFAULT_ZMQ_ENDPOINT, CAM_NAMES,
+    DEFAULT_ZMQ_ENDPOINT, CAM_NAMES, DEFAULT_HWM, FLAG_SDK_SEQ, IMU_HEADER_MAGIC, FrameHeader,
+    channel_setting, parse_cameras, parse_stream_settings, parse_streams, stream_channels,
+    unpack_header, unpack_imu_header,
 )
+from .callbacks import FrameCallback
+from .history import FrameHistory, FrameRing
+from .imu import IMU_DTYPE, ImuRing, unpack_imu_body
+from .latency import FrameTiming, LatencyTracker
+from .pool import FramePool
+from .transforms import (
+    DEFAULT_OUTPUT_FORMAT, check_format, check_mono_mode, mono_bytes_saved,
+    output_shape, process_frame, _expand_mono,
+)
+from .transport import channel_endpoint, open_source, is_shm_endpoint
 
 try:
     from .telemetry import Telemetry
@@ -26,15 +36,54 @@ except Exception:
 
 
 class Frame:
-    """A single frame from the Aria glasses."""
+    """A single frame from the Aria glasses.
+
+    ``timestamp`` is the capture timestamp from the wire header (device
+    clock). ``timing`` holds the host-clock trace of the frame through the
+    pipeline (:class:`.latency.FrameTiming`) when known.
+    """
 
-    __slots__ = ("image", "timestamp", "camera", "shape")
+    __slots__ = ("image", "timestamp", "camera", "shape", "timing")
 
-    def __init__(self, image: np.ndarray, timestamp: int, camera: str):
+    def __init__(self, image: np.ndarray, timestamp: int, camera: str,
+                 timing: Optional[FrameTiming] = None):
         self.image = image
         self.timestamp = timestamp
         self.camera = camera
         self.shape = image.shape
+        self.timing = timing
+
+
+class _StageDrops:
+    """Per-camera drop counts per pipeline stage, from v3 headers."""
+
+    __slots__ = ("last_seq", "sdk", "sdk_known", "send", "transport", "_sdk_base", "_send_base")
+
+    def __init__(self):
+        self.last_seq: Optional[int] = None
+        self.sdk = self.send = self.transport = 0
+        self.sdk_known = False
+        self._sdk_base = self._send_base = 0
+
+    def update(self, header: FrameHeader, superseded: int = 0):
+        if self.last_seq is not None:
+            if header.seq > self.last_seq:
+                # Frames skipped on purpose for this newer one are not losses
+                self.transport += max(0, header.seq - self.last_seq - 1 - superseded)
+            else:
+                # Receiver restarted — its cumulative counters start over
+                self._sdk_base, self._send_base = self.sdk, self.send
+        self.last_seq = header.seq
+        self.sdk = self._sdk_base + header.sdk_drops
+        self.send = self._send_base + header.send_drops
+        self.sdk_known = bool(header.flags & FLAG_SDK_SEQ)
+
+    def as_dict(self) -> Dict[str, Optional[int]]:
+        return {
+            "sdk": self.sdk if self.sdk_known else None,
+            "send": self.send,
+            "transport": self.transport,
+        }
 
 
 class AriaBridgeObserver:
@@ -43,51 +92,216 @@ class AriaBridgeObserver:
     Frames arrive as RGB from the Aria SDK, are rotated and converted to BGR
     to match the standard OpenCV convention.
 
+    *zmq_endpoint* may be a ZMQ endpoint (``tcp://``, ``ipc://``) or a
+    shared-memory ring (``shm://aria``) — see :mod:`.transport`.
+
+    *streams* lists the receiver streams to connect to (``"rgb"``,
+    ``"slam"``, ``"et"``, ``"imu"``); match the receiver's ``--streams``.
+    Each camera arrives on its own channel — a socket derived from
+    *zmq_endpoint* (:func:`.transport.channel_endpoint`) with its own
+    receive *hwm* (an int, or a dict by stream or camera name). *cameras*
+    connects only to the channels of those cameras (default: all of
+    *streams*); the others are simply not connected. The receiver still
+    sends every camera it was started with (counted as ``send_drops`` when
+    no one is connected; over ``shm://`` the pixels are still copied into
+    the ring) — limit them with the receiver's ``--cameras``. IMU samples land in a ring of *imu_capacity* samples per IMU, read
+    without copying through :meth:`get_imu`.
+
+    With ``latest_only=True`` each camera channel acts as a latest-value
+    mailbox: the receive thread takes the newest queued message and
+    discards older ones undecoded, so a frame never waits behind a stale
+    one. Skipped frames are counted in ``get_stats()["superseded"]``, not
+    as transport drops. IMU batches are never skipped.
+
+    ``fanout=True`` subscribes (SUB) to a receiver started with
+    ``--fanout`` instead of pulling: any number of observers then see
+    every frame, each dropping independently when it falls behind.
+
+    With ``frame_pool=N`` each camera writes into N preallocated buffers
+    instead of allocating a new array per frame. The history and queued or
+    running ``on_frame`` calls hold explicit references to their frames;
+    a frame from ``get_frame`` is recycled once it has been superseded and
+    its buffer comes round again (at least N - 1 newer frames), so copy
+    frames you keep longer. Size N above ``history`` plus the callback
+    queue sizes plus one, or the pool misses (fresh allocations).
+
+    With ``lazy=True`` the receive thread only keeps the raw (zero-copy)
+    buffer; rotation and colour conversion run on the first read of each
+    version and the result is cached. Frames nobody reads are never
+    processed — useful when the consumer runs slower than the camera.
+
+    ``output_format`` selects the array layout — ``"bgr_hwc"`` (default),
+    ``"rgb_hwc"``, ``"gray"``, ``"rgb_chw"`` or ``"bgr_chw"`` — either for
+    all cameras or per camera as a dict. The layout is fused into the one
+    rotate+copy pass, so the frame is touched once between ZMQ and your
+    model. In lazy mode ``get_frame(camera, output_format=...)`` can also
+    request a different layout per call (computed from the raw buffer and
+    cached for that version).
+
+    The eye and SLAM cameras are single-channel. By default they are
+    stacked to three channels like AriaDemoObserver; ``mono_output="single"``
+    returns the ``(H, W)`` array instead and ``"broadcast"`` a read-only
+    three-channel view over it (``np.array(frame)`` materialises it),
+    cutting memory and bandwidth for those cameras to a third.
+
     Usage::
 
         observer = AriaBridgeObserver()
         frame = observer.get_frame("rgb")  # numpy BGR uint8 or None
         observer.stop()
+
+    Instead of polling, block until the next frame arrives::
+
+        for frame in observer.frames("rgb"):
+            process(frame)
+
+    or have frames pushed to a callback on its own worker threads::
+
+        observer.on_frame("rgb", detect, workers=2)
+
+    With ``history=N`` the last N frames of each camera are kept, indexed by
+    capture timestamp, and :meth:`get_synced` returns frames of several
+    cameras captured at the same instant (stereo depth, sensor fusion).
+    :meth:`get_history` and :meth:`get_at` read the history directly.
+
+    ``history_prealloc=True`` turns the history into one preallocated ring
+    per camera — images and header metadata in a single contiguous array,
+    at most *history_max_bytes* bytes per camera (the depth is reduced to
+    fit). Frames are processed straight into their ring slot, so history
+    costs no allocation and no copy, and reads return views. A view is
+    valid until its slot comes round again (*history* frames later).
+    **This includes get_frame(), get_latest() and on_frame images**: they
+    are ring views too and are overwritten in place *history* frames
+    later, so ``.copy()`` anything you keep longer than that (e.g. across
+    a slow inference). *history* must be at least 2, and a frame too big
+    for *history_max_bytes* at depth 2 is published without being kept
+    (counted in ``get_stats()["history"][camera]["overflow"]``).
+
+    Receivers speaking protocol v3 number every frame, so lost frames are
+    counted exactly per stage in ``get_stats()["drops"]``: ``sdk`` (skipped
+    before reaching the receiver), ``send`` (refused by the socket, HWM) and
+    ``transport`` (sent but never published here). v2 senders still work,
+    without drop accounting.
+
+    Every frame is traced on the host's ``CLOCK_MONOTONIC`` — receiver
+    callback, send, observer receive and processing done, plus capture when
+    the receiver maps it to the host clock — and rolling p50/p95/p99 per
+    stage are in ``get_stats()["latency"]`` and the telemetry CSV.
     """
 
     fov_h = 1.919  # ~110 deg horizontal FOV (Aria RGB camera)
 
     def __init__(self, zmq_endpoint: str = DEFAULT_ZMQ_ENDPOINT,
-                 telemetry_pid_fex: Optional[int] = None):
+                 telemetry_pid_fex: Optional[int] = None,
+                 frame_pool: int = 0,
+                 lazy: bool = False,
+                 output_format: Union[str, Dict[str, str]] = DEFAULT_OUTPUT_FORMAT,
+                 mono_output: str = "stack",
+                 history: int = 0,
+                 history_prealloc: bool = False,
+                 history_max_bytes: Optional[int] = None,
+                 streams: Sequence[str] = ("rgb",),
+                 hwm: Union[int, Dict[str, int]] = DEFAULT_HWM,
+                 cameras: Optional[Sequence[str]] = None,
+                 imu_capacity: int = 4096,
+                 latest_only: bool = False,
+                 fanout: bool = False):
+        if history_prealloc:
+            if history < 2:
+                raise ValueError("history_prealloc needs history >= 2 (get_frame() returns "
+                                 "a ring view, rewritten history frames later)")
+            if lazy or frame_pool:
+                raise ValueError("history_prealloc replaces lazy and frame_pool "
+                                 "(frames are processed into the history ring)")
         self._endpoint = zmq_endpoint
+        self._streams = parse_streams(streams)
+        self._channels = stream_channels(self._streams, parse_cameras(cameras, self._streams))
+        self._hwm = parse_stream_settings(hwm, DEFAULT_HWM, channels=True)
+        self._latest_only = latest_only
+        self._fanout = fanout
+        self._lazy = lazy
+        self._mono = check_mono_mode(mono_output)
         self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)  # notified on every publish
         self._stop_event = threading.Event()
 
         self._frames: Dict[str, Optional[np.ndarray]] = {
             "rgb": None, "eye": None, "slam1": None, "slam2": None,
         }
         self._frame_counts: Dict[str, int] = {k: 0 for k in self._frames}
+        # Lazy processing, one camera at a time (cameras run in parallel)
+        self._process_locks = {k: threading.Lock() for k in self._frames}
+        if isinstance(output_format, str):
+            output_format = {k: output_format for k in self._frames}
+        self._formats: Dict[str, str] = {
+            k: check_format(output_format.get(k, DEFAULT_OUTPUT_FORMAT)) for k in self._frames
+        }
         self._frame_versions: Dict[str, int] = {k: 0 for k in self._frames}
+        # lazy mode: raw buffer + validity check of the current version, and
+        # per-call output formats other than the camera's own, cached per version
+        self._raw: Dict[str, Optional[tuple]] = {k: None for k in self._frames}
+        self._alt_frames: Dict[str, Dict[str, np.ndarray]] = {k: {} for k in self._frames}
+        self._processed_counts: Dict[str, int] = {k: 0 for k in self._frames}
+        # 0 = allocate a fresh array per frame (previous behaviour)
+        self._pools: Dict[str, FramePool] = (
+            {k: FramePool(frame_pool) for k in self._frames} if frame_pool else {}
+        )
+        self._mono_bytes_saved = 0
+        self._torn_frames = 0  # shm slots overwritten while we were reading them
+        self._drops: Dict[str, _StageDrops] = {}  # cameras seen with v3 headers
+        self._superseded: Dict[str, int] = {k: 0 for k in self._frames}  # latest_only skips
+        self._sources: Dict[str, Any] = {}  # channel → transport source
+        self._history_overflow: Dict[str, int] = {k: 0 for k in self._frames}
+        self._imu_capacity = imu_capacity
+        self._imu: Dict[int, ImuRing] = {}   # imu index → samples, created on first batch
+        self._imu_seq: Dict[int, int] = {}
+        self._imu_lost_batches: Dict[int, int] = {}
         self._start_time = time.time()
 
         self._telemetry = Telemetry(pid_fex=telemetry_pid_fex) if Telemetry else None
 
-        self._thread = threading.Thread(target=self._receive_loop, daemon=True)
-        self._thread.start()
+        self._timestamps: Dict[str, Optional[int]] = {k: None for k in self._frames}
+        self._timing: Dict[str, Optional[FrameTiming]] = {k: None for k in self._frames}
+        self._latency = LatencyTracker()
+        if self._telemetry:
+            self._telemetry.set_latency_source(self._latency.percentiles)
+        # 0 = latest frame only (previous behaviour)
+        if history_prealloc:
+            self._history: Dict[str, Union[FrameHistory, FrameRing]] = {
+                k: FrameRing(history, history_max_bytes, min_depth=2) for k in self._frames
+            }
+        else:
+            self._history = {k: FrameHistory(history) for k in self._frames} if history else {}
+        # on_frame registrations; lists are replaced, never mutated, so the
+        # receive thread can read them without the lock
+        self._callbacks: Dict[str, List[FrameCallback]] = {k: [] for k in self._frames}
+
+        self._start_receiver()
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
-    def get_frame(self, camera: str = "rgb") -> Optional[np.ndarray]:
-        """Most recent frame for *camera*. Returns BGR ``uint8`` or ``None``.
+    def get_frame(self, camera: str = "rgb",
+                  output_format: Optional[str] = None) -> Optional[np.ndarray]:
+        """Most recent frame for *camera* as ``uint8``, or ``None``.
+
+        Laid out as the camera's configured output format (BGR HWC by
+        default) unless *output_format* overrides it (lazy mode only).
 
         Returns a read-only view — do not modify the array in place.
-        Call ``.copy()`` yourself if you need to write to it.
+        Call ``.copy()`` yourself if you need to write to it. With
+        ``history_prealloc`` it is a view into the history ring and is
+        overwritten ``history`` frames later — copy it to keep it longer.
         """
-        with self._lock:
-            frame = self._frames.get(camera)
-            if frame is None:
-                return None
-            frame.flags.writeable = False
-            return frame
-
-    def get_frame_if_new(self, camera: str = "rgb", last_version: int = -1):
+        frame, _ = self._current(camera, output_format)
+        if frame is None:
+            return None
+        frame.flags.writeable = False
+        return frame
+
+    def get_frame_if_new(self, camera: str = "rgb", last_version: int = -1,
+                         output_format: Optional[str] = None):
         """Returns ``(frame, version)`` only if the frame is newer than *last_version*.
 
         Returns ``(None, last_version)`` if nothing new. Use this to avoid
@@ -102,38 +316,265 @@ class AriaBridgeObserver:
                     process(frame)
         """
         with self._lock:
-            v = self._frame_versions.get(camera, 0)
-            if v == last_version:
+            if self._frame_versions.get(camera, 0) == last_version:
                 return None, last_version
-            frame = self._frames.get(camera)
+        frame, v = self._current(camera, output_format)
+        if frame is None or v == last_version:
+            return None, last_version
+        frame.flags.writeable = False
+        return frame, v
+
+    def wait_for_frame(self, camera: str = "rgb", after_version: int = -1,
+                       timeout: Optional[float] = None,
+                       output_format: Optional[str] = None) -> Tuple[Optional[np.ndarray], int]:
+        """Block until *camera* has a frame newer than *after_version*.
+
+        Returns ``(frame, version)`` like :meth:`get_frame_if_new`, or
+        ``(None, after_version)`` on timeout or when the observer stops.
+        The receive thread wakes waiters as soon as a frame is published.
+
+        Example::
+
+            version = -1
+            while True:
+                frame, version = observer.wait_for_frame("rgb", version, timeout=1.0)
+                if frame is not None:
+                    process(frame)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        seen = after_version
+        while True:
+            with self._new_frame:
+                def ready():
+                    v = self._frame_versions.get(camera, 0)
+                    return self._stop_event.is_set() or v not in (0, seen)
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not self._new_frame.wait_for(ready, remaining):
+                    return None, after_version
+                if self._stop_event.is_set():
+                    return None, after_version
+                seen = self._frame_versions[camera]
+
+            frame, v = self.get_frame_if_new(camera, after_version, output_format)
+            if frame is not None:
+                return frame, v
+            # Lazy shm frame overwritten before we could process it — wait for the next
+
+    def frames(self, camera: str = "rgb", timeout: Optional[float] = None,
+               output_format: Optional[str] = None) -> Iterator[np.ndarray]:
+        """Iterate over new frames for *camera* as they arrive.
+
+        Ends when the observer stops, or when no frame arrives within
+        *timeout* seconds. Frames published while you were busy are skipped —
+        you always get the newest one.
+        """
+        version = -1
+        while True:
+            frame, version = self.wait_for_frame(camera, version, timeout, output_format)
             if frame is None:
-                return None, last_version
-            frame.flags.writeable = False
-            return frame, v
+                return
+            yield frame
+
+    def on_frame(self, camera: str, fn: Callable[[Frame], Any], workers: int = 1,
+                 drop_policy: str = "latest", queue_size: int = 1) -> FrameCallback:
+        """Call ``fn(frame)`` with every new :class:`Frame` of *camera*.
+
+        Calls run on *workers* dedicated threads fed straight from the
+        receive thread through a mailbox of *queue_size* frames. When the
+        mailbox is full, ``drop_policy="latest"`` evicts the oldest queued
+        frame (never work on a stale frame) and ``"skip"`` drops the new
+        one. ``frame.image`` is read-only and shared — copy it to modify.
+        Per-callback queue depth and drop counts are in
+        ``get_stats()["callbacks"]``.
+
+        Returns a handle for :meth:`remove_callback`.
+        """
+        if camera not in self._callbacks:
+            raise ValueError(f"Unknown camera {camera!r}")
+        resolve = (lambda entry: self._entry_frame(camera, entry)) if self._lazy else None
+        pool = self._pools.get(camera)
+        release = ((lambda item: pool.release(item.image) if isinstance(item, Frame) else None)
+                   if pool else None)
+        callback = FrameCallback(camera, fn, workers, drop_policy, queue_size, resolve, release)
+        with self._lock:
+            self._callbacks[camera] = self._callbacks[camera] + [callback]
+        return callback
+
+    def remove_callback(self, callback: FrameCallback):
+        """Unregister an :meth:`on_frame` callback and stop its workers."""
+        with self._lock:
+            registered = self._callbacks.get(callback.camera, [])
+            self._callbacks[callback.camera] = [c for c in registered if c is not callback]
+        callback.close()
+
+    def get_synced(self, cameras: Sequence[str] = ("rgb", "slam1", "slam2"),
+                   tolerance_ns: Optional[int] = None) -> Optional[Dict[str, Frame]]:
+        """Frames of *cameras* captured at (nearly) the same instant.
+
+        Needs ``history > 0``. The camera whose newest frame is oldest is the
+        reference; its frames are tried newest-first and every other camera
+        contributes its nearest frame by capture timestamp (binary search).
+        Returns the newest bundle whose timestamps all lie within
+        *tolerance_ns* of the reference — or, with no tolerance, the
+        tightest bundle in the history. ``None`` if a camera has no frames
+        yet or nothing is within tolerance.
+
+        ``Frame.timestamp`` is the capture timestamp from the wire header.
+        """
+        if not self._history:
+            raise RuntimeError("get_synced() needs AriaBridgeObserver(history=N)")
+        for cam in cameras:
+            if cam not in self._history:
+                raise ValueError(f"Unknown camera {cam!r}")
+
+        with self._lock:
+            hists = [self._history[c] for c in cameras]
+            if any(len(h) == 0 for h in hists):
+                return None
+            ref = min(range(len(hists)), key=lambda i: hists[i].newest_timestamp())
+
+            best, best_spread = None, None
+            for k_ref in hists[ref].newest_first():
+                ts_ref = hists[ref].entry(k_ref)[0]
+                picks = [h.entry(k_ref if i == ref else h.nearest(ts_ref))
+                         for i, h in enumerate(hists)]
+                spread = max(abs(ts - ts_ref) for ts, _, _ in picks)
+                if best_spread is None or spread < best_spread:
+                    best, best_spread = picks, spread
+                if tolerance_ns is not None and spread <= tolerance_ns:
+                    break
+            else:
+                if tolerance_ns is not None:
+                    return None
+
+        bundle = {}
+        for cam, (ts, _, item) in zip(cameras, best):
+            image = self._history_image(cam, item)
+            if image is None:
+                return None  # shm slot overwritten before we processed it
+            bundle[cam] = Frame(image, ts, cam)
+        return bundle
+
+    def get_history(self, camera: str = "rgb", n: Optional[int] = None) -> List[Frame]:
+        """The last *n* frames of *camera* (all kept ones by default), oldest first.
+
+        Needs ``history > 0``. With ``history_prealloc`` the images are views
+        into the ring — nothing is copied.
+        """
+        history = self._history_of(camera)
+        with self._lock:
+            count = len(history) if n is None else min(n, len(history))
+            entries = [history.entry(k) for k in range(len(history) - count, len(history))]
+        return self._history_frames(camera, entries)
 
-    def get_latest(self, camera: str = "rgb") -> Optional[Frame]:
-        """Most recent :class:`Frame` for *camera*, or ``None``."""
+    def get_at(self, camera: str, timestamp_ns: int,
+               tolerance_ns: Optional[int] = None) -> Optional[Frame]:
+        """The kept frame of *camera* captured nearest to *timestamp_ns*.
+
+        Binary search over the history by capture timestamp. ``None`` if
+        there are no frames yet or the nearest is further than *tolerance_ns*.
+        """
+        history = self._history_of(camera)
         with self._lock:
-            img = self._frames.get(camera)
-            if img is None:
+            if not len(history):
                 return None
-            return Frame(img.copy(), int(time.time() * 1e9), camera)
+            entry = history.entry(history.nearest(timestamp_ns))
+        if tolerance_ns is not None and abs(entry[0] - timestamp_ns) > tolerance_ns:
+            return None
+        frames = self._history_frames(camera, [entry])
+        return frames[0] if frames else None
+
+    def get_imu(self, since_ns: Optional[int] = None, imu: int = 0) -> np.ndarray:
+        """IMU samples with a device timestamp after *since_ns* (all kept ones by default).
+
+        A structured array (:data:`.imu.IMU_DTYPE`: ``timestamp_ns``,
+        ``host_ns``, ``accel``, ``gyro``), oldest first. It is a *view* into
+        the ring — each sample in it is overwritten once ``imu_capacity``
+        newer samples have arrived, so copy what you keep. Pass the last
+        ``timestamp_ns`` you saw to get only new samples. Needs the
+        ``"imu"`` stream.
+        """
+        with self._lock:
+            ring = self._imu.get(imu)
+            if ring is None:
+                return np.zeros(0, dtype=IMU_DTYPE)
+            return ring.since(since_ns)
+
+    def get_timestamp(self, camera: str = "rgb") -> Optional[int]:
+        """Capture timestamp (ns, from the wire header) of the latest frame, or ``None``."""
+        with self._lock:
+            return self._timestamps.get(camera)
+
+    def get_latest(self, camera: str = "rgb",
+                   output_format: Optional[str] = None) -> Optional[Frame]:
+        """Most recent :class:`Frame` for *camera* (a copy), or ``None``."""
+        img, _ = self._current(camera, output_format)
+        if img is None:
+            return None
+        with self._lock:
+            timestamp, timing = self._timestamps[camera], self._timing[camera]
+        return Frame(img.copy(), timestamp, camera, timing)
 
     def get_stats(self) -> Dict[str, Any]:
         elapsed = time.time() - self._start_time
         with self._lock:
-            return {
+            stats = {
                 "source": "aria-bridge",
                 "frames": dict(self._frame_counts),
                 "fps": {k: v / elapsed for k, v in self._frame_counts.items() if v > 0},
                 "uptime": elapsed,
                 "zmq_endpoint": self._endpoint,
+                "streams": list(self._streams),
+                "channels": list(self._channels),
+                "output_format": dict(self._formats),
+                "mono_output": self._mono,
+                "mono_bytes_saved": self._mono_bytes_saved,
             }
+            callbacks = [c for cbs in self._callbacks.values() for c in cbs]
+            if callbacks:
+                stats["callbacks"] = [c.stats() for c in callbacks]
+            if self._lazy:
+                stats["lazy"] = {
+                    "processed": dict(self._processed_counts),
+                    "unread": {k: self._frame_counts[k] - v
+                               for k, v in self._processed_counts.items()},
+                }
+            latency = self._latency.percentiles()
+            if latency:
+                stats["latency"] = latency
+            if self._imu:
+                stats["imu"] = {
+                    idx: {"samples": ring.total, "kept": len(ring),
+                          "lost_batches": self._imu_lost_batches[idx]}
+                    for idx, ring in self._imu.items()
+                }
+            if self._drops:
+                stats["drops"] = {k: d.as_dict() for k, d in self._drops.items()}
+            if self._latest_only:
+                stats["superseded"] = dict(self._superseded)
+            if self._history:
+                stats["history"] = {
+                    k: {"depth": h.depth, "frames": len(h), "bytes": h.nbytes()}
+                    for k, h in self._history.items()
+                }
+                for k, overflow in self._history_overflow.items():
+                    if overflow:
+                        stats["history"][k]["overflow"] = overflow
+            if self._pools:
+                stats["pool"] = {k: p.stats() for k, p in self._pools.items()}
+            if is_shm_endpoint(self._endpoint):
+                overruns = sum(src.overruns for src in self._sources.values())
+                stats["shm"] = {"overruns": overruns, "torn": self._torn_frames}
+            return stats
 
     def stop(self):
         """Stop the background receive thread and telemetry."""
-        self._stop_event.set()
+        with self._new_frame:
+            self._stop_event.set()
+            self._new_frame.notify_all()
         self._thread.join(timeout=2)
+        self._close_callbacks()
         if self._telemetry:
             self._telemetry.stop()
 
@@ -145,91 +586,353 @@ class AriaBridgeObserver:
     # Internals
     # ------------------------------------------------------------------
 
-    def _receive_loop(self):
-        ctx = zmq.Context()
-        socket = ctx.socket(zmq.PULL)
-        socket.setsockopt(zmq.RCVHWM, 2)  # drop oldest frames if consumer is slow
-        socket.connect(self._endpoint)
-
-        poller = zmq.Poller()
-        poller.register(socket, zmq.POLLIN)
-
-        try:
-            while not self._stop_event.is_set():
-                events = dict(poller.poll(timeout=100))
-                if socket not in events:
-                    continue
-
-                parts = socket.recv_multipart(copy=False)
-                if len(parts) != 2:
-                    continue
+    def _current(self, camera: str, fmt: Optional[str] = None):
+        """``(frame, version)`` for *camera*, processing the raw frame if needed.
 
-                header_buf, pixel_buf = parts
-                if len(header_buf) < HEADER_SIZE:
-                    continue
-
-                magic, cam_id, timestamp_ns, width, height, channels = struct.unpack(
-                    HEADER_FORMAT, bytes(header_buf))
+        *fmt* other than the camera's own format is only possible in lazy
+        mode, where the raw buffer of the current version is kept.
+        """
+        own = fmt is None or fmt == self._formats.get(camera)
+        if not own:
+            check_format(fmt)
+            if not self._lazy:
+                raise ValueError("per-call output_format needs lazy=True "
+                                 "(eager mode does not keep raw frames)")
+
+        def cached():
+            if own:
+                return self._frames.get(camera)
+            return self._alt_frames.get(camera, {}).get(fmt)
 
-                if magic != HEADER_MAGIC:
-                    continue
+        with self._lock:
+            frame = cached()
+            version = self._frame_versions.get(camera, 0)
+            entry = self._raw.get(camera)
+        if frame is not None or entry is None:
+            return frame, version
+
+        with self._process_locks[camera]:
+            with self._lock:  # another reader may have processed it meanwhile
+                if self._frame_versions[camera] == version and cached() is not None:
+                    return cached(), version
+
+            raw, still_valid = entry
+            fmt = fmt or self._formats[camera]
+            pool = self._pools.get(camera) if own else None
+            frame = self._process_frame(camera, raw, pool, fmt, self._mono)
+            with self._lock:
+                if still_valid is not None and not still_valid():
+                    self._torn_frames += 1
+                    if pool:
+                        pool.release(frame)
+                    return None, version
+                self._mono_bytes_saved += mono_bytes_saved(raw, fmt, self._mono)
+                if own:
+                    self._processed_counts[camera] += 1
+                if self._frame_versions[camera] == version:
+                    if own:
+                        self._frames[camera] = frame
+                        self._timing[camera] = self._done(self._timing[camera])
+                    else:
+                        self._alt_frames[camera][fmt] = frame
+                elif pool:
+                    pool.release(frame)  # superseded before it was published
+        return frame, version
+
+    def _history_of(self, camera: str):
+        if not self._history:
+            raise RuntimeError("frame history needs AriaBridgeObserver(history=N)")
+        if camera not in self._history:
+            raise ValueError(f"Unknown camera {camera!r}")
+        return self._history[camera]
+
+    def _history_frames(self, camera: str, entries) -> List[Frame]:
+        frames = []
+        for ts, _, item in entries:
+            image = self._history_image(camera, item)
+            if image is not None:  # lazy shm frames may have been overwritten
+                frames.append(Frame(image, ts, camera))
+        return frames
+
+    def _history_image(self, camera: str, item) -> Optional[np.ndarray]:
+        """Image of a history entry — processed on demand in lazy mode."""
+        if not isinstance(item, tuple):
+            item.flags.writeable = False
+            fmt = self._formats[camera]
+            # The ring stores mono frames once; re-expand like process_frame did
+            if self._mono == "broadcast" and item.ndim == 2 and fmt != "gray":
+                return _expand_mono(item, fmt)
+            return item
+        raw, still_valid = item
+        image = self._process_frame(camera, raw, None, self._formats[camera], self._mono)
+        if still_valid is not None and not still_valid():
+            return None
+        return image
+
+    def _entry_frame(self, camera: str, entry: tuple) -> Optional[Frame]:
+        """The exact frame queued for a callback in lazy mode, as a :class:`Frame`.
+
+        While *entry* is still the current version it is processed (once)
+        through :meth:`_current`, shared with :meth:`get_frame`; a frame
+        that has been superseded meanwhile is processed on its own.
+        """
+        raw, still_valid, timestamp_ns, version, timing = entry
+        image, current = self._current(camera)
+        if current != version:
+            image = None  # superseded: process this frame on its own
+        elif image is None:
+            return None  # shm slot overwritten before it was processed
+        else:
+            with self._lock:
+                if self._frames[camera] is image:
+                    timing = self._timing[camera]
+                    pool = self._pools.get(camera)
+                    if pool:
+                        pool.retain(image)  # released by the callback when done
+                else:  # superseded meanwhile; a pooled buffer may be reused
+                    image = None
+        if image is None:
+            image = self._history_image(camera, (raw, still_valid))
+            if image is None:
+                with self._lock:
+                    self._torn_frames += 1
+                return None
+        image.flags.writeable = False
+        return Frame(image, timestamp_ns, camera, timing)
+
+    def _done(self, timing: Optional[FrameTiming]) -> Optional[FrameTiming]:
+        """Stamp *timing* as processed now and feed the latency tracker."""
+        if timing is None or timing.processed_ns is not None:
+            return timing
+        timing = timing._replace(processed_ns=time.monotonic_ns())
+        self._latency.record(timing)
+        return timing
+
+    def _close_callbacks(self):
+        with self._lock:
+            callbacks = [c for cbs in self._callbacks.values() for c in cbs]
+            self._callbacks = {k: [] for k in self._callbacks}
+        for callback in callbacks:
+            callback.close()
 
-                cam_name = CAM_NAMES.get(cam_id)
-                if cam_name is None:
-                    continue
+    def _start_receiver(self):
+        self._thread = threading.Thread(target=self._receive_loop, daemon=True)
+        self._thread.start()
 
-                expected_pixels = width * height * channels
-                if len(pixel_buf) != expected_pixels:
-                    continue
+    def _open_sources(self, ctx: zmq.Context) -> Dict[str, Any]:
+        """One transport source per channel, each with its own HWM."""
+        self._sources = {
+            channel: open_source(ctx, channel_endpoint(self._endpoint, channel),
+                                 hwm=channel_setting(self._hwm, channel),
+                                 latest_only=self._latest_only and channel != "imu",
+                                 fanout=self._fanout)
+            for channel in self._channels
+        }
+        return self._sources
 
-                # frombuffer on ZMQ's zero-copy buffer — no extra copy here.
-                # _process_frame always calls ascontiguousarray = the one copy.
-                shape = (height, width, channels) if channels > 1 else (height, width)
-                raw = np.frombuffer(pixel_buf, dtype=np.uint8).reshape(shape)
+    def _receive_loop(self):
+        ctx = zmq.Context()
+        sources = self._open_sources(ctx)
 
-                processed = self._process_frame(cam_name, raw)
+        poller = zmq.Poller()
+        by_socket = {}
+        for source in sources.values():
+            poller.register(source.socket, zmq.POLLIN)
+            by_socket[source.socket] = source
 
-                with self._lock:
-                    self._frames[cam_name] = processed
-                    self._frame_counts[cam_name] += 1
-                    self._frame_versions[cam_name] += 1
-
-                total = sum(self._frame_counts.values())  # outside lock, 4 ints
-
-                # Log stats outside the lock — no need to hold it for prints
-                if total % 300 == 0:
-                    elapsed = time.time() - self._start_time
-                    with self._lock:
-                        counts = dict(self._frame_counts)
-                    fps = {k: v / elapsed for k, v in counts.items() if v > 0}
-                    fps_str = " ".join(f"{k}={v:.1f}" for k, v in fps.items())
-                    print(f"[aria-bridge] {fps_str} fps (total={total})")
-                    if self._telemetry and "rgb" in fps:
-                        self._telemetry.record_fps(fps["rgb"])
+        try:
+            while not self._stop_event.is_set():
+                # One message per ready stream per pass, so no stream starves another
+                for socket, _ in poller.poll(timeout=100):
+                    source = by_socket[socket]
+                    received = source.recv()
+                    if received is not None:
+                        self._handle_message(*received, superseded=source.skipped)
         except Exception as e:
             print(f"[aria-bridge] ERROR in receive thread: {e}", flush=True)
             traceback.print_exc()
         finally:
-            socket.close()
+            # Release anyone blocked in wait_for_frame, even if we crashed
+            with self._new_frame:
+                self._stop_event.set()
+                self._new_frame.notify_all()
+            for source in sources.values():
+                source.close()
             ctx.term()
 
-    @staticmethod
-    def _process_frame(cam_name: str, raw: np.ndarray) -> np.ndarray:
-        """Rotate and colour-convert to match Aria SDK standard output (BGR).
+    def _handle_message(self, header_buf, pixel_buf, still_valid=None,
+                        superseded: int = 0) -> Optional[str]:
+        """Decode, process and publish one message. Returns the camera name, or
+        ``None`` if the message was invalid or the frame was lost.
+
+        *superseded* is the number of older messages the source discarded
+        for this one (``latest_only``)."""
+        receive_ns = time.monotonic_ns()
+        header_buf = bytes(header_buf)  # a few dozen bytes; zmq.Frame doesn't slice
+        if header_buf[:4] == IMU_HEADER_MAGIC:
+            self._handle_imu(header_buf, pixel_buf, still_valid)
+            return None
+        header = unpack_header(header_buf)
+        if header is None:
+            return None
+
+        cam_name = CAM_NAMES.get(header.cam_id)
+        if cam_name is None:
+            return None
+
+        timestamp_ns, width, height, channels = (
+            header.timestamp_ns, header.width, header.height, header.channels)
+        expected_pixels = width * height * channels
+        if len(pixel_buf) != expected_pixels:
+            return None
+
+        timing = FrameTiming(header.capture_host_ns, header.callback_ns, header.send_ns,
+                             receive_ns)
+        drops = None
+        if superseded:
+            with self._lock:
+                self._superseded[cam_name] += superseded
+        if header.seq is not None:
+            with self._lock:
+                drops = self._drops.get(cam_name)
+                if drops is None:
+                    drops = self._drops[cam_name] = _StageDrops()
+                drops.update(header, superseded)
+
+        # frombuffer on ZMQ's zero-copy buffer (or the shm slot) — no
+        # extra copy here. _process_frame makes the one copy, into a
+        # pooled buffer when frame_pool is enabled.
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        raw = np.frombuffer(pixel_buf, dtype=np.uint8).reshape(shape)
+        pool = self._pools.get(cam_name)
+
+        if self._lazy:
+            # Keep the raw buffer; the first reader processes it
+            with self._lock:
+                if pool:
+                    pool.release(self._frames[cam_name])  # superseded
+                self._frames[cam_name] = None
+                self._alt_frames[cam_name] = {}
+                self._raw[cam_name] = (raw, still_valid)
+                self._timestamps[cam_name] = timestamp_ns
+                self._timing[cam_name] = timing  # completed by the first reader
+                self._frame_counts[cam_name] += 1
+                self._frame_versions[cam_name] += 1
+                version = self._frame_versions[cam_name]
+                if self._history:
+                    self._history[cam_name].push(timestamp_ns, version, (raw, still_valid))
+                self._new_frame.notify_all()
+        else:
+            fmt = self._formats[cam_name]
+            ring = self._history.get(cam_name)
+            out = None
+            if isinstance(ring, FrameRing):
+                # Process straight into the ring's reserved (invisible) slot
+                with self._lock:
+                    try:
+                        out = ring.reserve(output_shape(cam_name, raw, fmt, self._mono))
+                    except ValueError as e:  # not even depth 2 fits history_max_bytes
+                        self._history_overflow[cam_name] += 1
+                        if self._history_overflow[cam_name] == 1:
+                            print(f"[aria-bridge] WARNING {cam_name} frames not kept: {e}",
+                                  flush=True)
+            if out is not None:
+                processed = process_frame(cam_name, raw, fmt, out, self._mono)
+            else:
+                processed = self._process_frame(cam_name, raw, pool, fmt, self._mono)
+
+            # shm: the writer may have lapped the ring while we copied
+            if still_valid is not None and not still_valid():
+                with self._lock:
+                    self._torn_frames += 1
+                    if drops is not None:
+                        drops.transport += 1
+                if pool:
+                    pool.release(processed)
+                return None
 
-        All paths produce exactly one contiguous copy — no intermediate arrays.
+            timing = self._done(timing)
+            with self._lock:
+                if pool:
+                    pool.release(self._frames[cam_name])  # superseded
+                self._frames[cam_name] = processed
+                self._timestamps[cam_name] = timestamp_ns
+                self._timing[cam_name] = timing
+                self._frame_counts[cam_name] += 1
+                self._frame_versions[cam_name] += 1
+                if out is not None:
+                    ring.commit(timestamp_ns, self._frame_versions[cam_name])
+                elif isinstance(ring, FrameHistory):
+                    evicted = ring.push(timestamp_ns, self._frame_versions[cam_name], processed)
+                    if pool:  # the history holds its own reference
+                        pool.retain(processed)
+                        pool.release(evicted)
+                self._processed_counts[cam_name] += 1
+                self._mono_bytes_saved += mono_bytes_saved(raw, fmt, self._mono)
+                self._new_frame.notify_all()
+
+        callbacks = self._callbacks[cam_name]
+        if callbacks:
+            # Lazy: queue this exact raw frame; the worker that picks it up
+            # processes it (see _entry_frame), so every queued item stays a
+            # distinct frame whatever the queue size or worker count
+            if self._lazy:
+                item = (raw, still_valid, timestamp_ns, version, timing)
+            else:
+                processed.flags.writeable = False
+                item = Frame(processed, timestamp_ns, cam_name, timing)
+            for callback in callbacks:
+                if pool and not self._lazy:
+                    pool.retain(processed)  # released by the callback when done
+                callback.submit(item)
+
+        total = sum(self._frame_counts.values())  # outside lock, 4 ints
+
+        # Log stats outside the lock — no need to hold it for prints
+        if total % 300 == 0:
+            elapsed = time.time() - self._start_time
+            with self._lock:
+                counts = dict(self._frame_counts)
+            fps = {k: v / elapsed for k, v in counts.items() if v > 0}
+            fps_str = " ".join(f"{k}={v:.1f}" for k, v in fps.items())
+            print(f"[aria-bridge] {fps_str} fps (total={total})")
+            if self._telemetry and "rgb" in fps:
+                self._telemetry.record_fps(fps["rgb"])
+        return cam_name
+
+    def _handle_imu(self, header_buf, body, still_valid=None):
+        header = unpack_imu_header(header_buf)
+        if header is None:
+            return
+        if still_valid is not None:
+            body = bytes(body)  # a few KB — copy out of the shm slot, then validate
+            if not still_valid():
+                return
+        try:
+            timestamps, accel, gyro = unpack_imu_body(body, header.count)
+        except ValueError:
+            return
+        with self._lock:
+            ring = self._imu.get(header.imu_id)
+            if ring is None:
+                ring = self._imu[header.imu_id] = ImuRing(self._imu_capacity)
+                self._imu_lost_batches[header.imu_id] = 0
+            last = self._imu_seq.get(header.imu_id)
+            if last is not None and header.seq > last + 1:
+                self._imu_lost_batches[header.imu_id] += header.seq - last - 1
+            self._imu_seq[header.imu_id] = header.seq
+            ring.push(timestamps, accel, gyro, header.host_offset_ns)
+
+    @staticmethod
+    def _process_frame(cam_name: str, raw: np.ndarray,
+                       pool: Optional[FramePool] = None,
+                       fmt: str = DEFAULT_OUTPUT_FORMAT,
+                       mono: str = "stack") -> np.ndarray:
+        """Rotate and lay out *raw* to match Aria SDK standard output (*fmt*).
+
+        Every path writes one contiguous output — through the NumPy or the
+        tiled implementation, whichever :func:`process_frame` measured faster.
+        With a *pool* the output lands in a recycled buffer instead of a new one.
         """
-        if cam_name == "rgb":
-            # rot90(k=-1) + BGR flip in one ascontiguousarray call
-            return np.ascontiguousarray(np.rot90(raw, k=-1)[:, :, ::-1])
-        if cam_name == "eye":
-            rotated = np.rot90(raw, 2)
-            if rotated.ndim == 2:
-                return np.ascontiguousarray(np.stack([rotated] * 3, axis=-1))
-            return np.ascontiguousarray(rotated)
-        if cam_name in ("slam1", "slam2"):
-            rotated = np.rot90(raw, k=-1)
-            if rotated.ndim == 2:
-                return np.ascontiguousarray(np.stack([rotated] * 3, axis=-1))
-            return np.ascontiguousarray(rotated)
-        return np.ascontiguousarray(raw)
+        out = pool.acquire(output_shape(cam_name, raw, fmt, mono)) if pool else None
+        return process_frame(cam_name, raw, fmt, out, mono)
@@ -0,0 +1,107 @@
+"""Preallocated output buffers for processed frames.
+
+At 12 FPS a fresh 1408x1408x3 array per frame is ~70 MB/s of allocator
+churn. A :class:`FramePool` keeps a fixed set of buffers per camera and
+hands out a free one, so the receive thread can fill it in place with
+``np.copyto``.
+
+Ownership is explicit. :meth:`FramePool.acquire` hands a buffer out with
+one reference — the observer's, as the camera's latest frame — and every
+other holder that needs it intact (the frame history, each queued or
+running ``on_frame`` call) takes one with :meth:`~FramePool.retain` and
+gives it back with :meth:`~FramePool.release`. The observer releases its
+reference when a newer version supersedes the frame. A buffer with no
+references left joins the back of the free queue, so it is rewritten as
+late as possible.
+
+Plain readers (``get_frame``) take no reference: a frame you hold stays
+intact until it has been superseded and its buffer comes round again —
+at least ``size - 1`` newer frames when nothing else holds buffers. Copy
+frames you keep longer. When every buffer is held the pool falls back to
+a fresh allocation (a *miss*).
+"""
+
+import collections
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class FramePool:
+    """Fixed-size set of reusable output buffers for one camera."""
+
+    def __init__(self, size: int):
+        if size < 2:
+            raise ValueError("frame pool needs at least 2 buffers")
+        self._size = size
+        self._lock = threading.Lock()  # acquire: receive thread; release: any thread
+        self._slots: List[np.ndarray] = []
+        self._refs: List[int] = []
+        self._index: Dict[int, int] = {}  # id(buffer) → slot
+        self._free: collections.deque = collections.deque()  # oldest release first
+        self._shape: Optional[Tuple[int, ...]] = None
+        self._dtype = None
+        self.reuses = 0
+        self.misses = 0
+
+    def _slot(self, array: Optional[np.ndarray]) -> Optional[int]:
+        """Slot of the pool buffer *array* is (or views), ``None`` if not pooled."""
+        while array is not None:
+            i = self._index.get(id(array))
+            if i is not None and self._slots[i] is array:
+                return i
+            array = getattr(array, "base", None)
+        return None
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """A writable buffer of *shape*, handed out with one reference."""
+        with self._lock:
+            if shape != self._shape or dtype != self._dtype:
+                # Resolution or layout changed — drop the old buffers
+                self._slots, self._refs, self._index = [], [], {}
+                self._free.clear()
+                self._shape, self._dtype = shape, dtype
+
+            if self._free:
+                i = self._free.popleft()
+                self.reuses += 1
+            elif len(self._slots) < self._size:
+                i = len(self._slots)
+                self._slots.append(np.empty(shape, dtype=dtype))
+                self._refs.append(0)
+                self._index[id(self._slots[i])] = i
+            else:
+                self.misses += 1
+                return np.empty(shape, dtype=dtype)
+            self._refs[i] = 1
+            buf = self._slots[i]
+        buf.flags.writeable = True  # readers got it read-only
+        return buf
+
+    def retain(self, array: Optional[np.ndarray]):
+        """Take another reference to the buffer behind *array* (no-op if not pooled)."""
+        with self._lock:
+            i = self._slot(array)
+            if i is not None and self._refs[i] > 0:
+                self._refs[i] += 1
+
+    def release(self, array: Optional[np.ndarray]):
+        """Drop a reference; the buffer is free again once none are left."""
+        with self._lock:
+            i = self._slot(array)
+            if i is not None and self._refs[i] > 0:
+                self._refs[i] -= 1
+                if self._refs[i] == 0:
+                    self._free.append(i)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": self._size,
+                "allocated": len(self._slots),
+                "in_use": sum(1 for refs in self._refs if refs > 0),
+                "reuses": self.reuses,
+                "misses": self.misses,
+                "bytes": sum(b.nbytes for b in self._slots),
+            }
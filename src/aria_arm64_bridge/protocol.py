@@ -1,16 +1,63 @@
 """Wire protocol constants for the Aria ARM64 Bridge.
 
 Shared between the FEX-Emu receiver and the native ARM64 consumer.
-Protocol v2: 28-byte header + raw pixel data over ZMQ PUSH/PULL.
+Each message is a header + raw pixel data over ZMQ PUSH/PULL.
+
+Protocol v2 (28 bytes):
+    magic "ARI2", camera_id, pad(3), timestamp_ns, width, height, channels
+
+Protocol v3 (64 bytes) — what the receiver sends; observers accept both:
+    magic "ARI3", camera_id, pixel_format, flags, seq, sdk_drops,
+    timestamp_ns, capture_host_ns, callback_ns, send_ns, send_drops,
+    width, height, channels
+
+* ``seq``        — per-camera count of frames handed to the transport;
+  a gap on the consumer side is a frame lost between socket and observer
+* ``sdk_drops``  — cumulative frames the SDK skipped before the receiver
+  saw them (from the SDK frame numbers; valid if ``FLAG_SDK_SEQ`` is set)
+* ``send_drops`` — cumulative frames the receiver could not send (HWM)
+* ``capture_host_ns`` — capture time mapped to host ``CLOCK_MONOTONIC``
+  (0 = unknown); ``timestamp_ns`` stays in the device clock domain
+* ``callback_ns`` / ``send_ns`` — receiver ``CLOCK_MONOTONIC`` time the SDK
+  callback fired and the frame was sent (see :mod:`.latency`)
+
+All counters are per camera and restart with the receiver.
 """
 
 import struct
+from typing import NamedTuple, Optional
 
 HEADER_FORMAT = "<4sB3xQIII"
 HEADER_SIZE = struct.calcsize(HEADER_FORMAT)  # 28 bytes
 HEADER_MAGIC = b"ARI2"
 
+HEADER_V3_FORMAT = "<4sBBHIIQQQQIIII"
+HEADER_V3_SIZE = struct.calcsize(HEADER_V3_FORMAT)  # 64 bytes
+HEADER_V3_MAGIC = b"ARI3"
+
+# Pixel formats (v3)
+PIXEL_FORMAT_UNKNOWN = 0
+PIXEL_FORMAT_RGB8 = 1
+PIXEL_FORMAT_GRAY8 = 2
+
+# Header flags (v3)
+FLAG_SDK_SEQ = 0x0001  # sdk_drops is derived from SDK frame numbers
+
+# IMU batch (on the imu stream): header + struct-of-arrays body
+#   header: magic "ARIM", imu_id, flags, pad(2), count, seq, send_ns, host_offset_ns
+#   body:   timestamp_ns int64[count], accel float32[3][count] (m/s², x/y/z rows),
+#           gyro float32[3][count] (rad/s)
+# seq counts batches per IMU; host_offset_ns maps the device timestamps to
+# host CLOCK_MONOTONIC (valid if FLAG_HOST_OFFSET is set)
+IMU_HEADER_FORMAT = "<4sBB2xIIQq"
+IMU_HEADER_SIZE = struct.calcsize(IMU_HEADER_FORMAT)  # 32 bytes
+IMU_HEADER_MAGIC = b"ARIM"
+IMU_SAMPLE_BYTES = 8 + 6 * 4
+FLAG_HOST_OFFSET = 0x01
+
 DEFAULT_ZMQ_ENDPOINT = "tcp://127.0.0.1:5555"
+# Control socket of aria-bridge-daemon (JSON requests over REQ/REP)
+DEFAULT_DAEMON_ENDPOINT = "ipc:///tmp/aria-bridge-daemon"
 
 # Camera IDs
 CAM_RGB = 0
@@ -20,5 +67,154 @@ CAM_SLAM2 = 3
 
 CAM_NAMES = {CAM_RGB: "rgb", CAM_EYE: "eye", CAM_SLAM1: "slam1", CAM_SLAM2: "slam2"}
 
+# Receiver streams (``--streams``) are what the SDK subscribes to
+STREAMS = ("rgb", "slam", "et", "imu")
+STREAM_CAMERAS = {"rgb": ("rgb",), "slam": ("slam1", "slam2"), "et": ("eye",), "imu": ()}
+CAMERA_STREAMS = {cam: stream for stream, cams in STREAM_CAMERAS.items() for cam in cams}
+# Channels are what goes over the wire: one send path per camera (and one
+# for IMU), so cameras never share a queue. The endpoint of the first is
+# the configured endpoint, the others are derived from it (see
+# transport.channel_endpoint)
+CHANNELS = ("rgb", "slam1", "slam2", "eye", "imu")
+CHANNEL_STREAMS = {**CAMERA_STREAMS, "imu": "imu"}
+# SDK message_queue_size per stream and socket HWM per stream's channels —
+# SLAM runs at ~49 FPS
+DEFAULT_QUEUE_SIZES = {"rgb": 1, "slam": 2, "et": 1, "imu": 8}
+DEFAULT_HWM = {"rgb": 2, "slam": 4, "et": 2, "imu": 16}
+
+
+def parse_streams(streams) -> tuple:
+    """``"rgb,slam"`` or a sequence of stream names → validated tuple."""
+    if isinstance(streams, str):
+        streams = [s.strip() for s in streams.split(",") if s.strip()]
+    streams = tuple(dict.fromkeys(streams))
+    unknown = [s for s in streams if s not in STREAMS]
+    if unknown or not streams:
+        raise ValueError(f"Unknown streams {unknown}; expected some of {STREAMS}")
+    return streams
+
+
+def parse_stream_settings(spec, defaults: dict, channels: bool = False) -> dict:
+    """``"slam=4,rgb=1"`` / dict / int → full per-stream dict over *defaults*.
+
+    With *channels*, single channels may be set too (``"slam2=1"``); read
+    those settings with :func:`channel_setting`.
+    """
+    if isinstance(spec, str) and spec.strip().isdigit():
+        spec = int(spec)  # "4" = every stream
+    if isinstance(spec, int):
+        return {s: spec for s in defaults}
+    if isinstance(spec, str):
+        spec = dict(item.split("=", 1) for item in spec.split(",") if item.strip())
+    allowed = STREAMS + CHANNELS if channels else STREAMS
+    settings = dict(defaults)
+    for name, value in (spec or {}).items():
+        if name.strip() not in allowed:
+            raise ValueError(f"Unknown stream {name!r}; expected one of {allowed}")
+        settings[name.strip()] = int(value)
+    return settings
+
+
+def channel_setting(settings: dict, channel: str) -> int:
+    """*channel*'s own setting, else its stream's."""
+    return settings.get(channel, settings[CHANNEL_STREAMS[channel]])
+
+
+def parse_cameras(cameras, streams: tuple) -> tuple:
+    """Cameras to receive out of *streams* — all of theirs if *cameras* is ``None``."""
+    available = tuple(c for s in streams for c in STREAM_CAMERAS[s])
+    if cameras is None:
+        return available
+    if isinstance(cameras, str):
+        cameras = [c.strip() for c in cameras.split(",") if c.strip()]
+    cameras = tuple(dict.fromkeys(cameras))
+    unknown = [c for c in cameras if c not in available]
+    if unknown:
+        raise ValueError(f"Cameras {unknown} are not in streams {streams}; "
+                         f"expected some of {available}")
+    return cameras
+
+
+def stream_channels(streams: tuple, cameras: tuple) -> tuple:
+    """Channels carrying *cameras* (and IMU, if subscribed), in ``CHANNELS`` order."""
+    wanted = set(cameras) | ({"imu"} if "imu" in streams else set())
+    return tuple(c for c in CHANNELS if c in wanted)
+
+
 # Streaming profiles
 PROFILE_STREAMING = "profile12"  # streaming-optimized, no audio, ~11 FPS RGB
+
+
+class FrameHeader(NamedTuple):
+    """Decoded frame header. v2 headers carry no sequence or drop fields."""
+
+    version: int
+    cam_id: int
+    timestamp_ns: int
+    width: int
+    height: int
+    channels: int
+    pixel_format: int = PIXEL_FORMAT_UNKNOWN
+    flags: int = 0
+    seq: Optional[int] = None
+    sdk_drops: int = 0
+    send_drops: int = 0
+    send_ns: Optional[int] = None
+    callback_ns: Optional[int] = None
+    capture_host_ns: Optional[int] = None
+
+
+def pixel_format_for(channels: int) -> int:
+    return {1: PIXEL_FORMAT_GRAY8, 3: PIXEL_FORMAT_RGB8}.get(channels, PIXEL_FORMAT_UNKNOWN)
+
+
+def pack_header(cam_id: int, timestamp_ns: int, width: int, height: int, channels: int,
+                seq: int, send_ns: int, sdk_drops: int = 0, send_drops: int = 0,
+                flags: int = 0, callback_ns: int = 0, capture_host_ns: int = 0) -> bytes:
+    """Pack a v3 header. Host timestamps of 0 mean unknown."""
+    return struct.pack(HEADER_V3_FORMAT, HEADER_V3_MAGIC, cam_id, pixel_format_for(channels),
+                       flags, seq, sdk_drops, timestamp_ns, capture_host_ns, callback_ns,
+                       send_ns, send_drops, width, height, channels)
+
+
+def unpack_header(buf) -> Optional[FrameHeader]:
+    """Decode a v2 or v3 header, or ``None`` if *buf* is neither."""
+    buf = bytes(buf)
+    magic = buf[:4]
+    if magic == HEADER_V3_MAGIC and len(buf) >= HEADER_V3_SIZE:
+        (_, cam_id, pixel_format, flags, seq, sdk_drops, timestamp_ns, capture_host_ns,
+         callback_ns, send_ns, send_drops, width, height, channels) = struct.unpack_from(
+            HEADER_V3_FORMAT, buf)
+        return FrameHeader(3, cam_id, timestamp_ns, width, height, channels,
+                           pixel_format, flags, seq, sdk_drops, send_drops,
+                           send_ns or None, callback_ns or None, capture_host_ns or None)
+    if magic == HEADER_MAGIC and len(buf) >= HEADER_SIZE:
+        _, cam_id, timestamp_ns, width, height, channels = struct.unpack_from(HEADER_FORMAT, buf)
+        return FrameHeader(2, cam_id, timestamp_ns, width, height, channels)
+    return None
+
+
+class ImuBatchHeader(NamedTuple):
+    imu_id: int
+    flags: int
+    count: int
+    seq: int
+    send_ns: int
+    host_offset_ns: Optional[int]
+
+
+def pack_imu_header(imu_id: int, count: int, seq: int, send_ns: int,
+                    host_offset_ns: Optional[int] = None) -> bytes:
+    flags = 0 if host_offset_ns is None else FLAG_HOST_OFFSET
+    return struct.pack(IMU_HEADER_FORMAT, IMU_HEADER_MAGIC, imu_id, flags, count, seq,
+                       send_ns, host_offset_ns or 0)
+
+
+def unpack_imu_header(buf) -> Optional[ImuBatchHeader]:
+    """Decode an IMU batch header, or ``None`` if *buf* is not one."""
+    buf = bytes(buf)
+    if buf[:4] != IMU_HEADER_MAGIC or len(buf) < IMU_HEADER_SIZE:
+        return None
+    _, imu_id, flags, count, seq, send_ns, offset = struct.unpack_from(IMU_HEADER_FORMAT, buf)
+    return ImuBatchHeader(imu_id, flags, count, seq, send_ns,
+                          offset if flags & FLAG_HOST_OFFSET else None)
@@ -4,48 +4,102 @@ Connects to Aria glasses via the SDK, receives frames, and pushes
 them over ZMQ to the native ARM64 consumer.
 
 Usage:
-    PYTHONNOUSERSITE=1 FEXBash -c "python3 src/receiver/aria_receiver.py --interface usb"
-    PYTHONNOUSERSITE=1 FEXBash -c "python3 src/receiver/aria_receiver.py --interface wifi --device-ip 192.168.1.42"
-
-Protocol (v2):
-    Header: magic(4) + camera_id(1) + pad(3) + timestamp_ns(8) + width(4) + height(4) + channels(4)
-    Total header: 28 bytes, followed by raw pixel data (uint8)
+    PYTHONNOUSERSITE=1 FEXBash -c "python3 src/aria_arm64_bridge/receiver.py --interface usb"
+    PYTHONNOUSERSITE=1 FEXBash -c "python3 src/aria_arm64_bridge/receiver.py \
+        --interface wifi --device-ip 192.168.1.42"
+    ... receiver.py --streams rgb,slam,et --queue-size slam=2 --hwm slam=4
+    ... receiver.py --streams rgb,slam --cameras rgb,slam1 --hwm slam1=1
+    (or python3 -m aria_arm64_bridge.receiver with the package installed;
+    src/receiver/aria_receiver.py is the legacy v2 single-socket receiver)
+
+Protocol (v3, see aria_arm64_bridge.protocol):
+    Header: magic(4) + camera_id(1) + pixel_format(1) + flags(2) + seq(4) + sdk_drops(4)
+            + timestamp_ns(8) + capture_host_ns(8) + callback_ns(8) + send_ns(8)
+            + send_drops(4) + width(4) + height(4) + channels(4)
+    Total header: 64 bytes, followed by raw pixel data (uint8)
     Camera IDs: 0=rgb, 1=eye, 2=slam1, 3=slam2
+    seq / sdk_drops / send_drops are per camera, so the consumer can count
+    frames lost at each stage exactly.
+    capture_host_ns is the device capture time mapped to host CLOCK_MONOTONIC
+    by a running offset + drift estimate (aria_arm64_bridge.clock).
+
+Transport:
+    --zmq-endpoint tcp://... / ipc://...  header + pixels as one ZMQ message
+    --zmq-endpoint shm://aria             pixels in a /dev/shm slot ring,
+                                          header + slot index over ZMQ
+
+Streams and channels:
+    --streams (rgb, slam, et, imu) are what the SDK subscribes to. Each
+    camera is then sent on its own channel — socket / ring with its own HWM —
+    so ~49 FPS SLAM can never fill the queue RGB is waiting in, and slam1
+    never evicts slam2. rgb uses --zmq-endpoint; the others derive theirs
+    from it (tcp port + 1..4 for slam1, slam2, eye, imu; ipc/shm name
+    suffix — see transport.channel_endpoint). --cameras limits which
+    cameras are sent at all: the others are dropped in the SDK callback,
+    before any packing or copying.
+    IMU samples are sent in columnar batches every --imu-batch-ms
+    (aria_arm64_bridge.imu), not one message per sample.
+    --latest-only sets the SDK queue of every camera stream to 1, so the
+    SDK hands over only the newest frame; run the observer with
+    latest_only=True so its sockets drain to the newest frame too.
+    --fanout publishes (PUB) instead of pushing: any number of local
+    observers (fanout=True) see every frame, sent once; a slow one drops
+    frames on its own without stalling the others.
+
+Runtime control:
+    A REQ/REP socket next to the channels (transport.control_endpoint:
+    tcp port + 5, ipc "-control", shm ipc:///tmp/aria-<name>.control)
+    takes JSON requests to subscribe / unsubscribe streams, change their
+    SDK queue size, pause / resume sending and read receiver stats without
+    restarting (aria_arm64_bridge.control). Pausing and unsubscribing are
+    instant and leave the SDK subscription alone: the frames are dropped
+    per stream before packing. Only subscribing a stream the SDK was never
+    subscribed to resubscribes the SDK client. Channels of newly
+    subscribed streams are opened on demand and stay open after an
+    unsubscribe, so observers never have to reconnect.
 """
 
 import argparse
 import signal
-import struct
 import sys
 import time
+from pathlib import Path
 
 import zmq
 
+# Run as a plain script under FEX-Emu, so the package may not be importable
+try:
+    import aria_arm64_bridge  # noqa: F401
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aria_arm64_bridge.protocol import (
+    DEFAULT_ZMQ_ENDPOINT, FLAG_SDK_SEQ, CAM_RGB, CAM_EYE, CAM_SLAM1, CAM_SLAM2,
+    CHANNEL_STREAMS, DEFAULT_HWM, DEFAULT_QUEUE_SIZES,
+    channel_setting, pack_header, parse_cameras, parse_stream_settings, parse_streams,
+    stream_channels,
+)
+from aria_arm64_bridge.clock import ClockSync
+from aria_arm64_bridge.control import ReceiverControl, serve_request
+from aria_arm64_bridge.imu import ImuBatcher
+from aria_arm64_bridge.transport import channel_endpoint, control_endpoint, open_sink
+
 # These imports only work under FEX-Emu (x86_64)
 try:
     import aria.sdk as aria
 except ImportError:
     print("ERROR: aria.sdk not found. Run this under FEX-Emu.", file=sys.stderr)
-    print("  PYTHONNOUSERSITE=1 FEXBash -c \"python3 src/receiver/aria_receiver.py\"", file=sys.stderr)
+    print("  PYTHONNOUSERSITE=1 FEXBash -c \"python3 src/aria_arm64_bridge/receiver.py\"",
+          file=sys.stderr)
     sys.exit(1)
 
-DEFAULT_ZMQ_ENDPOINT = "tcp://127.0.0.1:5555"
 # profile12 = streaming-optimized, no audio (11 FPS RGB under FEX-Emu)
 # profile18 = streaming-optimized, has audio (9 FPS RGB, audio crashes observer)
 # profile28 = USB default but NOT streaming-optimized (<2 FPS under FEX-Emu)
 PROFILE_WIFI = "profile12"
 PROFILE_USB = "profile12"
 
-# Header format: magic(4s) + camera_id(B) + pad(3x) + timestamp(Q) + w(I) + h(I) + ch(I)
-HEADER_FORMAT = "<4sB3xQIII"
-HEADER_SIZE = 28
-HEADER_MAGIC = b"ARI2"
-
-# Camera ID mapping
-CAM_RGB = 0
-CAM_EYE = 1
-CAM_SLAM1 = 2
-CAM_SLAM2 = 3
+# aria.StreamingDataType member per stream
+STREAM_DATA_TYPES = {"rgb": "Rgb", "slam": "Slam", "et": "EyeTrack", "imu": "Imu"}
 
 
 class AriaFrameObserver:
@@ -55,28 +109,68 @@ class AriaFrameObserver:
     the observer pattern validated in Phase 2 streaming tests.
     """
 
-    def __init__(self, zmq_socket):
-        self._socket = zmq_socket
+    def __init__(self, sinks, imu_batch_ms=10.0):
+        self._sinks = sinks  # channel name → sink
+        self.paused = frozenset()  # streams not to send (control pause / unsubscribe)
+        self._imu_batch_ms = imu_batch_ms
+        self._imu_batchers = {}  # imu_idx → ImuBatcher
+        self._cameras = {}   # record.camera_id → (cam_id, cam_name), resolved once
         self._frame_counts = {"rgb": 0, "eye": 0, "slam1": 0, "slam2": 0}
+        # Drop accounting per camera, carried in every v3 header
+        self._send_drops = {k: 0 for k in self._frame_counts}
+        self._sdk_drops = {k: 0 for k in self._frame_counts}
+        self._sdk_frame_numbers = {}
+        # One device clock for all cameras
+        self._clock = ClockSync()
         self._start_time = time.monotonic()
         self._first_frame = True
 
-    def _send_frame(self, cam_id, cam_name, image, timestamp_ns):
+    def _count_sdk_drops(self, cam_name, frame_number):
+        """Gaps in the SDK's per-camera frame numbers = frames we never got."""
+        last = self._sdk_frame_numbers.get(cam_name)
+        if last is not None and frame_number > last + 1:
+            self._sdk_drops[cam_name] += frame_number - last - 1
+        self._sdk_frame_numbers[cam_name] = frame_number
+
+    def drop_stats(self):
+        return {"sdk": dict(self._sdk_drops), "send": dict(self._send_drops)}
+
+    def stats(self):
+        """Receiver-side counters, served on the control socket."""
+        return {
+            "frames": dict(self._frame_counts),
+            "drops": self.drop_stats(),
+            "imu": {str(idx): s for idx, s in self.imu_stats().items()},
+            "clock": self._clock.stats(),
+            "uptime": time.monotonic() - self._start_time,
+        }
+
+    def _send_frame(self, cam_id, cam_name, image, timestamp_ns, frame_number=None,
+                    callback_ns=0, capture_host_ns=0):
+        sink = self._sinks.get(cam_name)
+        if sink is None or CHANNEL_STREAMS[cam_name] in self.paused:
+            return  # camera not wanted — never packed, never crosses the FEX boundary
         height, width = image.shape[:2]
         channels = image.shape[2] if len(image.shape) == 3 else 1
 
         if self._first_frame:
             self._first_frame = False
             print(f"[receiver] First frame! cam={cam_name} shape={image.shape} "
-                  f"size={len(image.tobytes())} bytes")
-
-        header = struct.pack(HEADER_FORMAT, HEADER_MAGIC, cam_id, timestamp_ns,
-                             width, height, channels)
-        try:
-            # send_multipart avoids concatenating header + 5.9MB pixel buffer
-            self._socket.send_multipart([header, memoryview(image)], zmq.NOBLOCK, copy=False)
-        except zmq.Again:
-            return  # consumer too slow, drop frame
+                  f"size={image.nbytes} bytes")
+
+        flags = 0
+        if frame_number is not None:
+            self._count_sdk_drops(cam_name, frame_number)
+            flags |= FLAG_SDK_SEQ
+        # seq counts frames handed to the transport, so it only advances on success
+        header = pack_header(cam_id, timestamp_ns, width, height, channels,
+                             seq=self._frame_counts[cam_name], send_ns=time.monotonic_ns(),
+                             sdk_drops=self._sdk_drops[cam_name],
+                             send_drops=self._send_drops[cam_name], flags=flags,
+                             callback_ns=callback_ns, capture_host_ns=capture_host_ns)
+        if not sink.send(header, image):
+            self._send_drops[cam_name] += 1  # consumer too slow, drop frame
+            return
 
         self._frame_counts[cam_name] += 1
         total = sum(self._frame_counts.values())
@@ -84,32 +178,111 @@ class AriaFrameObserver:
             elapsed = time.monotonic() - self._start_time
             fps = {k: v / elapsed for k, v in self._frame_counts.items() if v > 0}
             fps_str = " ".join(f"{k}={v:.0f}" for k, v in fps.items())
-            print(f"[receiver] {fps_str} fps (total={total})")
+            drops = self.drop_stats()
+            clock = self._clock.stats()
+            print(f"[receiver] {fps_str} fps (total={total}) "
+                  f"drops sdk={sum(drops['sdk'].values())} send={sum(drops['send'].values())} "
+                  f"clock drift={clock['drift_ppm']:.1f}ppm outliers={clock['outliers']}")
 
     def on_image_received(self, image, record):
-        cam_str = str(record.camera_id)
-        timestamp_ns = getattr(record, "capture_timestamp_ns", int(time.time() * 1e9))
-
-        # Map camera — with RGB-only subscription we expect only RGB,
-        # but handle others in case subscription changes later
-        cam_id = CAM_RGB
-        cam_name = "rgb"
-        if "Slam1" in cam_str or "slam1" in cam_str.lower():
-            cam_id, cam_name = CAM_SLAM1, "slam1"
-        elif "Slam2" in cam_str or "slam2" in cam_str.lower():
-            cam_id, cam_name = CAM_SLAM2, "slam2"
-        elif "Eye" in cam_str or "eye" in cam_str.lower():
-            cam_id, cam_name = CAM_EYE, "eye"
+        callback_ns = time.monotonic_ns()  # same clock as the observer (FEX passes it through)
+        timestamp_ns = getattr(record, "capture_timestamp_ns", None)
+        if timestamp_ns is None:
+            # No device time — the callback time is the best host-domain capture time
+            timestamp_ns = capture_host_ns = callback_ns
+        else:
+            self._clock.observe(timestamp_ns, callback_ns)
+            capture_host_ns = self._clock.to_host(timestamp_ns)
+        frame_number = getattr(record, "frame_number", None)
+
+        camera = self._cameras.get(record.camera_id)
+        if camera is None:
+            camera = self._cameras[record.camera_id] = self._resolve_camera(record.camera_id)
+        cam_id, cam_name = camera
+
+        self._send_frame(cam_id, cam_name, image, timestamp_ns, frame_number, callback_ns,
+                         capture_host_ns)
+
+    def on_imu_received(self, samples, imu_idx):
+        sink = self._sinks.get("imu")
+        if sink is None or "imu" in self.paused:
+            return
+        batcher = self._imu_batchers.get(imu_idx)
+        if batcher is None:
+            batcher = self._imu_batchers[imu_idx] = ImuBatcher(
+                imu_idx, sink.send, interval_ms=self._imu_batch_ms,
+                host_offset=self._imu_host_offset)
+        now_ns = time.monotonic_ns()
+        for sample in samples:
+            batcher.add(sample.capture_timestamp_ns, sample.accel_msec2, sample.gyro_radsec,
+                        now_ns)
+
+    def _imu_host_offset(self, device_ns):
+        """Device → host offset from the camera clock sync (same device clock)."""
+        host_ns = self._clock.to_host(device_ns)
+        return None if host_ns is None else host_ns - device_ns
+
+    def flush_imu(self):
+        for batcher in self._imu_batchers.values():
+            batcher.flush()
+
+    def imu_stats(self):
+        return {idx: {"samples": b.sent_samples, "dropped_batches": b.dropped_batches}
+                for idx, b in self._imu_batchers.items()}
+
+    @staticmethod
+    def _resolve_camera(camera_id):
+        """Map an SDK camera id to ``(wire id, name)`` — once per id, not per frame."""
+        name = str(camera_id).lower()
+        if "slam1" in name:
+            return CAM_SLAM1, "slam1"
+        if "slam2" in name:
+            return CAM_SLAM2, "slam2"
+        if "eye" in name:
+            return CAM_EYE, "eye"
+        return CAM_RGB, "rgb"
+
+
+def configure_subscription(streaming_client, streams, queue_sizes):
+    """Set the SDK subscription to *streams* with their message queue sizes."""
+    # Never subscribe to audio — crashes under FEX-Emu (free(): invalid size)
+    sub_config = streaming_client.subscription_config
+    data_types = [getattr(aria.StreamingDataType, STREAM_DATA_TYPES[s]) for s in streams]
+    subscribed = data_types[0]
+    for data_type in data_types[1:]:
+        subscribed = subscribed | data_type
+    sub_config.subscriber_data_type = subscribed
+    for stream, data_type in zip(streams, data_types):
+        # 1 = latest frame only, reduce backlog
+        sub_config.message_queue_size[data_type] = queue_sizes[stream]
+    streaming_client.subscription_config = sub_config
 
-        self._send_frame(cam_id, cam_name, image, timestamp_ns)
 
+def run(interface, device_ip, zmq_endpoint, profile, streams=("rgb",),
+        queue_sizes=None, hwm=None, imu_batch_ms=10.0, cameras=None, latest_only=False,
+        fanout=False):
+    streams = parse_streams(streams)
+    cameras = parse_cameras(cameras, streams)
+    queue_sizes = parse_stream_settings(queue_sizes, DEFAULT_QUEUE_SIZES)
+    if latest_only:
+        queue_sizes.update({s: 1 for s in queue_sizes if s != "imu"})
+    hwm = parse_stream_settings(hwm, DEFAULT_HWM, channels=True)
 
-def run(interface, device_ip, zmq_endpoint, profile):
     ctx = zmq.Context()
-    socket = ctx.socket(zmq.PUSH)
-    socket.setsockopt(zmq.SNDHWM, 2)  # drop old frames if consumer is slow
-    socket.bind(zmq_endpoint)
-    print(f"[receiver] ZMQ bound to {zmq_endpoint}")
+    sinks = {}
+
+    def open_sinks(channels):
+        for channel in channels:
+            if channel in sinks:
+                continue
+            # Own socket per channel; drop old frames if the consumer is slow
+            endpoint = channel_endpoint(zmq_endpoint, channel)
+            channel_hwm = channel_setting(hwm, channel)
+            sinks[channel] = open_sink(ctx, endpoint, hwm=channel_hwm, fanout=fanout)
+            print(f"[receiver] {channel} {'published' if fanout else 'bound'} on {endpoint} "
+                  f"(hwm={channel_hwm})")
+
+    open_sinks(stream_channels(streams, cameras))
 
     device_client = aria.DeviceClient()
     client_config = aria.DeviceClientConfig()
@@ -136,16 +309,30 @@ def run(interface, device_ip, zmq_endpoint, profile):
 
     streaming_client = streaming_manager.streaming_client
 
-    # Subscribe to RGB only — audio subscription crashes under FEX-Emu (free(): invalid size)
-    sub_config = streaming_client.subscription_config
-    sub_config.subscriber_data_type = aria.StreamingDataType.Rgb
-    sub_config.message_queue_size[aria.StreamingDataType.Rgb] = 1  # latest frame only, reduce backlog
-    streaming_client.subscription_config = sub_config
+    configure_subscription(streaming_client, streams, queue_sizes)
+    print(f"[receiver] Subscribed to {','.join(streams)}")
 
-    observer = AriaFrameObserver(socket)
+    observer = AriaFrameObserver(sinks, imu_batch_ms)
     streaming_client.set_streaming_client_observer(observer)
     streaming_client.subscribe()
 
+    def resubscribe(new_streams, new_queue_sizes):
+        # Only called to widen the subscription (or change a queue size);
+        # streams added at runtime send all their cameras
+        added = tuple(s for s in new_streams if s not in streams)
+        open_sinks(stream_channels(added, parse_cameras(None, added)))
+        streaming_client.unsubscribe()
+        configure_subscription(streaming_client, new_streams, new_queue_sizes)
+        streaming_client.subscribe()
+        print(f"[receiver] Resubscribed to {','.join(new_streams)} "
+              f"(queue sizes {new_queue_sizes})")
+
+    control = ReceiverControl(streams, queue_sizes, resubscribe, observer.stats)
+    control_socket = ctx.socket(zmq.REP)
+    control_socket.setsockopt(zmq.LINGER, 0)
+    control_socket.bind(control_endpoint(zmq_endpoint))
+    print(f"[receiver] Control socket on {control_endpoint(zmq_endpoint)}")
+
     print("[receiver] Streaming active. Press Ctrl+C to stop.")
 
     shutdown = False
@@ -158,13 +345,20 @@ def run(interface, device_ip, zmq_endpoint, profile):
     signal.signal(signal.SIGTERM, handle_signal)
 
     while not shutdown:
-        time.sleep(0.1)
-
-    print("[receiver] Shutting down...")
+        if control_socket.poll(100, zmq.POLLIN):
+            serve_request(control_socket, control.handle)
+            observer.paused = control.muted
+
+    observer.flush_imu()
+    print(f"[receiver] Shutting down... drops={observer.drop_stats()}")
+    if "imu" in sinks:
+        print(f"[receiver] imu={observer.imu_stats()}")
     streaming_client.unsubscribe()
     streaming_manager.stop_streaming()
     device_client.disconnect(device)
-    socket.close()
+    control_socket.close()
+    for sink in sinks.values():
+        sink.close()
     ctx.term()
     print("[receiver] Done.")
 
@@ -173,15 +367,40 @@ def main():
     parser = argparse.ArgumentParser(description="Aria SDK frame receiver (FEX-Emu)")
     parser.add_argument("--interface", choices=["usb", "wifi"], default="usb")
     parser.add_argument("--device-ip", help="Aria glasses IP (required for wifi)")
-    parser.add_argument("--zmq-endpoint", default=DEFAULT_ZMQ_ENDPOINT)
+    parser.add_argument("--zmq-endpoint", default=DEFAULT_ZMQ_ENDPOINT,
+                        help="tcp://, ipc:// or shm://<name> (shared-memory ring)")
     parser.add_argument("--profile", default=None,
                         help="Streaming profile (default: profile12 — streaming-optimized, ~11 FPS)")
+    parser.add_argument("--streams", default="rgb",
+                        help="Comma-separated streams to subscribe: rgb,slam,et,imu (default: rgb)")
+    parser.add_argument("--queue-size", default=None,
+                        help="SDK message_queue_size per stream, e.g. rgb=1,slam=2")
+    parser.add_argument("--cameras", default=None,
+                        help="Cameras to send, e.g. rgb,slam1 (default: all of --streams)")
+    parser.add_argument("--hwm", default=None,
+                        help="Socket high-water mark per stream or camera, e.g. rgb=2,slam=4,slam2=1")
+    parser.add_argument("--imu-batch-ms", type=float, default=10.0,
+                        help="Send IMU samples in batches at most this old (default: 10)")
+    parser.add_argument("--latest-only", action="store_true",
+                        help="SDK queue of 1 for every camera stream (pair with the "
+                             "observer's latest_only=True)")
+    parser.add_argument("--fanout", action="store_true",
+                        help="Publish to any number of observers (fanout=True) instead of one")
     args = parser.parse_args()
 
     if args.interface == "wifi" and not args.device_ip:
         parser.error("--device-ip is required for wifi interface")
-
-    run(args.interface, args.device_ip, args.zmq_endpoint, args.profile)
+    try:
+        streams = parse_streams(args.streams)
+        cameras = parse_cameras(args.cameras, streams)
+        parse_stream_settings(args.queue_size, DEFAULT_QUEUE_SIZES)
+        parse_stream_settings(args.hwm, DEFAULT_HWM, channels=True)
+    except ValueError as e:
+        parser.error(str(e))
+
+    run(args.interface, args.device_ip, args.zmq_endpoint, args.profile,
+        streams, args.queue_size, args.hwm, args.imu_batch_ms, cameras, args.latest_only,
+        args.fanout)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,430 @@
+"""Record sessions to disk — raw wire messages in memory-mapped segments.
+
+A recording is a directory:
+
+* ``segment-00000.bin``, ... — files preallocated to *segment_bytes*,
+  mapped once and filled front to back with the messages exactly as they
+  came off the wire (v2/v3 header + pixels, or an IMU batch), each at a
+  64-byte aligned offset. Appending a frame is one copy into the mapping
+  and no syscall; the kernel writes the pages back in large sequential
+  chunks. A full segment is truncated to its used length and the next one
+  is mapped. Each segment is preallocated on a background thread while
+  the previous one fills, so a rollover never waits for ``fallocate``; the
+  spare segment is deleted on close.
+* ``index.bin`` — 8-byte magic, then one :data:`INDEX_DTYPE` record
+  (32 bytes) per message: channel, capture timestamp, receive time,
+  segment, offset and sizes. Records are buffered and written in blocks.
+  The index is authoritative: segment bytes no record points at (e.g.
+  after a crash) are ignored.
+* ``session.json`` — endpoint, streams and cameras of the recording.
+
+:class:`SessionRecorder` subscribes like :class:`.AriaBridgeObserver`, one
+source per channel. Run the receiver with ``--fanout`` (and the recorder
+with ``fanout=True``) to record alongside the application that consumes
+the stream. :class:`SessionReader` maps a recording back.
+
+Usage::
+
+    aria-bridge-record /data/session-01 --streams rgb,slam --fanout
+    aria-bridge-record /data/session-02 --zmq-endpoint shm://aria --duration 60
+"""
+
+import argparse
+import json
+import mmap
+import os
+import signal
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import zmq
+
+from .protocol import (
+    CHANNELS, DEFAULT_HWM, DEFAULT_ZMQ_ENDPOINT, IMU_HEADER_MAGIC,
+    channel_setting, parse_cameras, parse_stream_settings, parse_streams, stream_channels,
+    unpack_header, unpack_imu_header,
+)
+from .transport import channel_endpoint, open_source
+
+INDEX_MAGIC = b"ARIDX001"
+# channel: index into protocol.CHANNELS; timestamp_ns: capture time from the
+# header (first sample for IMU batches, device clock); recv_ns: host
+# CLOCK_MONOTONIC when recorded; the message is header_size + size bytes
+# at offset in segment
+INDEX_DTYPE = np.dtype([
+    ("timestamp_ns", "<i8"),
+    ("recv_ns", "<i8"),
+    ("offset", "<u8"),
+    ("size", "<u4"),
+    ("segment", "<u2"),
+    ("channel", "u1"),
+    ("header_size", "u1"),
+])
+DEFAULT_SEGMENT_BYTES = 1 << 30
+_ALIGN = 64
+
+
+def _segment_name(segment: int) -> str:
+    return f"segment-{segment:05d}.bin"
+
+
+class SessionWriter:
+    """Appends messages to the segments and index of a new recording at *path*."""
+
+    def __init__(self, path: str, segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 index_block: int = 256):
+        if segment_bytes < _ALIGN:
+            raise ValueError(f"segment_bytes must be >= {_ALIGN}")
+        os.makedirs(path, exist_ok=True)
+        index_path = os.path.join(path, "index.bin")
+        if os.path.exists(index_path):
+            raise FileExistsError(f"{path} already holds a recording")
+        self.path = path
+        self._segment_bytes = segment_bytes
+        self._index = open(index_path, "wb")
+        self._index.write(INDEX_MAGIC)
+        self._pending = np.zeros(index_block, dtype=INDEX_DTYPE)
+        self._num_pending = 0
+        self._segment = -1
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._buf: Optional[np.ndarray] = None
+        self._pos = 0
+        self._next_fd: Optional[int] = None  # segment preallocated in the background
+        self._next_thread: Optional[threading.Thread] = None
+        self.messages = 0
+        self.bytes = 0
+        self.torn = 0  # shm slots overwritten while we copied them
+        self._open_segment()
+
+    def append(self, channel: str, timestamp_ns: int, header, payload,
+               still_valid: Optional[Callable[[], bool]] = None,
+               recv_ns: Optional[int] = None) -> bool:
+        """Append one message; ``False`` if it was torn (*still_valid* failed)."""
+        header = np.frombuffer(header, dtype=np.uint8)
+        payload = np.frombuffer(payload, dtype=np.uint8)
+        size = len(header) + len(payload)
+        if size > self._segment_bytes:
+            raise ValueError(f"{size}-byte message exceeds the {self._segment_bytes}-byte segment")
+        if self._pos + size > self._segment_bytes:
+            self._open_segment()
+        start = self._pos
+        self._buf[start:start + len(header)] = header
+        self._buf[start + len(header):start + size] = payload
+        if still_valid is not None and not still_valid():
+            self.torn += 1
+            return False  # not indexed, so the next message simply overwrites it
+        self._pos = -(-(start + size) // _ALIGN) * _ALIGN
+
+        entry = self._pending[self._num_pending]
+        entry["timestamp_ns"] = timestamp_ns
+        entry["recv_ns"] = time.monotonic_ns() if recv_ns is None else recv_ns
+        entry["offset"] = start
+        entry["size"] = len(payload)
+        entry["segment"] = self._segment
+        entry["channel"] = CHANNELS.index(channel)
+        entry["header_size"] = len(header)
+        self._num_pending += 1
+        if self._num_pending == len(self._pending):
+            self.flush()
+        self.messages += 1
+        self.bytes += size
+        return True
+
+    def flush(self):
+        """Write the buffered index records (the segments are written back by the kernel)."""
+        if self._num_pending:
+            self._index.write(self._pending[:self._num_pending].tobytes())
+            self._num_pending = 0
+        self._index.flush()
+
+    def write_metadata(self, metadata: Dict[str, Any]):
+        with open(os.path.join(self.path, "session.json"), "w") as f:
+            json.dump(metadata, f, indent=2)
+
+    def close(self):
+        self.flush()
+        self._index.close()
+        self._close_segment()
+        fd = self._take_next_segment()
+        if fd is not None:  # never used — don't leave an empty segment behind
+            os.close(fd)
+            os.unlink(os.path.join(self.path, _segment_name(self._segment + 1)))
+
+    @property
+    def segments(self) -> int:
+        return self._segment + 1
+
+    def _open_segment(self):
+        self._close_segment()
+        self._segment += 1
+        fd = self._take_next_segment()
+        self._fd = fd if fd is not None else self._allocate_segment(self._segment)
+        self._next_thread = threading.Thread(
+            target=self._prepare_segment, args=(self._segment + 1,), daemon=True)
+        self._next_thread.start()
+        self._mm = mmap.mmap(self._fd, self._segment_bytes)
+        if hasattr(self._mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._mm.madvise(mmap.MADV_SEQUENTIAL)
+        self._buf = np.frombuffer(self._mm, dtype=np.uint8)
+        self._pos = 0
+
+    def _allocate_segment(self, segment: int) -> int:
+        path = os.path.join(self.path, _segment_name(segment))
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            try:
+                os.posix_fallocate(fd, 0, self._segment_bytes)  # real blocks, no holes
+            except (AttributeError, OSError):
+                os.ftruncate(fd, self._segment_bytes)
+        except OSError:
+            os.close(fd)
+            os.unlink(path)
+            raise
+        return fd
+
+    def _prepare_segment(self, segment: int):
+        """Background thread: allocate *segment* before the current one fills."""
+        try:
+            self._next_fd = self._allocate_segment(segment)
+        except OSError:
+            pass  # allocated inline at rollover, which reports the error
+
+    def _take_next_segment(self) -> Optional[int]:
+        """fd of the preallocated segment (waits for it), ``None`` if there is none."""
+        if self._next_thread is None:
+            return None
+        self._next_thread.join()
+        self._next_thread = None
+        fd, self._next_fd = self._next_fd, None
+        return fd
+
+    def _close_segment(self):
+        if self._mm is None:
+            return
+        self._buf = None  # release the export before unmapping
+        self._mm.close()
+        os.ftruncate(self._fd, self._pos)
+        os.close(self._fd)
+        self._mm = self._fd = None
+
+
+class SessionReader:
+    """A recording mapped back for reading.
+
+    ``index`` is the :data:`INDEX_DTYPE` array of all messages, in the order
+    they were recorded; :meth:`message` returns zero-copy views of one.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "index.bin"), "rb") as f:
+            raw = f.read()
+        if raw[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError(f"{path} is not a recording (bad index magic)")
+        count = (len(raw) - len(INDEX_MAGIC)) // INDEX_DTYPE.itemsize  # drop a torn tail
+        self.index = np.frombuffer(raw, dtype=INDEX_DTYPE, count=count, offset=len(INDEX_MAGIC))
+        metadata_path = os.path.join(path, "session.json")
+        self.metadata: Dict[str, Any] = {}
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as f:
+                self.metadata = json.load(f)
+        self._segments: Dict[int, mmap.mmap] = {}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def entries(self, channel: Optional[str] = None) -> np.ndarray:
+        """Index records, optionally of one *channel* only."""
+        if channel is None:
+            return self.index
+        return self.index[self.index["channel"] == CHANNELS.index(channel)]
+
+    def message(self, i: int) -> Tuple[memoryview, memoryview]:
+        """``(header, payload)`` of message *i* — views into the mapped segment."""
+        return self.read(self.index[i])
+
+    def read(self, entry) -> Tuple[memoryview, memoryview]:
+        """``(header, payload)`` of the message an index *entry* points at."""
+        view = memoryview(self._segment(int(entry["segment"])))
+        start, header_size = int(entry["offset"]), int(entry["header_size"])
+        payload_start = start + header_size
+        return view[start:payload_start], view[payload_start:payload_start + int(entry["size"])]
+
+    def close(self):
+        for mm in self._segments.values():
+            try:
+                mm.close()
+            except BufferError:
+                pass  # views still handed out (e.g. queued zero-copy sends); GC unmaps it
+        self._segments = {}
+
+    def _segment(self, segment: int) -> mmap.mmap:
+        mm = self._segments.get(segment)
+        if mm is None:
+            with open(os.path.join(self.path, _segment_name(segment)), "rb") as f:
+                mm = self._segments[segment] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)  # read ahead for replay
+        return mm
+
+
+def _message_timestamp(header: bytes, payload) -> Optional[int]:
+    """Capture timestamp of a frame or IMU batch, or ``None`` if it is invalid."""
+    if header[:4] == IMU_HEADER_MAGIC:
+        imu = unpack_imu_header(header)
+        if imu is None or imu.count == 0:
+            return None
+        return int(np.frombuffer(payload, dtype=np.int64, count=1)[0])
+    frame = unpack_header(header)
+    return None if frame is None else frame.timestamp_ns
+
+
+class SessionRecorder:
+    """Record the receiver's channels to *path* until :meth:`stop`.
+
+    Takes the observer's subscription options (*streams*, *cameras*,
+    *hwm*, *fanout*); with ``fanout=False`` the recorder is the stream's
+    only consumer. Messages are stored raw — nothing is decoded beyond the
+    header.
+    """
+
+    def __init__(self, path: str, zmq_endpoint: str = DEFAULT_ZMQ_ENDPOINT,
+                 streams: Sequence[str] = ("rgb",),
+                 cameras: Optional[Sequence[str]] = None,
+                 hwm: Union[int, Dict[str, int]] = DEFAULT_HWM,
+                 fanout: bool = False,
+                 segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 flush_interval: float = 1.0):
+        self._endpoint = zmq_endpoint
+        self._streams = parse_streams(streams)
+        cameras = parse_cameras(cameras, self._streams)
+        self._channels = stream_channels(self._streams, cameras)
+        self._hwm = parse_stream_settings(hwm, DEFAULT_HWM, channels=True)
+        self._fanout = fanout
+        self._flush_interval = flush_interval
+        self._writer = SessionWriter(path, segment_bytes)
+        self._writer.write_metadata({
+            "zmq_endpoint": zmq_endpoint,
+            "streams": list(self._streams),
+            "cameras": list(cameras),
+            "channels": list(self._channels),
+            "start_time": time.time(),
+            "start_monotonic_ns": time.monotonic_ns(),
+        })
+        self._counts: Dict[str, int] = {c: 0 for c in self._channels}
+        self._start_time = time.monotonic()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._receive_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop recording and close the files."""
+        self._stop_event.set()
+        self._thread.join(timeout=5)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "path": self._writer.path,
+            "messages": dict(self._counts),
+            "bytes": self._writer.bytes,
+            "segments": self._writer.segments,
+            "torn": self._writer.torn,
+            "uptime": time.monotonic() - self._start_time,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _receive_loop(self):
+        ctx = zmq.Context()
+        sources = {
+            channel: open_source(ctx, channel_endpoint(self._endpoint, channel),
+                                 hwm=channel_setting(self._hwm, channel), fanout=self._fanout)
+            for channel in self._channels
+        }
+        poller = zmq.Poller()
+        by_socket = {}
+        for channel, source in sources.items():
+            poller.register(source.socket, zmq.POLLIN)
+            by_socket[source.socket] = channel, source
+
+        last_flush = time.monotonic()
+        try:
+            while not self._stop_event.is_set():
+                for socket, _ in poller.poll(timeout=100):
+                    channel, source = by_socket[socket]
+                    received = source.recv()
+                    if received is None:
+                        continue
+                    header, payload, still_valid = received
+                    header = bytes(header)
+                    timestamp_ns = _message_timestamp(header, payload)
+                    if timestamp_ns is None:
+                        continue
+                    if self._writer.append(channel, timestamp_ns, header, payload, still_valid):
+                        self._counts[channel] += 1
+                # Bound what a crash can lose without a write per message
+                if time.monotonic() - last_flush >= self._flush_interval:
+                    self._writer.flush()
+                    last_flush = time.monotonic()
+        except Exception as e:
+            print(f"[aria-record] ERROR in receive thread: {e}", flush=True)
+            traceback.print_exc()
+        finally:
+            for source in sources.values():
+                source.close()
+            ctx.term()
+            self._writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record an Aria bridge stream to disk")
+    parser.add_argument("output", help="Directory for the recording (created)")
+    parser.add_argument("--zmq-endpoint", default=DEFAULT_ZMQ_ENDPOINT,
+                        help="tcp://, ipc:// or shm://<name>, as given to the receiver")
+    parser.add_argument("--streams", default="rgb")
+    parser.add_argument("--cameras", default=None)
+    parser.add_argument("--hwm", default=None)
+    parser.add_argument("--fanout", action="store_true",
+                        help="Subscribe to a --fanout receiver, next to other consumers")
+    parser.add_argument("--segment-mb", type=int, default=DEFAULT_SEGMENT_BYTES >> 20,
+                        help="Preallocated size of each segment file (default: 1024)")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Stop after this many seconds (default: until Ctrl+C)")
+    args = parser.parse_args()
+
+    try:
+        streams = parse_streams(args.streams)
+        recorder = SessionRecorder(
+            args.output, args.zmq_endpoint, streams=streams,
+            cameras=parse_cameras(args.cameras, streams),
+            hwm=parse_stream_settings(args.hwm, DEFAULT_HWM, channels=True),
+            fanout=args.fanout, segment_bytes=args.segment_mb << 20,
+        )
+    except (ValueError, FileExistsError) as e:
+        parser.error(str(e))
+
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    print(f"[aria-record] Recording {args.zmq_endpoint} to {args.output}. Ctrl+C to stop.")
+    stop.wait(args.duration)
+    recorder.stop()
+    stats = recorder.get_stats()
+    print(f"[aria-record] {stats['messages']} messages, {stats['bytes'] / 1e6:.1f} MB "
+          f"in {stats['segments']} segment(s), {stats['torn']} torn")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Replay receiver — stream a recorded session over the bridge transports.
+
+Serves a recording made with :mod:`.record` on the same ZMQ / shm channels
+as the real receiver, so observers, benchmarks and regression tests run
+against real data on any Linux box, without glasses or FEX-Emu. Messages
+are sent straight out of the memory-mapped segments.
+
+Pacing modes:
+
+* ``realtime`` — the original arrival schedule (the index's receive
+  times), optionally sped up by *speed*
+* ``rate``     — a fixed *rate* of messages per second, in recorded order
+* ``fast``     — as fast as the transport takes them
+
+Headers keep the recorded capture timestamps, SDK drop counts, flags and
+geometry. With *retime* (the default) the host-side fields are restamped
+as the receiver would: ``seq`` counts the frames this replay got out,
+``send_drops`` adds the frames it dropped, ``send_ns`` is the send time
+and the recorded host times (capture, callback, IMU host offset) move by
+the same amount, so per-stage latencies stay as recorded while transport
+latency is measured live. ``retime=False`` sends the headers byte for byte.
+
+Usage::
+
+    aria-bridge-replay /data/session-01                       # real time
+    aria-bridge-replay /data/session-01 --mode fast --loop 0  # saturate, forever
+    aria-bridge-replay /data/session-01 --mode rate --rate 60 --zmq-endpoint shm://aria
+"""
+
+import argparse
+import signal
+import struct
+import threading
+import time
+from typing import Any, Dict, Union
+
+import numpy as np
+import zmq
+
+from .protocol import (
+    CHANNELS, DEFAULT_HWM, DEFAULT_ZMQ_ENDPOINT, FLAG_HOST_OFFSET, HEADER_V3_FORMAT,
+    HEADER_V3_MAGIC, IMU_HEADER_FORMAT, IMU_HEADER_MAGIC,
+    channel_setting, parse_stream_settings,
+)
+from .record import SessionReader
+from .transport import channel_endpoint, open_sink
+
+MODES = ("realtime", "rate", "fast")
+
+
+class SessionReplayer:
+    """Binds the channels of the recording at *path* and replays it with :meth:`run`.
+
+    Only channels present in the recording are bound. *hwm* and *fanout*
+    are the receiver's options of the same name.
+    """
+
+    def __init__(self, path: str, zmq_endpoint: str = DEFAULT_ZMQ_ENDPOINT,
+                 hwm: Union[int, Dict[str, int], None] = None,
+                 fanout: bool = False, retime: bool = True):
+        self._reader = SessionReader(path)
+        self._retime = retime
+        self._hwm = parse_stream_settings(hwm, DEFAULT_HWM, channels=True)
+        present = set(np.unique(self._reader.index["channel"]).tolist())
+        self.channels = tuple(c for i, c in enumerate(CHANNELS) if i in present)
+        self._ctx = zmq.Context()
+        self._sinks = []  # by CHANNELS index
+        for channel in CHANNELS:
+            sink = None
+            if channel in self.channels:
+                endpoint = channel_endpoint(zmq_endpoint, channel)
+                sink = open_sink(self._ctx, endpoint, hwm=channel_setting(self._hwm, channel),
+                                 fanout=fanout)
+            self._sinks.append(sink)
+        # Per camera / IMU: frames sent and dropped, as the receiver counts them
+        self._seqs: Dict[Any, int] = {}
+        self._drops: Dict[Any, int] = {}
+        self._stop_event = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._reader)
+
+    def run(self, mode: str = "realtime", speed: float = 1.0, rate: float = 30.0,
+            loops: int = 1) -> Dict[str, Any]:
+        """Replay the recording *loops* times (0 = until :meth:`stop`).
+
+        Returns messages sent and dropped per channel, elapsed seconds and
+        throughput.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}; expected one of {MODES}")
+        if speed <= 0 or rate <= 0:
+            raise ValueError("speed and rate must be > 0")
+        index = self._reader.index
+        sent = np.zeros(len(CHANNELS), dtype=np.int64)
+        dropped = np.zeros(len(CHANNELS), dtype=np.int64)
+        nbytes = 0
+        if len(index) == 0:  # a valid but empty recording: nothing to send
+            return self._summary(mode, 0, sent, dropped, nbytes, 0.0)
+        if mode == "realtime":
+            offsets = (index["recv_ns"] - index["recv_ns"][0]) / speed
+        else:
+            offsets = np.arange(len(index)) * (1e9 / rate)
+
+        self._stop_event.clear()
+        start = time.monotonic()
+        loop = 0
+        while (loops == 0 or loop < loops) and not self._stop_event.is_set():
+            loop_start = time.monotonic_ns()
+            for i in range(len(index)):
+                entry = index[i]
+                if mode != "fast":
+                    delay = (loop_start + offsets[i] - time.monotonic_ns()) / 1e9
+                    if delay > 0 and self._stop_event.wait(delay):
+                        break
+                elif self._stop_event.is_set():
+                    break
+                channel = int(entry["channel"])
+                header, payload = self._reader.read(entry)
+                if self._send(channel, bytes(header), payload):
+                    sent[channel] += 1
+                    nbytes += len(header) + len(payload)
+                else:
+                    dropped[channel] += 1
+            loop += 1
+        return self._summary(mode, loop, sent, dropped, nbytes, time.monotonic() - start)
+
+    def _summary(self, mode: str, loops: int, sent: np.ndarray, dropped: np.ndarray,
+                 nbytes: int, elapsed: float) -> Dict[str, Any]:
+        return {
+            "mode": mode,
+            "loops": loops,
+            "sent": {c: int(sent[i]) for i, c in enumerate(CHANNELS) if c in self.channels},
+            "dropped": {c: int(dropped[i]) for i, c in enumerate(CHANNELS) if c in self.channels},
+            "elapsed": elapsed,
+            "messages_per_s": float(sent.sum()) / elapsed if elapsed > 0 else 0.0,
+            "mb_per_s": nbytes / 1e6 / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def stop(self):
+        """Make a running :meth:`run` return after the current message."""
+        self._stop_event.set()
+
+    def close(self):
+        for sink in self._sinks:
+            if sink is not None:
+                sink.close()
+        self._ctx.term()
+        self._reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _send(self, channel: int, header: bytes, payload) -> bool:
+        if not self._retime:
+            return self._sinks[channel].send(header, np.frombuffer(payload, dtype=np.uint8))
+        send_ns = time.monotonic_ns()
+        magic = header[:4]
+        if magic == HEADER_V3_MAGIC:
+            fields = list(struct.unpack_from(HEADER_V3_FORMAT, header))
+            key = fields[1]  # camera id
+            # seq 4, capture_host_ns 7, callback_ns 8, send_ns 9, send_drops 10
+            shift = send_ns - fields[9] if fields[9] else 0
+            for f in (7, 8):
+                if fields[f]:
+                    fields[f] += shift
+            fields[4], fields[9] = self._seqs.get(key, 0), send_ns
+            fields[10] += self._drops.get(key, 0)
+            header = struct.pack(HEADER_V3_FORMAT, *fields)
+        elif magic == IMU_HEADER_MAGIC:
+            fields = list(struct.unpack_from(IMU_HEADER_FORMAT, header))
+            key = ("imu", fields[1])
+            # flags 2, seq 4, send_ns 5, host_offset_ns 6
+            if fields[2] & FLAG_HOST_OFFSET and fields[5]:
+                fields[6] += send_ns - fields[5]
+            fields[4], fields[5] = self._seqs.get(key, 0), send_ns
+            header = struct.pack(IMU_HEADER_FORMAT, *fields)
+        else:
+            key = None  # v2: no host fields to restamp
+        ok = self._sinks[channel].send(header, np.frombuffer(payload, dtype=np.uint8))
+        if key is not None:
+            counts = self._seqs if ok else self._drops
+            counts[key] = counts.get(key, 0) + 1
+        return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded Aria session over the "
+                                                 "bridge transports (no glasses needed)")
+    parser.add_argument("session", help="Recording directory (aria-bridge-record)")
+    parser.add_argument("--zmq-endpoint", default=DEFAULT_ZMQ_ENDPOINT,
+                        help="tcp://, ipc:// or shm://<name> (shared-memory ring)")
+    parser.add_argument("--mode", choices=MODES, default="realtime")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="realtime: playback speed factor (default: 1)")
+    parser.add_argument("--rate", type=float, default=30.0,
+                        help="rate: messages per second (default: 30)")
+    parser.add_argument("--loop", type=int, default=1,
+                        help="Times to replay the session, 0 = forever (default: 1)")
+    parser.add_argument("--hwm", default=None,
+                        help="Socket high-water mark per stream or camera, e.g. rgb=2,slam=4")
+    parser.add_argument("--fanout", action="store_true",
+                        help="Publish to any number of observers (fanout=True)")
+    parser.add_argument("--exact-headers", action="store_true",
+                        help="Send the recorded headers unchanged (no seq / host time restamp)")
+    parser.add_argument("--wait", type=float, default=1.0,
+                        help="Seconds to wait for observers to connect (default: 1)")
+    args = parser.parse_args()
+
+    try:
+        hwm = parse_stream_settings(args.hwm, DEFAULT_HWM, channels=True)
+        replayer = SessionReplayer(args.session, args.zmq_endpoint, hwm=hwm, fanout=args.fanout,
+                                   retime=not args.exact_headers)
+    except (ValueError, FileNotFoundError) as e:
+        parser.error(str(e))
+
+    signal.signal(signal.SIGINT, lambda *_: replayer.stop())
+    signal.signal(signal.SIGTERM, lambda *_: replayer.stop())
+    print(f"[replay] {len(replayer)} messages on {','.join(replayer.channels)} "
+          f"from {args.session}")
+    time.sleep(args.wait)
+    print(f"[replay] Streaming ({args.mode}). Press Ctrl+C to stop.")
+    with replayer:
+        stats = replayer.run(args.mode, args.speed, args.rate, args.loop)
+    print(f"[replay] Done. sent={stats['sent']} dropped={stats['dropped']} "
+          f"{stats['messages_per_s']:.0f} msg/s {stats['mb_per_s']:.0f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ Usage::
 
     t = Telemetry()        # starts immediately, auto-detects log dir
     t.record_fps(12.3)     # call from observer on each stats tick
+    t.set_latency_source(tracker.percentiles)  # sampled once per row
     t.stop()               # flush and close CSV
 """
 
@@ -18,6 +19,9 @@ import subprocess
 import threading
 import time
 from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from .latency import STAGES
 
 
 def _find_log_dir() -> Path:
@@ -97,7 +101,7 @@ FIELDS = [
     "total_cpu",
     "ram_used_mb", "ram_free_mb",
     "gpu_util", "gpu_ram_used_mb",
-]
+] + [f"lat_{stage}_{p}_ms" for stage in STAGES for p in ("p50", "p95", "p99")]
 
 
 class Telemetry:
@@ -109,6 +113,7 @@ class Telemetry:
         self._pid_obs = os.getpid()
         self._stop = threading.Event()
         self._fps_rgb: float = 0.0
+        self._latency_source: Optional[Callable[[], Dict[str, dict]]] = None
         self._lock = threading.Lock()
 
         log_dir = _find_log_dir()
@@ -128,6 +133,11 @@ class Telemetry:
         with self._lock:
             self._fps_rgb = fps
 
+    def set_latency_source(self, source: Callable[[], Dict[str, dict]]) -> None:
+        """Callable returning per-stage percentiles, polled from this thread."""
+        with self._lock:
+            self._latency_source = source
+
     def stop(self) -> None:
         self._stop.set()
         self._thread.join(timeout=3)
@@ -156,6 +166,8 @@ class Telemetry:
 
             with self._lock:
                 fps = self._fps_rgb
+                latency_source = self._latency_source
+            latency = latency_source() if latency_source else {}
 
             row = {
                 "timestamp": ts,
@@ -171,4 +183,7 @@ class Telemetry:
                 "gpu_util": teg.get("gpu_util", 0),
                 "gpu_ram_used_mb": teg.get("ram_used_mb", 0),
             }
+            for stage, pct in latency.items():
+                for p in ("p50", "p95", "p99"):
+                    row[f"lat_{stage}_{p}_ms"] = pct[f"{p}_ms"]
             self._writer.writerow(row)
@@ -0,0 +1,340 @@
+"""Frame transforms — rotate to the Aria SDK orientation and lay out pixels.
+
+With the NumPy path every output format is produced in a single pass
+from the raw received buffer: the rotation, channel order and HWC→CHW transpose are all numpy
+*views*, so the only full-frame write is the final copy into the output
+array. Grayscale from a colour camera needs arithmetic and is computed on
+the raw (contiguous) buffer, writing straight into the rotated output.
+
+Output formats:
+
+* ``bgr_hwc`` — default, matches AriaDemoObserver / OpenCV
+* ``rgb_hwc``
+* ``gray``    — single channel (BT.601 luma for the RGB camera)
+* ``rgb_chw`` / ``bgr_chw`` — planar, ready for TensorRT-style inputs
+
+Mono cameras (eye, SLAM) are replicated to three channels in the colour
+formats and returned as-is in ``gray``. The replication can be skipped
+with a *mono* mode:
+
+* ``stack``     — default, three real channels (AriaDemoObserver-compatible)
+* ``single``    — the rotated single-channel ``(H, W)`` array
+* ``broadcast`` — a read-only three-channel view over the single channel;
+  ``np.array(view)`` materialises it only if you need to
+
+Tiled path: a rotated view read in one go is a strided gather — every
+output row walks a column of the raw frame — so most formats also have a
+cache-blocked implementation that copies the rotation in bands of
+:data:`TILE_ROWS` output rows, moves whole 3-byte pixels instead of single
+bytes, does the RGB camera's rotate + channel swap as a byte reversal
+(a 180° turn that also reverses each pixel) followed by a quarter turn the
+other way, and writes stacked mono channels plane by plane. Its output is
+bit-identical. With ``path="auto"`` (default) :func:`process_frame` times
+both implementations on the first frames of each camera / shape / format
+and keeps the faster one; ``benchmarks/bench_transforms.py`` reports both.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+OUTPUT_FORMATS = ("bgr_hwc", "rgb_hwc", "gray", "rgb_chw", "bgr_chw")
+DEFAULT_OUTPUT_FORMAT = "bgr_hwc"
+MONO_MODES = ("stack", "single", "broadcast")
+PATHS = ("auto", "tiled", "numpy")
+
+# Output rows per band in the tiled copies: a band reads TILE_ROWS columns
+# of the raw frame, which stay in cache until the band is written out
+TILE_ROWS = 32
+# Frames timed per implementation before path="auto" settles
+CALIBRATION_FRAMES = 5
+
+# Fixed-point BT.601 weights (sum to 256) for R, G, B
+_GRAY_WEIGHTS = (77, 150, 29)
+
+
+def check_format(fmt: str) -> str:
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}; expected one of {OUTPUT_FORMATS}")
+    return fmt
+
+
+def check_mono_mode(mono: str) -> str:
+    if mono not in MONO_MODES:
+        raise ValueError(f"Unknown mono mode {mono!r}; expected one of {MONO_MODES}")
+    return mono
+
+
+def mono_bytes_saved(raw: np.ndarray, fmt: str, mono: str) -> int:
+    """Bytes not written by skipping channel replication for this frame."""
+    if raw.ndim != 2 or mono == "stack" or fmt == "gray":
+        return 0
+    return 2 * raw.size
+
+
+def rotate(cam_name: str, raw: np.ndarray) -> np.ndarray:
+    """Rotated view of *raw* in the Aria SDK standard orientation."""
+    if cam_name in ("rgb", "slam1", "slam2"):
+        return np.rot90(raw, k=-1)
+    if cam_name == "eye":
+        return np.rot90(raw, 2)
+    return raw
+
+
+def _unrotate(cam_name: str, out: np.ndarray) -> np.ndarray:
+    """View of *out* in the raw orientation — writes land rotated in *out*."""
+    if cam_name in ("rgb", "slam1", "slam2"):
+        return np.rot90(out, k=1)
+    if cam_name == "eye":
+        return np.rot90(out, 2)
+    return out
+
+
+def frame_view(cam_name: str, raw: np.ndarray,
+               fmt: str = DEFAULT_OUTPUT_FORMAT) -> Optional[np.ndarray]:
+    """Output-layout *view* of *raw* — no data copied.
+
+    Returns ``None`` for ``gray`` from a colour camera, which needs
+    arithmetic rather than a view (see :func:`process_frame`).
+    """
+    rotated = rotate(cam_name, raw)
+    if rotated.ndim == 2:
+        if fmt == "gray":
+            return rotated
+        h, w = rotated.shape
+        if fmt.endswith("_hwc"):
+            # Grayscale → 3 identical channels, like AriaDemoObserver
+            return np.broadcast_to(rotated[:, :, None], (h, w, 3))
+        return np.broadcast_to(rotated[None, :, :], (3, h, w))
+
+    if fmt == "gray":
+        return None
+    # Only the RGB camera delivers RGB order; flip it for the BGR layouts
+    if cam_name == "rgb" and fmt.startswith("bgr"):
+        rotated = rotated[:, :, ::-1]
+    if fmt.endswith("_chw"):
+        return rotated.transpose(2, 0, 1)
+    return rotated
+
+
+def _computed_format(raw: np.ndarray, fmt: str, mono: str) -> str:
+    # Mono cameras skip the channel replication unless stacking is requested
+    if raw.ndim == 2 and mono != "stack":
+        return "gray"
+    return fmt
+
+
+def _expand_mono(single: np.ndarray, fmt: str) -> np.ndarray:
+    """Read-only three-channel view over a single-channel frame."""
+    h, w = single.shape
+    if fmt.endswith("_hwc"):
+        return np.broadcast_to(single[:, :, None], (h, w, 3))
+    return np.broadcast_to(single[None, :, :], (3, h, w))
+
+
+def output_shape(cam_name: str, raw: np.ndarray, fmt: str = DEFAULT_OUTPUT_FORMAT,
+                 mono: str = "stack"):
+    """Shape of the buffer :func:`process_frame` writes for these settings."""
+    view = frame_view(cam_name, raw, _computed_format(raw, fmt, mono))
+    if view is None:
+        return rotate(cam_name, raw).shape[:2]
+    return view.shape
+
+
+def _rgb_to_gray(cam_name: str, raw: np.ndarray, out: np.ndarray) -> np.ndarray:
+    # Accumulate on the contiguous raw buffer; only the final write is rotated
+    wr, wg, wb = _GRAY_WEIGHTS
+    acc = np.multiply(raw[:, :, 0], wr, dtype=np.uint16)
+    acc += np.multiply(raw[:, :, 1], wg, dtype=np.uint16)
+    acc += np.multiply(raw[:, :, 2], wb, dtype=np.uint16)
+    acc += 128  # round to nearest
+    np.right_shift(acc, 8, out=_unrotate(cam_name, out), casting="unsafe")
+    return out
+
+
+def _tiled_copy(dst: np.ndarray, src: np.ndarray):
+    """Copy *src* into *dst* in bands of :data:`TILE_ROWS` rows."""
+    for i in range(0, dst.shape[0], TILE_ROWS):
+        np.copyto(dst[i:i + TILE_ROWS], src[i:i + TILE_ROWS])
+
+
+def _pixels(a: np.ndarray) -> np.ndarray:
+    """``(H, W)`` view of a contiguous ``(H, W, 3)`` array, one 3-byte item per pixel."""
+    return a.reshape(a.shape[0], -1).view("V3")
+
+
+_scratch = threading.local()
+
+
+def _scratch_buffer(shape) -> np.ndarray:
+    """Per-thread intermediate buffer, reused across frames of the same shape."""
+    buffers = getattr(_scratch, "buffers", None)
+    if buffers is None:
+        buffers = _scratch.buffers = {}
+    buf = buffers.get(shape)
+    if buf is None:
+        buf = buffers[shape] = np.empty(shape, dtype=np.uint8)
+    return buf
+
+
+def _reverse_bytes(raw: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """*raw* with its bytes in reverse order, written to *out*.
+
+    That is ``raw[::-1, ::-1]`` for a mono frame and ``raw[::-1, ::-1, ::-1]``
+    (180° turn plus channel swap) for a colour one. Reverses 8-byte words
+    and byte-swaps them, much faster than a byte-wise reversed copy.
+    """
+    words = out.reshape(-1).view(np.uint64)
+    np.copyto(words, raw.reshape(-1).view(np.uint64)[::-1])
+    words.byteswap(inplace=True)
+    return out
+
+
+def _tiled_gray(cam_name: str, raw: np.ndarray, out: np.ndarray) -> np.ndarray:
+    # _rgb_to_gray a band of raw rows at a time, so the accumulator stays in cache
+    wr, wg, wb = _GRAY_WEIGHTS
+    target = _unrotate(cam_name, out)
+    band = 2 * TILE_ROWS
+    for r in range(0, raw.shape[0], band):
+        rows = raw[r:r + band]
+        acc = np.multiply(rows[:, :, 0], wr, dtype=np.uint16)
+        acc += np.multiply(rows[:, :, 1], wg, dtype=np.uint16)
+        acc += np.multiply(rows[:, :, 2], wb, dtype=np.uint16)
+        acc += 128
+        np.right_shift(acc, 8, out=target[r:r + band], casting="unsafe")
+    return out
+
+
+def _tiled_mono(cam_name: str, raw: np.ndarray, out: np.ndarray) -> Optional[np.ndarray]:
+    """Rotate single-channel *raw* into the ``(H, W)`` array *out*."""
+    if cam_name in ("rgb", "slam1", "slam2"):
+        _tiled_copy(out, np.rot90(raw, k=-1))
+    elif cam_name == "eye" and raw.size % 8 == 0:
+        _reverse_bytes(raw, out)
+    else:
+        return None
+    return out
+
+
+def _tiled_frame(cam_name: str, raw: np.ndarray, fmt: str,
+                 out: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """Tiled :func:`process_frame` for a computed *fmt*; ``None`` if it has none."""
+    if not raw.flags.c_contiguous or (out is not None and not out.flags.c_contiguous):
+        return None
+    if raw.ndim == 2:
+        if fmt == "gray":
+            if out is None:
+                out = np.empty(rotate(cam_name, raw).shape, dtype=np.uint8)
+            return _tiled_mono(cam_name, raw, out)
+        if out is None:
+            out = np.empty(frame_view(cam_name, raw, fmt).shape, dtype=np.uint8)
+        # Rotate once, then fill the three channels plane by plane — far
+        # cheaper than copying a broadcast view pixel by pixel
+        single = _tiled_mono(cam_name, raw, _scratch_buffer(rotate(cam_name, raw).shape))
+        if single is None:
+            return None
+        for c in range(3):
+            if fmt.endswith("_hwc"):
+                out[:, :, c] = single
+            else:
+                out[c] = single
+        return out
+
+    if raw.ndim != 3 or raw.shape[2] != 3 or fmt.endswith("_chw"):
+        return None
+    if fmt == "gray":
+        if out is None:
+            out = np.empty(rotate(cam_name, raw).shape[:2], dtype=np.uint8)
+        return _tiled_gray(cam_name, raw, out)
+    if cam_name not in ("rgb", "slam1", "slam2"):
+        return None
+    if out is None:
+        out = np.empty(rotate(cam_name, raw).shape, dtype=np.uint8)
+    if cam_name == "rgb" and fmt == "bgr_hwc":
+        if raw.size % 8:
+            return None
+        # rot90(k=-1) + channel swap == byte reversal, then rot90(k=1)
+        flipped = _reverse_bytes(raw, _scratch_buffer(raw.shape))
+        _tiled_copy(_pixels(out), np.rot90(_pixels(flipped), k=1))
+    else:
+        _tiled_copy(_pixels(out), np.rot90(_pixels(raw), k=-1))
+    return out
+
+
+# path="auto": (camera, raw shape, computed format) → chosen path, and the
+# per-path frame times collected until then
+_selected: Dict[Tuple, str] = {}
+_timings: Dict[Tuple, Dict[str, List[int]]] = {}
+
+
+def selected_path(cam_name: str, raw: np.ndarray, fmt: str = DEFAULT_OUTPUT_FORMAT,
+                  mono: str = "stack") -> Optional[str]:
+    """Path ``"auto"`` settled on for frames like *raw*, ``None`` while still timing."""
+    return _selected.get((cam_name, raw.shape, _computed_format(raw, fmt, mono)))
+
+
+def _auto_frame(cam_name: str, raw: np.ndarray, fmt: str,
+                out: Optional[np.ndarray]) -> np.ndarray:
+    key = (cam_name, raw.shape, fmt)
+    path = _selected.get(key)
+    if path == "numpy":
+        return _numpy_frame(cam_name, raw, fmt, out)
+    if path == "tiled":
+        result = _tiled_frame(cam_name, raw, fmt, out)
+        return result if result is not None else _numpy_frame(cam_name, raw, fmt, out)
+
+    # Still calibrating: alternate the implementations on real frames, so
+    # timing costs no extra work, then keep the one with the lower median
+    timings = _timings.setdefault(key, {"tiled": [], "numpy": []})
+    path = "tiled" if len(timings["tiled"]) <= len(timings["numpy"]) else "numpy"
+    start = time.perf_counter_ns()
+    result = (_tiled_frame(cam_name, raw, fmt, out) if path == "tiled"
+              else _numpy_frame(cam_name, raw, fmt, out))
+    elapsed = time.perf_counter_ns() - start
+    if result is None:  # no tiled implementation for these frames
+        _selected[key] = "numpy"
+        return _numpy_frame(cam_name, raw, fmt, out)
+    timings[path].append(elapsed)
+    if min(len(t) for t in timings.values()) >= CALIBRATION_FRAMES:
+        medians = {p: sorted(t)[len(t) // 2] for p, t in timings.items()}
+        _selected[key] = min(medians, key=medians.get)
+        _timings.pop(key, None)
+    return result
+
+
+def _numpy_frame(cam_name: str, raw: np.ndarray, fmt: str,
+                 out: Optional[np.ndarray]) -> np.ndarray:
+    view = frame_view(cam_name, raw, fmt)
+    if view is None:
+        if out is None:
+            out = np.empty(rotate(cam_name, raw).shape[:2], dtype=np.uint8)
+        return _rgb_to_gray(cam_name, raw, out)
+    if out is None:
+        return np.ascontiguousarray(view)
+    np.copyto(out, view)
+    return out
+
+
+def process_frame(cam_name: str, raw: np.ndarray,
+                  fmt: str = DEFAULT_OUTPUT_FORMAT,
+                  out: Optional[np.ndarray] = None,
+                  mono: str = "stack", path: str = "auto") -> np.ndarray:
+    """Rotate and lay out *raw* as *fmt*.
+
+    Writes into *out* when given (it must have :func:`output_shape`),
+    otherwise returns a new contiguous array. With ``mono="broadcast"`` a
+    mono camera returns a broadcast view over that array instead. *path*
+    picks the implementation (see :data:`PATHS`); all give identical output,
+    and ``"tiled"`` falls back to ``"numpy"`` where it has no implementation.
+    """
+    computed = _computed_format(raw, fmt, mono)
+    if path == "auto":
+        out = _auto_frame(cam_name, raw, computed, out)
+    else:
+        result = _tiled_frame(cam_name, raw, computed, out) if path == "tiled" else None
+        out = result if result is not None else _numpy_frame(cam_name, raw, computed, out)
+    if mono == "broadcast" and computed != fmt:
+        return _expand_mono(out, fmt)
+    return out
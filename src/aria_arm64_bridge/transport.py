@@ -0,0 +1,430 @@
+"""Frame transports between the FEX-Emu receiver and the native observer.
+
+Two transports share the same wire header (see :mod:`.protocol`):
+
+* ``tcp://`` / ``ipc://`` — header + pixels as a two-part ZMQ message.
+* ``shm://<name>`` — pixels are written once into a POSIX shared-memory
+  slot ring (``/dev/shm/aria-<name>``); a small ZMQ notification carries
+  only the header and the slot reference.  The observer reads the pixels
+  straight out of the mapping, so no full-frame copy goes through the
+  kernel socket path.
+
+Shared-memory endpoints accept optional query parameters::
+
+    shm://aria?slots=4&slot_bytes=6291456&notify=ipc:///tmp/aria-aria.notify
+
+Each slot is protected by a sequence counter (seqlock): odd while the
+slot is being (re)written, even when its frame is complete.  A reader
+checks the counter against the notification before reading and re-reads
+it after copying the pixels out (``still_valid``); if it moved on, the
+frame was overwritten meanwhile and is dropped.
+
+The mapping is written with plain stores and Python has no memory
+fences, so on weakly ordered CPUs (the Orin's ARM64) the ordering comes
+from the ZMQ notifications instead. Each send goes through libzmq's
+atomic pipe flush and a syscall that wakes the reader, which makes every
+store before it visible before the reader can act on it:
+
+* a frame is complete (pixels, then even counter) before its notification
+  is sent, so a reader never sees a slot before its pixels;
+* the writer makes the *next* slot odd before sending the current frame's
+  notification, one frame ahead of rewriting it, so a full send separates
+  invalidating a slot from rewriting it. A reader whose copy overlapped
+  the rewrite is therefore guaranteed to see the odd counter when it
+  re-reads it. This costs one slot of lag: a reader may fall ``slots - 2``
+  frames behind before frames are dropped as overwritten.
+
+A restarted writer never truncates a ring that readers may still map
+(they would get SIGBUS): it unlinks the old file and creates a new one
+with a new generation, and readers reopen the ring when a notification
+carries a generation they have not mapped.
+
+Both transports send over PUSH/PULL by default: one consumer, which gets
+every frame.  With ``fanout=True`` on both ends they use PUB/SUB instead,
+so any number of consumers see every frame while the receiver still
+sends it once — libzmq shares the message between subscribers, and the
+shm ring is read in place by all of them.  Each subscriber has its own
+HWM, so a slow one drops frames without holding up the others.
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from typing import Callable, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import numpy as np
+import zmq
+
+from .protocol import CHANNELS
+
+SHM_SCHEME = "shm://"
+SHM_DIR = "/dev/shm"
+SHM_MAGIC = b"ARSH"
+SHM_DEFAULT_SLOTS = 4
+SHM_DEFAULT_SLOT_BYTES = 6 * 1024 * 1024  # fits 1408x1408x3 RGB (5.9 MB)
+
+# Ring header: magic(4) + generation(4) + slots(4) + pad(4) + slot_bytes(8)
+_RING_HEADER_FORMAT = "<4sII4xQ"
+_RING_HEADER_BYTES = 64
+# Slot header: seq(8) + nbytes(8), padded so pixel data stays 64-byte aligned
+_SLOT_HEADER_FORMAT = "<QQ"
+_SLOT_HEADER_BYTES = 64
+# Notification payload: generation(4) + slot(4) + seq(8) + nbytes(8)
+_NOTIFY_FORMAT = "<IIQQ"
+
+
+def is_shm_endpoint(endpoint: str) -> bool:
+    return endpoint.startswith(SHM_SCHEME)
+
+
+def parse_shm_endpoint(endpoint: str) -> dict:
+    """Split ``shm://name?opts`` into ring name, geometry and notify endpoint."""
+    parts = urlsplit(endpoint)
+    name = parts.netloc or parts.path.lstrip("/")
+    if not name or "/" in name:
+        raise ValueError(f"Invalid shared-memory endpoint: {endpoint!r}")
+    query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+    return {
+        "name": name,
+        "path": os.path.join(SHM_DIR, f"aria-{name}"),
+        "slots": int(query.get("slots", SHM_DEFAULT_SLOTS)),
+        "slot_bytes": int(query.get("slot_bytes", SHM_DEFAULT_SLOT_BYTES)),
+        "notify": query.get("notify", f"ipc:///tmp/aria-{name}.notify"),
+    }
+
+
+def channel_endpoint(endpoint: str, channel: str) -> str:
+    """Endpoint of *channel*'s send path, derived from the base *endpoint*.
+
+    The first channel (``rgb``) uses *endpoint* itself, so RGB-only setups
+    are unchanged. Others get ``tcp`` port + index, an ``ipc`` path suffix
+    or their own ``shm`` ring::
+
+        tcp://127.0.0.1:5555 → slam2: tcp://127.0.0.1:5557
+        ipc:///tmp/aria      → slam2: ipc:///tmp/aria-slam2
+        shm://aria?slots=4   → slam2: shm://aria-slam2?slots=4
+    """
+    index = CHANNELS.index(channel)
+    if index == 0:
+        return endpoint
+    if is_shm_endpoint(endpoint):
+        parts = urlsplit(endpoint)
+        name = parts.netloc or parts.path.lstrip("/")
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        if "notify" in query:
+            query["notify"] = channel_endpoint(query["notify"], channel)
+        suffix = f"?{urlencode(query, safe=':/')}" if query else ""
+        return f"{SHM_SCHEME}{name}-{channel}{suffix}"
+    if endpoint.startswith("tcp://"):
+        host, _, port = endpoint.rpartition(":")
+        return f"{host}:{int(port) + index}"
+    return f"{endpoint}-{channel}"
+
+
+def control_endpoint(endpoint: str) -> str:
+    """Endpoint of the receiver's control socket (see :mod:`.control`).
+
+    Sits next to the frame channels of the base *endpoint*::
+
+        tcp://127.0.0.1:5555 → tcp://127.0.0.1:5560
+        ipc:///tmp/aria      → ipc:///tmp/aria-control
+        shm://aria           → ipc:///tmp/aria-aria.control
+    """
+    if is_shm_endpoint(endpoint):
+        return f"ipc:///tmp/aria-{parse_shm_endpoint(endpoint)['name']}.control"
+    if endpoint.startswith("tcp://"):
+        host, _, port = endpoint.rpartition(":")
+        return f"{host}:{int(port) + len(CHANNELS)}"
+    return f"{endpoint}-control"
+
+
+# ----------------------------------------------------------------------
+# Shared-memory slot ring
+# ----------------------------------------------------------------------
+
+class ShmRingWriter:
+    """Producer side of the slot ring. Owns (creates and unlinks) the file.
+
+    An existing ring at *path* (e.g. left by a receiver that was restarted)
+    is unlinked, not truncated: readers keep their mapping of the old file.
+    """
+
+    def __init__(self, path: str, slots: int, slot_bytes: int):
+        if slots < 2:
+            raise ValueError("shared-memory ring needs at least 2 slots")
+        self.path = path
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self._stride = _SLOT_HEADER_BYTES + slot_bytes
+        size = _RING_HEADER_BYTES + slots * self._stride
+
+        try:
+            os.unlink(path)  # like shm_unlink: mapped readers keep the old file
+        except FileNotFoundError:
+            pass
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_RDWR, 0o600)
+        try:
+            os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size)
+            stat = os.fstat(fd)
+            self._file_id = (stat.st_dev, stat.st_ino)
+        finally:
+            os.close(fd)
+
+        # Generation lets readers notice a restarted writer (new file, same name)
+        self.generation = zlib.crc32(os.urandom(8))
+        struct.pack_into(_RING_HEADER_FORMAT, self._mm, 0,
+                         SHM_MAGIC, self.generation, slots, slot_bytes)
+        self._seqs = [0] * slots
+        self._next = 0
+
+    def write(self, image: np.ndarray) -> Tuple[int, int, int]:
+        """Copy *image* into the next slot. Returns ``(slot, seq, nbytes)``."""
+        data = memoryview(np.ascontiguousarray(image)).cast("B")
+        nbytes = data.nbytes
+        if nbytes > self.slot_bytes:
+            raise ValueError(f"frame of {nbytes} bytes exceeds slot size {self.slot_bytes}")
+
+        slot = self._next
+        self._next = (slot + 1) % self.slots
+        offset = _RING_HEADER_BYTES + slot * self._stride
+
+        seq = self._seqs[slot]
+        if seq % 2 == 0:  # only on a slot's first use: normally invalidated a frame ago
+            seq = self._invalidate(slot)
+        start = offset + _SLOT_HEADER_BYTES
+        self._mm[start:start + nbytes] = data
+        seq += 1  # even = frame complete
+        struct.pack_into(_SLOT_HEADER_FORMAT, self._mm, offset, seq, nbytes)
+        self._seqs[slot] = seq
+        # Invalidate the slot rewritten next now, before this frame's
+        # notification goes out (see the module docstring)
+        self._invalidate(self._next)
+        return slot, seq, nbytes
+
+    def _invalidate(self, slot: int) -> int:
+        """Make *slot*'s counter odd: its frame is about to be overwritten."""
+        seq = self._seqs[slot]
+        if seq % 2 == 0:
+            seq += 1
+            offset = _RING_HEADER_BYTES + slot * self._stride
+            struct.pack_into(_SLOT_HEADER_FORMAT, self._mm, offset, seq, 0)
+            self._seqs[slot] = seq
+        return seq
+
+    def close(self):
+        self._mm.close()
+        try:
+            stat = os.stat(self.path)
+            if (stat.st_dev, stat.st_ino) == self._file_id:  # not a newer writer's ring
+                os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class ShmRingReader:
+    """Consumer side of the slot ring. Maps the file read-only."""
+
+    def __init__(self, path: str):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            self._mm = mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+
+        magic, self.generation, self.slots, self.slot_bytes = struct.unpack_from(
+            _RING_HEADER_FORMAT, self._mm, 0)
+        if magic != SHM_MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not an aria shared-memory ring")
+        self._stride = _SLOT_HEADER_BYTES + self.slot_bytes
+        self._data = np.frombuffer(self._mm, dtype=np.uint8)
+
+    def seq(self, slot: int) -> int:
+        offset = _RING_HEADER_BYTES + slot * self._stride
+        return struct.unpack_from("<Q", self._mm, offset)[0]
+
+    def view(self, slot: int, nbytes: int) -> np.ndarray:
+        """Read-only view of the pixel bytes in *slot* — no copy."""
+        start = _RING_HEADER_BYTES + slot * self._stride + _SLOT_HEADER_BYTES
+        return self._data[start:start + nbytes]
+
+    def close(self):
+        # Views handed out keep the mapping alive; let GC release it.
+        self._data = None
+
+
+# ----------------------------------------------------------------------
+# Sender side (receiver / mock receiver)
+# ----------------------------------------------------------------------
+
+class ZmqFrameSink:
+    """Sends header + pixels as one two-part ZMQ message."""
+
+    def __init__(self, ctx: zmq.Context, endpoint: str, hwm: int = 2, fanout: bool = False):
+        self.socket = ctx.socket(zmq.PUB if fanout else zmq.PUSH)
+        self.socket.setsockopt(zmq.SNDHWM, hwm)  # drop old frames if consumer is slow
+        self.socket.bind(endpoint)
+
+    def send(self, header: bytes, image: np.ndarray) -> bool:
+        """Returns ``False`` if the frame was dropped because the consumer is slow."""
+        try:
+            # send_multipart avoids concatenating header + 5.9MB pixel buffer
+            self.socket.send_multipart([header, memoryview(image)], zmq.NOBLOCK, copy=False)
+        except zmq.Again:
+            return False
+        return True
+
+    def close(self):
+        self.socket.close()
+
+
+class ShmFrameSink:
+    """Writes pixels into the shared-memory ring and notifies via ZMQ."""
+
+    def __init__(self, ctx: zmq.Context, endpoint: str, hwm: int = 2, fanout: bool = False):
+        cfg = parse_shm_endpoint(endpoint)
+        self._ring = ShmRingWriter(cfg["path"], cfg["slots"], cfg["slot_bytes"])
+        self.socket = ctx.socket(zmq.PUB if fanout else zmq.PUSH)
+        self.socket.setsockopt(zmq.SNDHWM, hwm)
+        self.socket.bind(cfg["notify"])
+
+    def send(self, header: bytes, image: np.ndarray) -> bool:
+        # Don't touch a slot if the notification would be dropped anyway
+        if not self.socket.poll(0, zmq.POLLOUT):
+            return False
+        slot, seq, nbytes = self._ring.write(image)
+        note = struct.pack(_NOTIFY_FORMAT, self._ring.generation, slot, seq, nbytes)
+        try:
+            self.socket.send_multipart([header, note], zmq.NOBLOCK)
+        except zmq.Again:
+            return False
+        return True
+
+    def close(self):
+        self.socket.close()
+        self._ring.close()
+
+
+def open_sink(ctx: zmq.Context, endpoint: str, hwm: int = 2, fanout: bool = False):
+    """Bind the sending end of *endpoint* (``tcp://``, ``ipc://`` or ``shm://``).
+
+    With *fanout*, frames go to every connected consumer (PUB) instead of
+    one (PUSH); PUB never refuses a send, so each subscriber's drops show
+    up as sequence gaps on its side.
+    """
+    if is_shm_endpoint(endpoint):
+        return ShmFrameSink(ctx, endpoint, hwm, fanout)
+    return ZmqFrameSink(ctx, endpoint, hwm, fanout)
+
+
+# ----------------------------------------------------------------------
+# Receiver side (observer)
+# ----------------------------------------------------------------------
+
+# A received message: (header, pixel buffer, validity check or None)
+Received = Tuple[object, object, Optional[Callable[[], bool]]]
+
+
+def _pull_socket(ctx: zmq.Context, hwm: int, fanout: bool) -> zmq.Socket:
+    """PULL socket, or a SUB socket subscribed to everything for *fanout*."""
+    socket = ctx.socket(zmq.SUB if fanout else zmq.PULL)
+    socket.setsockopt(zmq.RCVHWM, hwm)  # drop oldest frames if consumer is slow
+    if fanout:
+        socket.setsockopt(zmq.SUBSCRIBE, b"")
+    return socket
+
+
+def _recv_parts(source) -> list:
+    """Next message of *source* — or, with ``latest_only``, the newest queued.
+
+    ZMQ_CONFLATE would do this inside libzmq but does not support
+    multipart messages, so older messages are received and discarded here
+    instead. They are never decoded; ``source.skipped`` counts them.
+    """
+    parts = source.socket.recv_multipart(copy=False)
+    source.skipped = 0
+    if source.latest_only:
+        while source.socket.getsockopt(zmq.EVENTS) & zmq.POLLIN:
+            parts = source.socket.recv_multipart(copy=False)
+            source.skipped += 1
+    return parts
+
+
+class ZmqFrameSource:
+    """Receives two-part ZMQ messages; pixel buffers are zero-copy frames."""
+
+    def __init__(self, ctx: zmq.Context, endpoint: str, hwm: int = 2,
+                 latest_only: bool = False, fanout: bool = False):
+        self.socket = _pull_socket(ctx, hwm, fanout)
+        self.socket.connect(endpoint)
+        self.latest_only = latest_only
+        self.skipped = 0  # messages superseded by the one last returned
+        self.overruns = 0
+
+    def recv(self) -> Optional[Received]:
+        parts = _recv_parts(self)
+        if len(parts) != 2:
+            return None
+        return parts[0], parts[1], None
+
+    def close(self):
+        self.socket.close()
+
+
+class ShmFrameSource:
+    """Receives slot notifications and maps pixels out of the shared ring."""
+
+    def __init__(self, ctx: zmq.Context, endpoint: str, hwm: int = 2,
+                 latest_only: bool = False, fanout: bool = False):
+        self._cfg = parse_shm_endpoint(endpoint)
+        self._ring: Optional[ShmRingReader] = None
+        self.socket = _pull_socket(ctx, hwm, fanout)
+        self.socket.connect(self._cfg["notify"])
+        self.latest_only = latest_only
+        self.skipped = 0  # notifications superseded by the one last returned
+        self.overruns = 0  # slots overwritten before we got to them
+
+    def _ring_for(self, generation: int) -> ShmRingReader:
+        if self._ring is None or self._ring.generation != generation:
+            if self._ring is not None:
+                self._ring.close()
+            self._ring = ShmRingReader(self._cfg["path"])
+        return self._ring
+
+    def recv(self) -> Optional[Received]:
+        parts = _recv_parts(self)
+        if len(parts) != 2:
+            return None
+        header_buf, note_buf = parts
+        generation, slot, seq, nbytes = struct.unpack(_NOTIFY_FORMAT, note_buf.bytes)
+
+        ring = self._ring_for(generation)
+        if ring.seq(slot) != seq:
+            self.overruns += 1
+            return None
+
+        def still_valid() -> bool:
+            return ring.seq(slot) == seq
+
+        return header_buf, ring.view(slot, nbytes), still_valid
+
+    def close(self):
+        self.socket.close()
+        if self._ring is not None:
+            self._ring.close()
+
+
+def open_source(ctx: zmq.Context, endpoint: str, hwm: int = 2, latest_only: bool = False,
+                fanout: bool = False):
+    """Connect the receiving end of *endpoint* (``tcp://``, ``ipc://`` or ``shm://``).
+
+    With *latest_only*, each :meth:`recv` returns the newest queued message
+    and discards the older ones. *fanout* must match the sender's.
+    """
+    if is_shm_endpoint(endpoint):
+        return ShmFrameSource(ctx, endpoint, hwm, latest_only, fanout)
+    return ZmqFrameSource(ctx, endpoint, hwm, latest_only, fanout)
@@ -1,43 +1,92 @@
 """Mock frame receiver — generates fake frames for testing without Aria glasses.
 
-Simulates the same ZMQ protocol (v2) as aria_receiver.py but with synthetic data.
+Simulates the same ZMQ protocol (v3) as aria_receiver.py but with synthetic data.
 Does NOT require FEX-Emu or the Aria SDK.
 
 Usage (native):
-    python3 src/receiver/mock_receiver.py
+    python3 src/receiver/mock_receiver.py   # real rates: RGB 11, SLAM 49, eye 30 FPS
     python3 src/receiver/mock_receiver.py --fps 15 --width 640 --height 480
+    python3 src/receiver/mock_receiver.py --zmq-endpoint shm://aria   # shared-memory ring
+    python3 src/receiver/mock_receiver.py --fanout   # any number of observers (fanout=True)
+
+Load generator:
+    python3 src/receiver/mock_receiver.py --cameras rgb,slam1,slam2,eye \\
+        --scale 10 --jitter-ms 2 --burst 5 --burst-every 2
+
+    Frames come from a pool precomputed at startup (--pool), so the mock
+    costs a header pack and a zero-copy send per frame and can outrun the
+    observer. Each camera runs on its own schedule (--fps per stream or
+    camera, all multiplied by --scale) and is sent on its own channel, like
+    the real receiver (observer: streams=("rgb", "slam", "et")).
+    --jitter-ms delays each frame by up to that much; --burst N sends N
+    extra frames per camera back to back every --burst-every seconds, like
+    the SDK flushing a backlog.
 
 Usage (under FEX-Emu, to test cross-process):
     PYTHONNOUSERSITE=1 FEXBash -c "python3 src/receiver/mock_receiver.py"
 """
 
 import argparse
+import heapq
+import random
 import signal
-import struct
+import sys
 import time
+from pathlib import Path
 
 import numpy as np
 import zmq
 
-DEFAULT_ZMQ_ENDPOINT = "tcp://127.0.0.1:5555"
-
-# Protocol v2 constants (must match aria_receiver.py)
-HEADER_FORMAT = "<4sB3xQIII"
-HEADER_MAGIC = b"ARI2"
-CAM_RGB = 0
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aria_arm64_bridge.protocol import (
+    DEFAULT_ZMQ_ENDPOINT, CAM_NAMES, DEFAULT_HWM, channel_setting, pack_header,
+    parse_stream_settings,
+)
+from aria_arm64_bridge.transport import channel_endpoint, open_sink
+
+CAMERA_IDS = {name: cam_id for cam_id, name in CAM_NAMES.items()}
+# (width, height, channels) of the Aria gen1 cameras; rgb uses --width/--height
+CAMERA_SHAPES = {"slam1": (640, 480, 1), "slam2": (640, 480, 1), "eye": (640, 240, 1)}
+# FPS per stream of the real glasses with the streaming profile (RGB ~11,
+# SLAM ~49 — see protocol.DEFAULT_QUEUE_SIZES); --fps overrides
+DEFAULT_FPS = {"rgb": 11, "slam": 49, "et": 30, "imu": 0}
+
+
+def make_pool(size, width, height, channels):
+    """*size* frames of a moving gradient, so consecutive frames differ."""
+    x = np.linspace(0, 1, width, dtype=np.float32)
+    y = np.linspace(0, 1, height, dtype=np.float32)
+    pool = []
+    for i in range(size):
+        phase = i / size
+        r = np.outer(y, np.roll(x, int(phase * width)))
+        g = np.outer(np.roll(y, int(phase * height)), x)
+        b = np.full((height, width), phase, dtype=np.float32)
+        frame = (np.stack([r, g, b], axis=2) * 255).astype(np.uint8)
+        pool.append(frame if channels == 3 else np.ascontiguousarray(frame[:, :, 0]))
+    return pool
 
 
-def run(zmq_endpoint, fps, width, height):
+def run(zmq_endpoint, fps, width, height, fanout=False, cameras=("rgb",), pool=8,
+        scale=1.0, jitter_ms=0.0, burst=0, burst_every=1.0, hwm=None, duration=None):
+    fps = parse_stream_settings(fps, DEFAULT_FPS, channels=True)
+    hwm = parse_stream_settings(hwm, DEFAULT_HWM, channels=True)
     ctx = zmq.Context()
-    socket = ctx.socket(zmq.PUSH)
-    socket.setsockopt(zmq.SNDHWM, 2)
-    socket.bind(zmq_endpoint)
-    print(f"[mock] ZMQ bound to {zmq_endpoint}")
-    print(f"[mock] Generating {width}x{height} RGB @ {fps} FPS")
 
-    frame_interval = 1.0 / fps
-    frame_count = 0
-    channels = 3
+    cams = {}
+    for name in cameras:
+        endpoint = channel_endpoint(zmq_endpoint, name)
+        w, h, ch = (width, height, 3) if name == "rgb" else CAMERA_SHAPES[name]
+        rate = channel_setting(fps, name) * scale
+        if rate <= 0:
+            raise ValueError(f"{name}: fps must be > 0")
+        cams[name] = {
+            "sink": open_sink(ctx, endpoint, hwm=channel_setting(hwm, name), fanout=fanout),
+            "pool": make_pool(pool, w, h, ch), "shape": (w, h, ch),
+            "interval_ns": int(1e9 / rate), "sent": 0, "send_drops": 0, "frames": 0,
+        }
+        print(f"[mock] {name} {'published' if fanout else 'bound'} on {endpoint}: "
+              f"{w}x{h}x{ch} @ {rate:g} FPS")
 
     shutdown = False
 
@@ -48,56 +97,103 @@ def run(zmq_endpoint, fps, width, height):
     signal.signal(signal.SIGINT, handle_signal)
     signal.signal(signal.SIGTERM, handle_signal)
 
-    start_time = time.monotonic()
+    jitter_ns = int(jitter_ms * 1e6)
+    start_ns = time.monotonic_ns()
+    end_ns = start_ns + int(duration * 1e9) if duration else None
+    # (send time, camera, nominal time) — jitter delays a frame, never the schedule
+    schedule = [(start_ns, name, start_ns) for name in cams]
+    heapq.heapify(schedule)
+    next_burst_ns = start_ns + int(burst_every * 1e9) if burst else None
+    next_report_ns = start_ns + 1_000_000_000
     print("[mock] Streaming. Press Ctrl+C to stop.")
 
-    while not shutdown:
-        t0 = time.monotonic()
-        timestamp_ns = int(t0 * 1e9)
-
-        # Generate a frame with a moving gradient so it's visually distinguishable
-        x = np.linspace(0, 1, width, dtype=np.float32)
-        y = np.linspace(0, 1, height, dtype=np.float32)
-        phase = (frame_count % 60) / 60.0
-        r = np.outer(y, np.roll(x, int(phase * width)))
-        g = np.outer(np.roll(y, int(phase * height)), x)
-        b = np.full((height, width), phase, dtype=np.float32)
-        frame = (np.stack([r, g, b], axis=2) * 255).astype(np.uint8)
-
-        header = struct.pack(HEADER_FORMAT, HEADER_MAGIC, CAM_RGB, timestamp_ns,
-                             width, height, channels)
+    def send(cam, name):
+        frame = cam["pool"][cam["frames"] % len(cam["pool"])]
+        w, h, ch = cam["shape"]
+        timestamp_ns = time.monotonic_ns()
+        header = pack_header(CAMERA_IDS[name], timestamp_ns, w, h, ch,
+                             seq=cam["sent"], send_ns=time.monotonic_ns(),
+                             send_drops=cam["send_drops"],
+                             callback_ns=timestamp_ns, capture_host_ns=timestamp_ns)
+        if cam["sink"].send(header, frame):
+            cam["sent"] += 1
+        else:
+            cam["send_drops"] += 1  # consumer too slow, frame dropped
+        cam["frames"] += 1
 
-        try:
-            socket.send_multipart([header, memoryview(frame)], zmq.NOBLOCK, copy=False)
-        except zmq.Again:
-            pass  # consumer too slow, drop frame
-
-        frame_count += 1
-        if frame_count % fps == 0:
-            elapsed = time.monotonic() - start_time
-            actual_fps = frame_count / elapsed if elapsed > 0 else 0
-            print(f"[mock] frames={frame_count} fps={actual_fps:.1f}")
-
-        # Rate limit
-        elapsed = time.monotonic() - t0
-        sleep_time = frame_interval - elapsed
-        if sleep_time > 0:
-            time.sleep(sleep_time)
-
-    print(f"[mock] Done. Sent {frame_count} frames.")
-    socket.close()
+    while not shutdown:
+        send_at, name, nominal = schedule[0]
+        now = time.monotonic_ns()
+        if end_ns is not None and now >= end_ns:
+            break
+        if next_burst_ns is not None and now >= next_burst_ns:
+            for burst_name, cam in cams.items():
+                for _ in range(burst):
+                    send(cam, burst_name)
+            next_burst_ns += int(burst_every * 1e9)
+        if now >= next_report_ns:
+            elapsed = (now - start_ns) / 1e9
+            print("[mock] " + " ".join(
+                f"{n}={c['frames'] / elapsed:.1f}fps(drops={c['send_drops']})"
+                for n, c in cams.items()))
+            next_report_ns += 1_000_000_000
+        if send_at > now:
+            wake = min(send_at, next_report_ns,
+                       next_burst_ns if next_burst_ns is not None else send_at)
+            time.sleep(max(0, wake - now) / 1e9)
+            continue
+
+        cam = cams[name]
+        send(cam, name)
+        nominal += cam["interval_ns"]
+        heapq.heapreplace(schedule, (nominal + (random.randint(0, jitter_ns) if jitter_ns else 0),
+                                     name, nominal))
+
+    total = sum(c["frames"] for c in cams.values())
+    print(f"[mock] Done. Sent {total} frames.")
+    for cam in cams.values():
+        cam["sink"].close()
     ctx.term()
 
 
 def main():
     parser = argparse.ArgumentParser(description="Mock Aria frame sender (no glasses needed)")
-    parser.add_argument("--zmq-endpoint", default=DEFAULT_ZMQ_ENDPOINT)
-    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--zmq-endpoint", default=DEFAULT_ZMQ_ENDPOINT,
+                        help="tcp://, ipc:// or shm://<name> (shared-memory ring)")
+    parser.add_argument("--fps", default=None,
+                        help="Frames per second, for all cameras or per stream / camera "
+                             "(e.g. 30 or slam=20,eye=5; default: rgb=11,slam=49,eye=30)")
     parser.add_argument("--width", type=int, default=1408, help="Aria RGB camera width")
     parser.add_argument("--height", type=int, default=1408, help="Aria RGB camera height")
+    parser.add_argument("--fanout", action="store_true",
+                        help="Publish to any number of observers (fanout=True)")
+    parser.add_argument("--cameras", default="rgb",
+                        help="Cameras to generate: rgb,slam1,slam2,eye (default: rgb)")
+    parser.add_argument("--pool", type=int, default=8,
+                        help="Frames precomputed per camera (default: 8)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiply every camera's rate, e.g. 10 for 10x load")
+    parser.add_argument("--jitter-ms", type=float, default=0.0,
+                        help="Delay each frame by a random 0..N ms")
+    parser.add_argument("--burst", type=int, default=0,
+                        help="Extra frames per camera sent back to back every --burst-every s")
+    parser.add_argument("--burst-every", type=float, default=1.0)
+    parser.add_argument("--hwm", default=None,
+                        help="Socket high-water mark per stream or camera, e.g. rgb=2,slam=4")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Stop after this many seconds (default: until Ctrl+C)")
     args = parser.parse_args()
 
-    run(args.zmq_endpoint, args.fps, args.width, args.height)
+    cameras = tuple(dict.fromkeys(c.strip() for c in args.cameras.split(",") if c.strip()))
+    unknown = [c for c in cameras if c not in CAMERA_IDS]
+    if unknown or not cameras:
+        parser.error(f"Unknown cameras {unknown}; expected some of {tuple(CAMERA_IDS)}")
+    try:
+        run(args.zmq_endpoint, args.fps, args.width, args.height, args.fanout, cameras,
+            args.pool, args.scale, args.jitter_ms, args.burst, args.burst_every, args.hwm,
+            args.duration)
+    except ValueError as e:
+        parser.error(str(e))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,75 @@
+"""Test AsyncAriaBridgeObserver — frames awaited on the asyncio event loop.
+
+Usage:
+    python3 tests/test_async_observer.py
+"""
+
+import asyncio
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+import zmq
+
+sys.path.insert(0, "src")
+from aria_arm64_bridge import AsyncAriaBridgeObserver
+from aria_arm64_bridge.protocol import HEADER_FORMAT, HEADER_MAGIC, CAM_RGB
+
+ZMQ_ENDPOINT = "tcp://127.0.0.1:5574"
+NUM_FRAMES = 6
+
+
+def mock_sender(endpoint, num_frames):
+    ctx = zmq.Context()
+    socket = ctx.socket(zmq.PUSH)
+    socket.bind(endpoint)
+    time.sleep(0.3)
+
+    for i in range(num_frames):
+        frame = np.full((8, 8, 3), i, dtype=np.uint8)
+        header = struct.pack(HEADER_FORMAT, HEADER_MAGIC, CAM_RGB,
+                             time.monotonic_ns(), 8, 8, 3)
+        socket.send_multipart([header, memoryview(frame)], copy=False)
+        time.sleep(0.03)
+
+    time.sleep(0.3)
+    socket.close()
+    ctx.term()
+
+
+async def consume():
+    received = []
+    async with AsyncAriaBridgeObserver(zmq_endpoint=ZMQ_ENDPOINT) as observer:
+        async def read_all():
+            async for frame in observer.aiter_frames("rgb"):
+                received.append(int(frame[0, 0, 0]))
+                if received[-1] == NUM_FRAMES - 1:
+                    return
+
+        await asyncio.wait_for(read_all(), timeout=5.0)
+        timed_out = await observer.next_frame("rgb", NUM_FRAMES, timeout=0.1)
+        # The sync API still works alongside the async one
+        sync_frame = observer.get_frame("rgb")
+    return received, timed_out, sync_frame, observer.is_running
+
+
+def test_async_observer():
+    t = threading.Thread(target=mock_sender, args=(ZMQ_ENDPOINT, NUM_FRAMES))
+    t.start()
+    try:
+        received, timed_out, sync_frame, running = asyncio.run(consume())
+    finally:
+        t.join(timeout=5)
+
+    assert received and received == sorted(received)
+    assert received[-1] == NUM_FRAMES - 1
+    assert timed_out == (None, NUM_FRAMES)
+    assert sync_frame is not None and sync_frame[0, 0, 0] == NUM_FRAMES - 1
+    assert not running
+
+
+if __name__ == "__main__":
+    test_async_observer()
+    print("PASS — AsyncAriaBridgeObserver works correctly")
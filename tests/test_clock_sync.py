@@ -0,0 +1,57 @@
+"""Test ClockSync: device → host timestamp mapping under delivery jitter.
+
+Usage:
+    python3 tests/test_clock_sync.py
+"""
+
+import sys
+
+import numpy as np
+
+sys.path.insert(0, "src")
+from aria_arm64_bridge.clock import ClockSync
+
+MS = 1_000_000
+
+
+def simulate(sync, seconds=30, fps=30, offset_ns=5_000_000_000_000, drift_ppm=40, seed=1):
+    """Feed *sync* frames whose delivery delay is 3 ms + exponential jitter,
+    with a 200 ms stall every few seconds. Returns the true mapping."""
+    rng = np.random.default_rng(seed)
+    device = np.arange(0, seconds * 1_000_000_000, 1_000_000_000 // fps, dtype=np.int64)
+
+    def true_host(d):
+        return d + offset_ns + int(d * drift_ppm * 1e-6)
+
+    for i, d in enumerate(device):
+        delay = 3 * MS + int(rng.exponential(4 * MS))
+        if i % 97 == 0:
+            delay += 200 * MS  # FEX-Emu / DDS stall
+        sync.observe(int(d), true_host(int(d)) + delay)
+    return true_host, int(device[-1])
+
+
+def test_offset_and_drift_track_the_fastest_frames():
+    sync = ClockSync()
+    true_host, last = simulate(sync)
+
+    stats = sync.stats()
+    assert stats["synced"] and stats["samples"] == 30 * 30 + 1
+    assert abs(stats["drift_ppm"] - 40) < 5
+    # Mapped time ≈ capture + minimum delay (3 ms), despite stalls and jitter
+    for d in (last - 5_000_000_000, last, last + 1_000_000_000):
+        error = sync.to_host(d) - true_host(d)
+        assert 2 * MS < error < 5 * MS, error
+
+
+def test_min_delay_and_unsynced():
+    sync = ClockSync(min_delay_ns=3 * MS)
+    assert sync.to_host(123) is None and not sync.synced
+    true_host, last = simulate(sync, seconds=10)
+    assert abs(sync.to_host(last) - true_host(last)) < 2 * MS
+
+
+if __name__ == "__main__":
+    test_offset_and_drift_track_the_fastest_frames()
+    test_min_delay_and_unsynced()
+    print("PASS — clock sync maps device time to host time")
@@ -0,0 +1,253 @@
+"""Test the receiver control channel: (un)subscribe, queue sizes, pause, stats.
+
+The SDK side is stubbed — a callback that records resubscriptions, and a
+minimal fake ``aria.sdk`` to run the receiver natively — since the real
+receiver needs FEX-Emu and the glasses.
+
+Usage:
+    python3 tests/test_control.py
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import zmq
+
+sys.path.insert(0, "src")
+from aria_arm64_bridge import AriaBridgeObserver
+from aria_arm64_bridge.control import ReceiverControl, control_request, serve_request
+from aria_arm64_bridge.transport import control_endpoint
+
+CONTROL_ENDPOINT = f"ipc:///tmp/aria-test-control-{os.getpid()}"
+RECEIVER_ENDPOINT = "tcp://127.0.0.1:5606"  # slam1/slam2 on 5607/5608, control on 5611
+
+# Just enough of aria.sdk to run receiver.py natively. Like the real SDK, a
+# (re)subscribe stops every stream for a while, so a resubscribe shows up as
+# a gap in RGB.
+FAKE_SDK = """
+import enum, threading, time
+from types import SimpleNamespace
+import numpy as np
+
+RESUBSCRIBE_GAP_S = 1.0
+
+
+class StreamingDataType(enum.IntFlag):
+    Rgb = 1
+    Slam = 2
+    EyeTrack = 4
+    Imu = 8
+
+
+CAMERAS = {
+    StreamingDataType.Rgb: [("CameraId.Rgb", (48, 64, 3))],
+    StreamingDataType.Slam: [("CameraId.Slam1", (32, 40)), ("CameraId.Slam2", (32, 40))],
+}
+
+
+class StreamingClient:
+    def __init__(self):
+        self.subscription_config = SimpleNamespace(subscriber_data_type=0,
+                                                   message_queue_size={})
+        self._observer = None
+        self._stop = threading.Event()
+
+    def set_streaming_client_observer(self, observer):
+        self._observer = observer
+
+    def subscribe(self):
+        self._stop = threading.Event()
+        threading.Thread(target=self._stream, daemon=True,
+                         args=(self._stop, self.subscription_config.subscriber_data_type)).start()
+
+    def unsubscribe(self):
+        self._stop.set()
+
+    def _stream(self, stop, data_types):
+        frame_number = 0
+        if stop.wait(RESUBSCRIBE_GAP_S):
+            return
+        while not stop.wait(0.02):
+            for data_type, cameras in CAMERAS.items():
+                if data_types & data_type:
+                    for camera_id, shape in cameras:
+                        record = SimpleNamespace(camera_id=camera_id, frame_number=frame_number,
+                                                 capture_timestamp_ns=time.monotonic_ns())
+                        self._observer.on_image_received(np.zeros(shape, np.uint8), record)
+            frame_number += 1
+
+
+class StreamingManager:
+    def __init__(self):
+        self.streaming_config = None
+        self.streaming_client = StreamingClient()
+
+    def start_streaming(self):
+        pass
+
+    def stop_streaming(self):
+        pass
+
+
+class DeviceClient:
+    def set_client_config(self, config):
+        pass
+
+    def connect(self):
+        return SimpleNamespace(streaming_manager=StreamingManager())
+
+    def disconnect(self, device):
+        pass
+
+
+DeviceClientConfig = SimpleNamespace
+StreamingInterface = SimpleNamespace(WifiStation="wifi", Usb="usb")
+
+
+class StreamingConfig:
+    def __init__(self):
+        self.security_options = SimpleNamespace(use_ephemeral_certs=False)
+"""
+
+
+def test_control_endpoint():
+    assert control_endpoint("tcp://127.0.0.1:5555") == "tcp://127.0.0.1:5560"
+    assert control_endpoint("ipc:///tmp/aria") == "ipc:///tmp/aria-control"
+    assert control_endpoint("shm://aria?slots=4") == "ipc:///tmp/aria-aria.control"
+
+
+def test_control_requests():
+    resubscribed = []
+    control = ReceiverControl(("rgb", "slam"), {"rgb": 1, "slam": 1, "et": 1, "imu": 8},
+                              lambda s, q: resubscribed.append((s, q["slam"])),
+                              lambda: {"frames": {"rgb": 42}})
+    ctx = zmq.Context()
+    socket = ctx.socket(zmq.REP)
+    socket.setsockopt(zmq.LINGER, 0)
+    socket.bind(CONTROL_ENDPOINT)
+    stop = threading.Event()
+
+    def serve():
+        while not stop.is_set():
+            if socket.poll(50, zmq.POLLIN):
+                serve_request(socket, control.handle)
+
+    served = threading.Thread(target=serve)
+    served.start()
+
+    def request(cmd, **args):
+        return control_request(CONTROL_ENDPOINT, {"cmd": cmd, **args}, timeout=2)
+
+    try:
+        # Shed SLAM, then bring it back — the SDK subscription stays as is
+        state = request("unsubscribe", streams=["slam"])
+        assert state["streams"] == ["rgb"] and state["subscribed"] == ["rgb", "slam"]
+        assert control.muted == {"slam"}
+        assert request("unsubscribe", streams=["slam"])["streams"] == ["rgb"]  # no-op
+        state = request("set_queue_size", stream="slam", size=3)
+        assert state["queue_sizes"] == {"rgb": 1}
+        assert request("subscribe", streams=["slam"])["queue_sizes"] == {"rgb": 1, "slam": 3}
+        assert control.muted == set()
+        assert resubscribed == [(("rgb", "slam"), 3)]  # the queue size only
+
+        # A stream the SDK never delivered widens the subscription
+        assert request("subscribe", streams=["et"])["subscribed"] == ["rgb", "slam", "et"]
+        assert request("unsubscribe", streams=["et"])["streams"] == ["rgb", "slam"]
+        assert resubscribed[1:] == [(("rgb", "slam", "et"), 3)]
+        assert control.muted == {"et"}
+
+        # Pausing never touches the subscription
+        assert request("pause", streams=["slam"])["paused"] == ["slam"]
+        assert control.paused == {"slam"} and control.muted == {"slam", "et"}
+        assert request("pause")["paused"] == ["et", "imu", "rgb", "slam"]
+        assert request("resume", streams=["rgb", "slam"])["paused"] == ["et", "imu"]
+        assert request("resume")["paused"] == []
+        assert control.muted == {"et"}
+        assert len(resubscribed) == 2
+
+        stats = request("stats")
+        assert stats["frames"] == {"rgb": 42} and stats["streams"] == ["rgb", "slam"]
+
+        for cmd, args, error in [
+            ("unsubscribe", {"streams": ["rgb", "slam"]}, "cannot unsubscribe every stream"),
+            ("subscribe", {"streams": ["audio"]}, "Unknown streams"),
+            ("set_queue_size", {"stream": "rgb", "size": 0}, "invalid queue size"),
+            ("reboot", {}, "unknown command"),
+        ]:
+            try:
+                request(cmd, **args)
+            except RuntimeError as e:
+                assert error in str(e), str(e)
+            else:
+                raise AssertionError(f"{cmd} {args} succeeded")
+        assert control.streams == ("rgb", "slam")
+    finally:
+        stop.set()
+        served.join(timeout=3)
+        socket.close()
+        ctx.term()
+
+
+def test_rgb_keeps_streaming_while_slam_is_toggled():
+    fake = Path(tempfile.mkdtemp(prefix="aria-fake-sdk-"))
+    (fake / "aria").mkdir()
+    (fake / "aria" / "__init__.py").write_text("")
+    (fake / "aria" / "sdk.py").write_text(FAKE_SDK)
+    env = {**os.environ, "PYTHONPATH": f"{fake}{os.pathsep}{Path('src').resolve()}"}
+    receiver = subprocess.Popen(
+        [sys.executable, "-m", "aria_arm64_bridge.receiver", "--streams", "rgb,slam",
+         "--zmq-endpoint", RECEIVER_ENDPOINT], env=env, stdout=subprocess.DEVNULL)
+    observer = AriaBridgeObserver(zmq_endpoint=RECEIVER_ENDPOINT, streams=("rgb", "slam"))
+
+    def request(cmd, **args):
+        return control_request(control_endpoint(RECEIVER_ENDPOINT), {"cmd": cmd, **args},
+                               timeout=5)
+
+    def frames():
+        return observer.get_stats()["frames"]
+
+    try:
+        frame, _ = observer.wait_for_frame("slam1", timeout=15)
+        assert frame is not None, "no frames from the receiver"
+        last_rgb, last_change, max_gap = frames()["rgb"], time.monotonic(), 0.0
+
+        def watch(seconds):
+            nonlocal last_rgb, last_change, max_gap
+            end = time.monotonic() + seconds
+            while time.monotonic() < end:
+                time.sleep(0.01)
+                count, now = frames()["rgb"], time.monotonic()
+                max_gap = max(max_gap, now - last_change)
+                if count != last_rgb:
+                    last_rgb, last_change = count, now
+
+        for _ in range(2):
+            request("unsubscribe", streams=["slam"])
+            watch(0.3)  # frames already in flight
+            slam = frames()["slam1"]
+            watch(0.5)
+            assert frames()["slam1"] == slam, "SLAM still sent while unsubscribed"
+            request("subscribe", streams=["slam"])
+            watch(0.5)
+            assert frames()["slam1"] > slam, "SLAM not back after subscribe"
+        # The fake SDK's resubscribe stops RGB for a full second
+        assert max_gap < 0.5, f"RGB stalled for {max_gap:.2f}s while toggling SLAM"
+        assert request("stats")["subscribed"] == ["rgb", "slam"]
+    finally:
+        observer.stop()
+        receiver.terminate()
+        receiver.wait(timeout=5)
+        shutil.rmtree(fake, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_control_endpoint()
+    test_control_requests()
+    test_rgb_keeps_streaming_while_slam_is_toggled()
+    print("PASS — receiver control channel works")
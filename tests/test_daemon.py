@@ -0,0 +1,130 @@
+"""Test aria-bridge-daemon: applications attach to and detach from one session.
+
+The daemon fronts an external fan-out sender here (``launch_receiver=False``),
+since the real receiver needs FEX-Emu and the glasses.
+
+Usage:
+    python3 tests/test_daemon.py
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import zmq
+
+sys.path.insert(0, "src")
+from aria_arm64_bridge import AriaBridge
+from aria_arm64_bridge.daemon import BridgeDaemon, daemon_request
+from aria_arm64_bridge.protocol import CAM_RGB, pack_header
+from aria_arm64_bridge.transport import open_sink
+
+ZMQ_ENDPOINT = "tcp://127.0.0.1:5591"
+CONTROL_ENDPOINT = f"ipc:///tmp/aria-test-daemon-{os.getpid()}"
+
+
+def publish(stop):
+    ctx = zmq.Context()
+    sink = open_sink(ctx, ZMQ_ENDPOINT, fanout=True)
+    sink.socket.setsockopt(zmq.LINGER, 0)
+    seq = 0
+    while not stop.is_set():
+        frame = np.full((24, 32, 3), seq % 256, dtype=np.uint8)
+        sink.send(pack_header(CAM_RGB, time.monotonic_ns(), 32, 24, 3, seq=seq,
+                              send_ns=time.monotonic_ns()), frame)
+        seq += 1
+        time.sleep(0.01)
+    sink.close()
+    ctx.term()
+
+
+def test_attach_and_detach():
+    stop = threading.Event()
+    sender = threading.Thread(target=publish, args=(stop,))
+    sender.start()
+    daemon = BridgeDaemon(CONTROL_ENDPOINT, launch_receiver=False, zmq_endpoint=ZMQ_ENDPOINT)
+    served = threading.Thread(target=daemon.serve_forever)
+    served.start()
+    try:
+        first = AriaBridge(attach=True, daemon_endpoint=CONTROL_ENDPOINT)
+        second = AriaBridge(attach=True, daemon_endpoint=CONTROL_ENDPOINT)
+        t0 = time.monotonic()
+        first.start(timeout=3)
+        startup = time.monotonic() - t0
+        second.start(timeout=3)
+        assert first.get_frame("rgb") is not None and second.get_frame("rgb") is not None
+        assert first.is_running and first.get_stats()["daemon"]["client"] == 1
+        assert len(daemon_request(CONTROL_ENDPOINT, {"cmd": "status"})["clients"]) == 2
+
+        first.stop()  # detaches; the session keeps streaming for the other
+        status = daemon_request(CONTROL_ENDPOINT, {"cmd": "status"})
+        assert list(status["clients"]) == ["2"]
+        assert status["session"]["zmq_endpoint"] == ZMQ_ENDPOINT and status["session"]["fanout"]
+        _, version = second.wait_for_frame("rgb")
+        frame, _ = second.wait_for_frame("rgb", version, timeout=1)
+        assert frame is not None
+        second.stop()
+
+        try:
+            daemon_request(CONTROL_ENDPOINT, {"cmd": "detach", "client": 2})
+        except RuntimeError as e:
+            assert "unknown client" in str(e)
+        else:
+            raise AssertionError("detached twice")
+        daemon_request(CONTROL_ENDPOINT, {"cmd": "shutdown"})
+        served.join(timeout=3)
+        assert not served.is_alive()
+    finally:
+        daemon.stop()
+        served.join(timeout=3)
+        stop.set()
+        sender.join(timeout=3)
+
+    assert startup < 1.0, f"attach took {startup:.2f}s"
+    try:
+        daemon_request(CONTROL_ENDPOINT, {"cmd": "status"}, timeout=0.2)
+    except RuntimeError as e:
+        assert "No aria-bridge-daemon" in str(e)
+    else:
+        raise AssertionError("daemon still answering after shutdown")
+
+
+def test_crashed_clients_expire():
+    stop = threading.Event()
+    sender = threading.Thread(target=publish, args=(stop,))
+    sender.start()
+    endpoint = CONTROL_ENDPOINT + "-ttl"
+    daemon = BridgeDaemon(endpoint, launch_receiver=False, zmq_endpoint=ZMQ_ENDPOINT,
+                          client_ttl=0.6)
+    served = threading.Thread(target=daemon.serve_forever)
+    served.start()
+    try:
+        crashed = daemon_request(endpoint, {"cmd": "attach"})["client"]  # never detaches
+        alive = AriaBridge(attach=True, daemon_endpoint=endpoint)
+        alive.start(timeout=3)
+        time.sleep(1.5)  # well past the TTL; only the heartbeats keep *alive* attached
+
+        status = daemon_request(endpoint, {"cmd": "status"})
+        assert list(status["clients"]) == [str(alive.get_stats()["daemon"]["client"])]
+        assert status["clients_expired"] == 1
+        try:
+            daemon_request(endpoint, {"cmd": "heartbeat", "client": crashed})
+        except RuntimeError as e:
+            assert "unknown client" in str(e)
+        else:
+            raise AssertionError("expired client still attached")
+        alive.stop()
+        assert daemon_request(endpoint, {"cmd": "status"})["clients"] == {}
+    finally:
+        daemon.stop()
+        served.join(timeout=3)
+        stop.set()
+        sender.join(timeout=3)
+
+
+if __name__ == "__main__":
+    test_attach_and_detach()
+    test_crashed_clients_expire()
+    print("PASS — daemon attach/detach works")
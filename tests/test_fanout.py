@@ -0,0 +1,79 @@
+"""Test fan-out: one sender, several observers that each see every frame.
+
+Usage:
+    python3 tests/test_fanout.py
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import zmq
+
+sys.path.insert(0, "src")
+from aria_arm64_bridge import AriaBridgeObserver
+from aria_arm64_bridge.protocol import CAM_RGB, pack_header
+from aria_arm64_bridge.transport import open_sink, parse_shm_endpoint
+
+ENDPOINTS = ("tcp://127.0.0.1:5587", f"shm://aria-fanout-{os.getpid()}?slots=3")
+NUM_FRAMES = 20
+
+
+def publish(endpoint, started):
+    ctx = zmq.Context()
+    sink = open_sink(ctx, endpoint, hwm=4, fanout=True)
+    sink.socket.setsockopt(zmq.LINGER, 0)
+    started.set()
+    time.sleep(0.5)  # let the subscribers connect
+    for i in range(NUM_FRAMES):
+        frame = np.full((24, 32, 3), i, dtype=np.uint8)
+        header = pack_header(CAM_RGB, time.monotonic_ns(), 32, 24, 3, seq=i,
+                             send_ns=time.monotonic_ns())
+        assert sink.send(header, frame)  # PUB never refuses
+        time.sleep(0.02)
+    time.sleep(0.3)
+    sink.close()
+    ctx.term()
+
+
+def fan_out(endpoint):
+    started = threading.Event()
+    t = threading.Thread(target=publish, args=(endpoint, started))
+    t.start()
+    started.wait(2)
+
+    # A subscriber that never reads must not hold up the others
+    ctx = zmq.Context()
+    stalled = ctx.socket(zmq.SUB)
+    stalled.setsockopt(zmq.RCVHWM, 1)
+    stalled.setsockopt(zmq.SUBSCRIBE, b"")
+    stalled.connect(parse_shm_endpoint(endpoint)["notify"] if endpoint.startswith("shm://")
+                    else endpoint)
+
+    observers = [AriaBridgeObserver(zmq_endpoint=endpoint, fanout=True) for _ in range(2)]
+    try:
+        t.join(timeout=10)
+        stats = [o.get_stats() for o in observers]
+        last = [o.get_frame("rgb") for o in observers]
+    finally:
+        for o in observers:
+            o.stop()
+        stalled.close(linger=0)
+        ctx.term()
+
+    for s, frame in zip(stats, last):
+        assert s["frames"]["rgb"] == NUM_FRAMES, (endpoint, s["frames"])
+        assert s["drops"]["rgb"]["transport"] == 0
+        assert frame[0, 0, 0] == NUM_FRAMES - 1
+
+
+def test_every_observer_sees_every_frame():
+    for endpoint in ENDPOINTS:
+        fan_out(endpoint)
+
+
+if __name__ == "__main__":
+    test_every_observer_sees_every_frame()
+    print("PASS — fan-out delivers every frame to every observer")
@@ -0,0 +1,109 @@
+"""Test the IMU stream: batching, columnar wire format and the zero-copy ring.
+
+Usage:
+    python3 tests/test_imu.py
+"""
+
+import sys
+import threading
+import time
+
+import numpy as np
+import zmq
+
+sys.path.insert(0, "src")
+from aria_arm64_bridge import AriaBridgeObserver
+from aria_arm64_bridge.imu import ImuBatcher, ImuRing, unpack_imu_body
+from aria_arm64_bridge.protocol import unpack_imu_header
+from aria_arm64_bridge.transport import channel_endpoint
+
+BASE_ENDPOINT = "tcp://127.0.0.1:5585"
+MS = 1_000_000
+
+
+def sample(i):
+    return i * MS, (i, i + 0.5, -i), (0.1 * i, 0.2, 0.3)
+
+
+def test_batches_round_trip_through_the_wire_format():
+    sent = []
+    batcher = ImuBatcher(1, lambda h, b: sent.append((h, b)) or True,
+                         max_samples=4, interval_ms=1000, host_offset=lambda ts: 500)
+    for i in range(10):
+        batcher.add(*sample(i), now_ns=0)
+    batcher.flush()
+
+    assert [unpack_imu_header(h).count for h, _ in sent] == [4, 4, 2]
+    header = unpack_imu_header(sent[1][0])
+    assert header.imu_id == 1 and header.seq == 1 and header.host_offset_ns == 500
+    timestamps, accel, gyro = unpack_imu_body(sent[1][1], header.count)
+    assert list(timestamps) == [4 * MS, 5 * MS, 6 * MS, 7 * MS]
+    assert list(accel[1]) == [4.5, 5.5, 6.5, 7.5] and list(accel[2]) == [-4, -5, -6, -7]
+    assert np.allclose(gyro[0], [0.4, 0.5, 0.6, 0.7])
+
+
+def test_ring_returns_views_across_wraparound():
+    ring = ImuRing(capacity=8)
+    for start in range(0, 20, 3):
+        n = min(3, 20 - start)
+        ts = np.arange(start, start + n, dtype=np.int64)
+        accel = np.tile(ts.astype(np.float32), (3, 1))
+        ring.push(ts, accel, accel, host_offset_ns=100)
+
+    everything = ring.since()
+    assert list(everything["timestamp_ns"]) == list(range(12, 20))
+    assert list(everything["host_ns"]) == list(range(112, 120))
+    assert list(ring.since(16)["timestamp_ns"]) == [17, 18, 19]
+    assert everything["accel"][-1].tolist() == [19, 19, 19]
+    assert np.shares_memory(ring.since(16), everything)
+    assert ring.total == 20 and len(ring.since(19)) == 0
+
+
+def send_imu(endpoint, batches):
+    ctx = zmq.Context()
+    socket = ctx.socket(zmq.PUSH)
+    socket.setsockopt(zmq.LINGER, 0)
+    socket.bind(endpoint)
+    time.sleep(0.3)
+
+    def send(header, body):
+        socket.send_multipart([header, memoryview(body)])
+        return True
+
+    batcher = ImuBatcher(0, send, max_samples=10, interval_ms=1000)
+    for i in range(batches * 10):
+        batcher.add(*sample(i))
+    time.sleep(0.3)
+    socket.close()
+    ctx.term()
+
+
+def test_observer_get_imu():
+    t = threading.Thread(target=send_imu, args=(channel_endpoint(BASE_ENDPOINT, "imu"), 5))
+    t.start()
+    observer = AriaBridgeObserver(zmq_endpoint=BASE_ENDPOINT, streams=("rgb", "imu"),
+                                  imu_capacity=32)
+    try:
+        deadline = time.monotonic() + 3
+        while time.monotonic() < deadline and observer.get_stats().get("imu", {}).get(0, {}).get("samples", 0) < 50:
+            time.sleep(0.02)
+        samples = observer.get_imu()
+        newer = observer.get_imu(since_ns=45 * MS)
+        stats = observer.get_stats()["imu"][0]
+        missing = observer.get_imu(imu=1)
+    finally:
+        observer.stop()
+        t.join(timeout=5)
+
+    assert stats == {"samples": 50, "kept": 32, "lost_batches": 0}
+    assert samples["timestamp_ns"][0] == 18 * MS and samples["timestamp_ns"][-1] == 49 * MS
+    assert list(newer["timestamp_ns"] // MS) == [46, 47, 48, 49]
+    assert newer["accel"][0].tolist() == [46, 46.5, -46]
+    assert len(missing) == 0
+
+
+if __name__ == "__main__":
+    test_batches_round_trip_through_the_wire_format()
+    test_ring_returns_views_across_wraparound()
+    test_observer_get_imu()
+    print("PASS — IMU stream works")
@@ -0,0 +1,49 @@
+"""Test the mock receiver's load generator: independent camera rates and bursts.
+
+Usage:
+    python3 tests/test_mock_load.py
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, "src")
+from aria_arm64_bridge import AriaBridgeObserver
+
+MOCK_RECEIVER = Path(__file__).resolve().parent.parent / "src" / "receiver" / "mock_receiver.py"
+ZMQ_ENDPOINT = "tcp://127.0.0.1:5602"  # slam1..eye on 5603..5605
+DURATION = 2.0
+
+
+def test_multi_camera_load():
+    observer = AriaBridgeObserver(zmq_endpoint=ZMQ_ENDPOINT, streams=("rgb", "slam", "et"),
+                                  hwm=1000)
+    try:
+        mock = subprocess.run(
+            [sys.executable, str(MOCK_RECEIVER), "--zmq-endpoint", ZMQ_ENDPOINT,
+             "--cameras", "rgb,slam1,slam2,eye", "--fps", "rgb=10,slam=20,eye=5", "--scale", "2",
+             "--width", "64", "--height", "48", "--pool", "4", "--jitter-ms", "3",
+             "--burst", "4", "--burst-every", "1.5", "--hwm", "1000",
+             "--duration", str(DURATION)],
+            capture_output=True, text=True, timeout=30,
+        )
+        assert mock.returncode == 0, mock.stderr
+        time.sleep(0.3)
+        stats = observer.get_stats()
+        frame = observer.get_frame("slam1")
+    finally:
+        observer.stop()
+
+    # Rates are independent and scaled; one burst of 4 per camera at 1.5 s
+    for camera, rate in (("rgb", 20), ("slam1", 40), ("slam2", 40), ("eye", 10)):
+        expected = rate * DURATION + 4
+        assert 0.8 * expected <= stats["frames"][camera] <= expected + 2, (camera, stats["frames"])
+        assert stats["drops"][camera]["transport"] == 0
+    assert sorted(frame.shape[:2]) == [480, 640]  # SLAM frames are 640x480
+
+
+if __name__ == "__main__":
+    test_multi_camera_load()
+    print("PASS — mock load generator works")
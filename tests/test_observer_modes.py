@@ -0,0 +1,488 @@
+"""Test AriaBridgeObserver (package version) processing modes.
+
+Usage:
+    python3 tests/test_observer_modes.py
+"""
+
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+import zmq
+
+sys.path.insert(0, "src")
+from aria_arm64_bridge import AriaBridge, AriaBridgeObserver
+from aria_arm64_bridge.history import FrameHistory, FrameRing
+from aria_arm64_bridge.protocol import (
+    HEADER_FORMAT, HEADER_MAGIC, CAM_RGB, CAM_SLAM1, CAM_SLAM2,
+    FLAG_SDK_SEQ, pack_header, unpack_header,
+)
+from aria_arm64_bridge.transforms import (
+    CALIBRATION_FRAMES, MONO_MODES, OUTPUT_FORMATS, process_frame, selected_path,
+)
+
+
+def send_frames(endpoint, frames, interval=0.01):
+    """Bind a PUSH socket and send ``(cam_id, image[, timestamp_ns])`` tuples."""
+    ctx = zmq.Context()
+    socket = ctx.socket(zmq.PUSH)
+    socket.bind(endpoint)
+    time.sleep(0.3)  # let the observer connect
+
+    for cam_id, image, *ts in frames:
+        if isinstance(image, tuple):  # prebuilt (header, image)
+            header, image = image
+        else:
+            h, w = image.shape[:2]
+            ch = image.shape[2] if image.ndim == 3 else 1
+            header = struct.pack(HEADER_FORMAT, HEADER_MAGIC, cam_id,
+                                 ts[0] if ts else time.monotonic_ns(), w, h, ch)
+        socket.send_multipart([header, memoryview(image)], copy=False)
+        time.sleep(interval)
+
+    time.sleep(0.3)
+    socket.close()
+    ctx.term()
+
+
+def run_sender(endpoint, frames, interval=0.01):
+    t = threading.Thread(target=send_frames, args=(endpoint, frames, interval))
+    t.start()
+    return t
+
+
+def wait_for_count(observer, camera, count, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if observer.get_stats()["frames"][camera] >= count:
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def rgb_frame(value, h=12, w=16):
+    frame = np.zeros((h, w, 3), dtype=np.uint8)
+    frame[:, :, 0] = value  # R
+    frame[:, :, 2] = 200    # B
+    return frame
+
+
+def test_lazy_processes_only_frames_that_are_read():
+    endpoint = "tcp://127.0.0.1:5571"
+    t = run_sender(endpoint, [(CAM_RGB, rgb_frame(i)) for i in range(8)])
+    observer = AriaBridgeObserver(zmq_endpoint=endpoint, lazy=True)
+    try:
+        assert wait_for_count(observer, "rgb", 8), "frames not received"
+        frame, version = observer.get_frame_if_new("rgb")
+        again, same = observer.get_frame_if_new("rgb", version)
+        stats = observer.get_stats()
+    finally:
+        observer.stop()
+        t.join(timeout=5)
+
+    assert version == 8 and again is None and same == version
+    assert frame.shape == (16, 12, 3)
+    assert frame[0, 0, 0] == 200 and frame[0, 0, 2] == 7  # BGR, last frame
+    assert stats["lazy"]["processed"]["rgb"] == 1
+    assert stats["lazy"]["unread"]["rgb"] == 7
+
+
+def test_output_formats_match_reference_conversions():
+    rng = np.random.default_rng(1)
+    rgb = rng.integers(0, 256, (6, 10, 3), dtype=np.uint8)
+    mono = rng.integers(0, 256, (6, 10), dtype=np.uint8)
+
+    rot = np.rot90(rgb, k=-1)
+    r, g, b = (rot[:, :, i].astype(np.uint32) for i in range(3))
+    expected = {
+        "bgr_hwc": rot[:, :, ::-1],
+        "rgb_hwc": rot,
+        "gray": ((77 * r + 150 * g + 29 * b + 128) >> 8).astype(np.uint8),
+        "rgb_chw": rot.transpose(2, 0, 1),
+        "bgr_chw": rot[:, :, ::-1].transpose(2, 0, 1),
+    }
+    for fmt in OUTPUT_FORMATS:
+        out = process_frame("rgb", rgb, fmt)
+        assert out.flags.c_contiguous, fmt
+        assert np.array_equal(out, expected[fmt]), fmt
+
+    mono_rot = np.rot90(mono, k=-1)
+    assert np.array_equal(process_frame("slam1", mono, "gray"), mono_rot)
+    chw = process_frame("slam1", mono, "rgb_chw")
+    assert chw.shape == (3, 10, 6) and all(np.array_equal(c, mono_rot) for c in chw)
+
+
+def test_mono_output_modes():
+    mono = np.arange(60, dtype=np.uint8).reshape(6, 10)
+    stacked = process_frame("slam2", mono)
+    single = process_frame("slam2", mono, mono="single")
+    view = process_frame("slam2", mono, mono="broadcast")
+
+    assert stacked.shape == (10, 6, 3)
+    assert single.shape == (10, 6) and np.array_equal(single, stacked[:, :, 0])
+    assert view.shape == stacked.shape and np.array_equal(view, stacked)
+    assert not view.flags.writeable
+    assert np.array(view).flags.c_contiguous  # materialised on demand
+
+
+def test_tiled_path_is_bit_identical():
+    rng = np.random.default_rng(7)
+    frames = [
+        ("rgb", rng.integers(0, 256, (96, 80, 3), dtype=np.uint8)),
+        ("rgb", rng.integers(0, 256, (7, 5, 3), dtype=np.uint8)),  # no 8-byte words
+        ("slam1", rng.integers(0, 256, (48, 64), dtype=np.uint8)),
+        ("slam2", rng.integers(0, 256, (33, 70), dtype=np.uint8)),
+        ("eye", rng.integers(0, 256, (24, 64), dtype=np.uint8)),
+        ("eye", rng.integers(0, 256, (5, 7), dtype=np.uint8)),
+    ]
+    for cam, raw in frames:
+        for fmt in OUTPUT_FORMATS:
+            for mono in MONO_MODES if raw.ndim == 2 else ("stack",):
+                expected = process_frame(cam, raw, fmt, mono=mono, path="numpy")
+                tiled = process_frame(cam, raw, fmt, mono=mono, path="tiled")
+                assert tiled.shape == expected.shape, (cam, raw.shape, fmt, mono)
+                assert np.array_equal(tiled, expected), (cam, raw.shape, fmt, mono)
+                if mono != "broadcast":
+                    out = np.full_like(expected, 1)
+                    assert process_frame(cam, raw, fmt, out, mono, path="tiled") is out
+                    assert np.array_equal(out, expected), (cam, raw.shape, fmt, mono)
+
+
+def test_auto_path_settles_after_calibration():
+    raw = np.arange(32 * 40 * 3, dtype=np.uint8).reshape(32, 40, 3)
+    expected = process_frame("rgb", raw, "rgb_hwc", path="numpy")
+    assert selected_path("rgb", raw, "rgb_hwc") is None
+    for _ in range(2 * CALIBRATION_FRAMES):
+        assert np.array_equal(process_frame("rgb", raw, "rgb_hwc"), expected)
+    assert selected_path("rgb", raw, "rgb_hwc") in ("tiled", "numpy")
+    assert np.array_equal(process_frame("rgb", raw, "rgb_hwc"), expected)
+
+
+def test_per_call_output_format_in_lazy_mode():
+    endpoint = "tcp://127.0.0.1:5572"
+    t = run_sender(endpoint, [(CAM_RGB, rgb_frame(50))])
+    observer = AriaBridgeObserver(zmq_endpoint=endpoint, lazy=True,
+                                  output_format={"rgb": "rgb_chw"})
+    try:
+        assert wait_for_count(observer, "rgb", 1), "frame not received"
+        chw = observer.get_frame("rgb")
+        hwc = observer.get_frame("rgb", output_format="bgr_hwc")
+        cached = observer.get_frame("rgb", output_format="bgr_hwc")
+    finally:
+        observer.stop()
+        t.join(timeout=5)
+
+    assert chw.shape == (3, 16, 12) and chw[0, 0, 0] == 50  # R plane first
+    assert hwc.shape == (16, 12, 3) and hwc[0, 0, 0] == 200  # B first
+    assert cached is hwc
+
+
+def test_wait_for_frame_and_frames_iterator():
+    endpoint = "tcp://127.0.0.1:5573"
+    t = run_sender(endpoint, [(CAM_RGB, rgb_frame(i)) for i in range(5)], interval=0.05)
+    observer = AriaBridgeObserver(zmq_endpoint=endpoint)
+    try:
+        frame, version = observer.wait_for_frame("rgb", timeout=3.0)
+        assert frame is not None and version >= 1
+
+        seen = [int(f[0, 0, 2]) for f in observer.frames("rgb", timeout=0.5)]
+        assert seen and seen == sorted(seen) and seen[-1] == 4
+
+        # Timeout with nothing new, and stop() releases a blocked waiter
+        assert observer.wait_for_frame("rgb", 5, timeout=0.1) == (None, 5)
+        threading.Timer(0.1, observer.stop).start()
+        t0 = time.monotonic()
+        assert observer.wait_for_frame("rgb", 5) == (None, 5)
+        assert time.monotonic() - t0 < 2.0
+    finally:
+        observer.stop()
+        t.join(timeout=5)
+
+
+def test_bridge_forwards_output_format_to_waiters():
+    endpoint = "tcp://127.0.0.1:5615"
+    t = run_sender(endpoint, [(CAM_RGB, rgb_frame(i)) for i in range(3)])
+    bridge = AriaBridge(receiver_script="receiver.py")
+    bridge._observer = AriaBridgeObserver(zmq_endpoint=endpoint, lazy=True,
+                                          output_format={"rgb": "rgb_chw"})
+    try:
+        assert wait_for_count(bridge._observer, "rgb", 3), "frames not received"
+        frame, _ = bridge.wait_for_frame("rgb", timeout=3.0, output_format="bgr_hwc")
+        assert frame is not None and frame.shape == (16, 12, 3) and frame[0, 0, 0] == 200
+        frame = next(bridge.frames("rgb", timeout=1.0, output_format="bgr_hwc"))
+        assert frame.shape == (16, 12, 3)
+        assert bridge.wait_for_frame("rgb", timeout=1.0)[0].shape == (3, 16, 12)
+    finally:
+        bridge.stop()
+        t.join(timeout=5)
+
+
+def test_bridge_start_fails_fast_when_the_observer_stops():
+    bridge = AriaBridge(receiver_script="receiver.py")
+    bridge._observer = AriaBridgeObserver(zmq_endpoint="tcp://127.0.0.1:5618")
+    bridge._observer.stop()  # e.g. the receive thread died
+    t0 = time.monotonic()
+    try:
+        bridge._wait_for_first_frame(timeout=5.0)
+    except RuntimeError as e:
+        assert "Observer stopped" in str(e)
+    else:
+        raise AssertionError("waited for a frame from a stopped observer")
+    assert time.monotonic() - t0 < 1.0
+
+
+def test_on_frame_callback_drops_stale_frames():
+    endpoint = "tcp://127.0.0.1:5575"
+    t = run_sender(endpoint, [(CAM_RGB, rgb_frame(i)) for i in range(10)], interval=0.01)
+    observer = AriaBridgeObserver(zmq_endpoint=endpoint)
+    seen = []
+
+    def slow_consumer(frame):
+        seen.append(int(frame.image[0, 0, 2]))
+        time.sleep(0.05)
+
+    handle = observer.on_frame("rgb", slow_consumer, workers=1, drop_policy="latest")
+    try:
+        assert wait_for_count(observer, "rgb", 10), "frames not received"
+        time.sleep(0.2)  # let the worker finish the last frame
+        stats = observer.get_stats()["callbacks"][0]
+        observer.remove_callback(handle)
+        assert "callbacks" not in observer.get_stats()
+    finally:
+        observer.stop()
+        t.join(timeout=5)
+
+    assert seen == sorted(seen) and seen[-1] == 9  # newest frame always delivered
+    assert stats["delivered"] == len(seen)
+    assert stats["delivered"] + stats["dropped"] == 10
+    assert stats["dropped"] > 0 and stats["queue_depth"] == 0
+
+
+def test_lazy_callback_workers_get_distinct_frames():
+    endpoint = "tcp://127.0.0.1:5612"
+    t = run_sender(endpoint, [(CAM_RGB, rgb_frame(i), 1000 + i) for i in range(12)],
+                   interval=0.005)
+    observer = AriaBridgeObserver(zmq_endpoint=endpoint, lazy=True)
+    seen = []
+
+    def slow_consumer(frame):
+        seen.append((frame.timestamp, int(frame.image[0, 0, 2])))
+        time.sleep(0.03)
+
+    observer.on_frame("rgb", slow_consumer, workers=2, drop_policy="skip", queue_size=2)
+    try:
+        assert wait_for_count(observer, "rgb", 12), "frames not received"
+        time.sleep(0.3)  # let the workers drain the mailbox
+        stats = observer.get_stats()["callbacks"][0]
+    finally:
+        observer.stop()
+        t.join(timeout=5)
+
+    timestamps = [ts for ts, _ in seen]
+    assert len(set(timestamps)) == len(timestamps), f"duplicate frames: {timestamps}"
+    assert all(value == ts - 1000 for ts, value in seen)  # each image is its own frame
+    assert stats["delivered"] == len(seen) and stats["dropped"] > 0
+    assert stats["delivered"] + stats["dropped"] == 12
+
+
+def test_frame_history_nearest_lookup_across_wraparound():
+    history = FrameHistory(4)
+    for i, ts in enumerate([100, 200, 300, 400, 500, 600]):
+        history.push(ts, i + 1, f"frame{i}")
+
+    assert len(history) == 4
+    assert list(history.timestamps()) == [300, 400, 500, 600]
+    assert history.entry(history.nearest(440))[2] == "frame3"
+    assert history.entry(history.nearest(460))[2] == "frame4"
+    assert history.entry(history.nearest(10))[2] == "frame2"
+    assert history.entry(history.nearest(10_000))[0] == 600
+
+
+def test_get_synced_pairs_frames_by_capture_timestamp():
+    endpoint = "tcp://127.0.0.1:5576"
+    ms = 1_000_000
+    slam = lambda v: np.full((4, 6), v, dtype=np.uint8)
+    # RGB at 0/80/160 ms; SLAM at 20 ms steps with slam2 2 ms behind slam1
+    frames = [(CAM_RGB, rgb_frame(i), i * 80 * ms) for i in range(3)]
+    for i in range(9):
+        frames.append((CAM_SLAM1, slam(i), i * 20 * ms))
+        frames.append((CAM_SLAM2, slam(100 + i), i * 20 * ms + 2 * ms))
+    frames.sort(key=lambda f: f[2])
+
+    t = run_sender(endpoint, frames, interval=0.005)
+    observer = AriaBridgeObserver(zmq_endpoint=endpoint, history=8)
+    try:
+        assert wait_for_count(observer, "slam2", 9), "frames not received"
+        bundle = observer.get_synced(tolerance_ns=5 * ms)
+        exact = observer.get_synced(["rgb", "slam1"], tolerance_ns=0)
+        pair = observer.get_synced(["slam1", "slam2"])
+    finally:
+        observer.stop()
+        t.join(timeout=5)
+
+    assert bundle["rgb"].timestamp == 160 * ms
+    assert bundle["slam1"].timestamp == 160 * ms and bundle["slam1"].image[0, 0, 0] == 8
+    assert bundle["slam2"].timestamp == 162 * ms and bundle["slam2"].image[0, 0, 0] == 108
+    assert exact["rgb"].timestamp == exact["slam1"].timestamp == 160 * ms
+    assert pair["slam2"].timestamp - pair["slam1"].timestamp == 2 * ms
+
+
+def test_frame_ring_is_preallocated_and_capped():
+    record_bytes = 16 + 4 * 6
+    ring = FrameRing(8, max_bytes=4 * record_bytes)
+    buffers = []
+    for i in range(6):
+        out = ring.reserve((4, 6))
+        out[:] = i
+        buffers.append(out)
+        ring.commit(i * 100, i + 1)
+
+    assert ring.depth == 3 and len(ring) == 3 and ring.nbytes() == 4 * record_bytes
+    assert all(np.shares_memory(b, ring._data) for b in buffers)
+    assert [ring.entry(k)[0] for k in range(3)] == [300, 400, 500]
+    assert ring.entry(ring.nearest(440))[2][0, 0] == 4
+    assert ring.entry(ring.nearest(0))[0] == 300
+
+    # The cap is never exceeded: too small for min_depth + 1 slots → error
+    small = FrameRing(8, max_bytes=2 * record_bytes, min_depth=2)
+    try:
+        small.reserve((4, 6))
+    except ValueError as e:
+        assert "cannot hold 3 frames" in str(e)
+    else:
+        raise AssertionError("ring exceeded max_bytes")
+    assert small.nbytes() == 0
+    try:
+        AriaBridgeObserver(history=1, history_prealloc=True)
+    except ValueError as e:
+        assert "history >= 2" in str(e)
+    else:
+        raise AssertionError("history_prealloc accepted history=1")
+
+
+def test_get_history_and_get_at_read_the_preallocated_ring():
+    endpoint = "tcp://127.0.0.1:5577"
+    ms = 1_000_000
+    t = run_sender(endpoint, [(CAM_RGB, rgb_frame(i), i * 10 * ms) for i in range(6)])
+    observer = AriaBridgeObserver(zmq_endpoint=endpoint, history=4, history_prealloc=True)
+    try:
+        assert wait_for_count(observer, "rgb", 6), "frames not received"
+        frames = observer.get_history("rgb")
+        last_two = observer.get_history("rgb", 2)
+        near = observer.get_at("rgb", 31 * ms)
+        too_far = observer.get_at("rgb", 31 * ms, tolerance_ns=ms // 2)
+        latest = observer.get_frame("rgb")
+        stats = observer.get_stats()["history"]["rgb"]
+    finally:
+        observer.stop()
+        t.join(timeout=5)
+
+    assert [f.timestamp for f in frames] == [20 * ms, 30 * ms, 40 * ms, 50 * ms]
+    assert [f.image[0, 0, 2] for f in frames] == [2, 3, 4, 5]  # R lands last in BGR
+    assert [f.timestamp for f in last_two] == [40 * ms, 50 * ms]
+    assert near.timestamp == 30 * ms and too_far is None
+    assert np.shares_memory(latest, frames[-1].image)
+    assert stats == {"depth": 4, "frames": 4, "bytes": 5 * (16 + 16 * 12 * 3)}
+
+
+def test_preallocated_ring_too_big_for_the_cap_is_reported():
+    endpoint = "tcp://127.0.0.1:5613"
+    t = run_sender(endpoint, [(CAM_RGB, rgb_frame(i)) for i in range(3)])
+    observer = AriaBridgeObserver(zmq_endpoint=endpoint, history=4, history_prealloc=True,
+                                  history_max_bytes=1024)  # < 3 slots of 16x12x3
+    try:
+        assert wait_for_count(observer, "rgb", 3), "frames not received"
+        latest = observer.get_frame("rgb")
+        stats = observer.get_stats()["history"]["rgb"]
+        kept = observer.get_history("rgb")
+    finally:
+        observer.stop()
+        t.join(timeout=5)
+
+    assert latest is not None and latest[0, 0, 2] == 2  # still published
+    assert kept == [] and stats["bytes"] == 0 and stats["overflow"] == 3
+
+
+def test_v3_headers_report_drops_per_stage():
+    endpoint = "tcp://127.0.0.1:5578"
+    image = rgb_frame(7)
+
+    def v3(seq, sdk_drops, send_drops):
+        header = pack_header(CAM_RGB, seq * 1000, 16, 12, 3, seq=seq, send_ns=time.monotonic_ns(),
+                             sdk_drops=sdk_drops, send_drops=send_drops, flags=FLAG_SDK_SEQ)
+        return CAM_RGB, (header, image)
+
+    # seq 2 and 5 never arrive; the receiver reports SDK and HWM drops itself.
+    # The slam1 frame is a plain v2 header, which has no drop accounting.
+    frames = [v3(0, 0, 0), v3(1, 0, 0), v3(3, 1, 0), v3(4, 1, 2), v3(6, 3, 2),
+              (CAM_SLAM1, np.zeros((4, 6), dtype=np.uint8))]
+    t = run_sender(endpoint, frames)
+    observer = AriaBridgeObserver(zmq_endpoint=endpoint)
+    try:
+        assert wait_for_count(observer, "slam1", 1), "frames not received"
+        stats = observer.get_stats()
+    finally:
+        observer.stop()
+        t.join(timeout=5)
+
+    header = unpack_header(pack_header(CAM_RGB, 5, 16, 12, 3, seq=9, send_ns=11))
+    assert header.version == 3 and header.seq == 9 and header.send_ns == 11
+    assert stats["frames"]["rgb"] == 5 and stats["frames"]["slam1"] == 1
+    assert stats["drops"] == {"rgb": {"sdk": 3, "send": 2, "transport": 2}}
+
+
+def test_latency_trace_per_stage():
+    endpoint = "tcp://127.0.0.1:5579"
+    ms = 1_000_000
+
+    def traced(seq):
+        now = time.monotonic_ns()
+        header = pack_header(CAM_RGB, seq, 16, 12, 3, seq=seq, send_ns=now,
+                             callback_ns=now - 2 * ms, capture_host_ns=now - 10 * ms)
+        return CAM_RGB, (header, rgb_frame(seq))
+
+    # Headers are built when the list is, so the "transport" stage includes
+    # the sender's pacing; only sdk/receiver durations are exact
+    t = run_sender(endpoint, [traced(i) for i in range(5)])
+    observer = AriaBridgeObserver(zmq_endpoint=endpoint)
+    try:
+        assert wait_for_count(observer, "rgb", 5), "frames not received"
+        latest = observer.get_latest("rgb")
+        latency = observer.get_stats()["latency"]
+    finally:
+        observer.stop()
+        t.join(timeout=5)
+
+    assert latest.timestamp == 4  # capture timestamp from the header
+    timing = latest.timing
+    assert timing.callback_ns - timing.capture_ns == 8 * ms
+    assert timing.capture_ns < timing.callback_ns < timing.send_ns <= timing.receive_ns
+    assert timing.receive_ns <= timing.processed_ns
+    assert set(latency) == {"sdk", "receiver", "transport", "process", "end_to_end"}
+    assert latency["sdk"]["p50_ms"] == 8.0 and latency["receiver"]["p99_ms"] == 2.0
+    assert latency["end_to_end"]["samples"] == 5
+    assert latency["end_to_end"]["p50_ms"] >= 10.0
+
+
+if __name__ == "__main__":
+    test_lazy_processes_only_frames_that_are_read()
+    test_output_formats_match_reference_conversions()
+    test_mono_output_modes()
+    test_tiled_path_is_bit_identical()
+    test_auto_path_settles_after_calibration()
+    test_per_call_output_format_in_lazy_mode()
+    test_wait_for_frame_and_frames_iterator()
+    test_bridge_forwards_output_format_to_waiters()
+    test_bridge_start_fails_fast_when_the_observer_stops()
+    test_on_frame_callback_drops_stale_frames()
+    test_lazy_callback_workers_get_distinct_frames()
+    test_frame_history_nearest_lookup_across_wraparound()
+    test_get_synced_pairs_frames_by_capture_timestamp()
+    test_frame_ring_is_preallocated_and_capped()
+    test_get_history_and_get_at_read_the_preallocated_ring()
+    test_preallocated_ring_too_big_for_the_cap_is_reported()
+    test_v3_headers_report_drops_per_stage()
+    test_latency_trace_per_stage()
+    print("PASS — observer modes work correctly")
@@ -0,0 +1,154 @@
+"""Test per-camera channels: derived endpoints and a multi-channel observer.
+
+Usage:
+    python3 tests/test_streams.py
+"""
+
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+import zmq
+
+sys.path.insert(0, "src")
+from aria_arm64_bridge import AriaBridgeObserver
+from aria_arm64_bridge.protocol import (
+    HEADER_FORMAT, HEADER_MAGIC, CAM_RGB, CAM_SLAM1, CAM_SLAM2,
+    DEFAULT_HWM, channel_setting, pack_header, unpack_header, parse_cameras,
+    parse_stream_settings, parse_streams, stream_channels,
+)
+from aria_arm64_bridge.observer import _StageDrops
+from aria_arm64_bridge.transport import channel_endpoint, open_source
+
+BASE_ENDPOINT = "tcp://127.0.0.1:5581"
+LATEST_ENDPOINT = "tcp://127.0.0.1:5586"
+
+
+def test_channel_endpoints_and_settings():
+    assert channel_endpoint("tcp://127.0.0.1:5555", "rgb") == "tcp://127.0.0.1:5555"
+    assert channel_endpoint("tcp://127.0.0.1:5555", "slam2") == "tcp://127.0.0.1:5557"
+    assert channel_endpoint("ipc:///tmp/aria", "eye") == "ipc:///tmp/aria-eye"
+    assert channel_endpoint("shm://aria?slots=3", "slam1") == "shm://aria-slam1?slots=3"
+    assert parse_streams("rgb, slam,rgb") == ("rgb", "slam")
+    assert parse_stream_settings("slam=8", DEFAULT_HWM)["slam"] == 8
+    assert parse_stream_settings(3, DEFAULT_HWM)["rgb"] == 3
+    assert parse_stream_settings("4", DEFAULT_HWM) == {s: 4 for s in DEFAULT_HWM}
+    hwm = parse_stream_settings("slam=8,slam2=1", DEFAULT_HWM, channels=True)
+    assert channel_setting(hwm, "slam1") == 8 and channel_setting(hwm, "slam2") == 1
+
+    streams = ("rgb", "slam", "imu")
+    assert parse_cameras(None, streams) == ("rgb", "slam1", "slam2")
+    assert stream_channels(streams, parse_cameras("slam2,rgb", streams)) == ("rgb", "slam2", "imu")
+    for bad in ("rgb,audio", ""):
+        try:
+            parse_streams(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad!r} accepted")
+    for bad in ("eye", "slam3"):
+        try:
+            parse_cameras(bad, streams)
+        except ValueError:
+            continue
+        raise AssertionError(f"camera {bad!r} accepted")
+
+
+def send_channel(endpoint, cam_id, count, interval, hwm, sent=None):
+    """Send *count* frames of *cam_id* on its own PUSH socket."""
+    ctx = zmq.Context()
+    socket = ctx.socket(zmq.PUSH)
+    socket.setsockopt(zmq.SNDHWM, hwm)
+    socket.setsockopt(zmq.LINGER, 0)
+    socket.bind(endpoint)
+    time.sleep(0.3)
+    delivered = 0
+    for i in range(count):
+        image = np.full((4, 6), i, dtype=np.uint8) if cam_id != CAM_RGB else \
+            np.full((12, 16, 3), i, dtype=np.uint8)
+        h, w = image.shape[:2]
+        ch = image.shape[2] if image.ndim == 3 else 1
+        header = struct.pack(HEADER_FORMAT, HEADER_MAGIC, cam_id, time.monotonic_ns(), w, h, ch)
+        try:
+            socket.send_multipart([header, memoryview(image)], zmq.NOBLOCK, copy=False)
+            delivered += 1
+        except zmq.Again:
+            pass  # nobody connected to this channel
+        time.sleep(interval)
+    if sent is not None:
+        sent[cam_id] = delivered
+    time.sleep(0.3)
+    socket.close()
+    ctx.term()
+
+
+def test_observer_receives_only_the_cameras_it_uses():
+    sent = {}
+    senders = [
+        threading.Thread(target=send_channel, args=(BASE_ENDPOINT, CAM_RGB, 10, 0.02, 2)),
+        threading.Thread(target=send_channel,
+                         args=(channel_endpoint(BASE_ENDPOINT, "slam1"), CAM_SLAM1, 40, 0.005, 4,
+                               sent)),
+        threading.Thread(target=send_channel,
+                         args=(channel_endpoint(BASE_ENDPOINT, "slam2"), CAM_SLAM2, 40, 0.005, 4,
+                               sent)),
+    ]
+    for t in senders:
+        t.start()
+    observer = AriaBridgeObserver(zmq_endpoint=BASE_ENDPOINT, streams=("rgb", "slam"),
+                                  cameras=("rgb", "slam2"))
+    try:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            frames = observer.get_stats()["frames"]
+            if frames["rgb"] >= 10 and frames["slam2"] >= 40:
+                break
+            time.sleep(0.02)
+        stats = observer.get_stats()
+    finally:
+        observer.stop()
+        for t in senders:
+            t.join(timeout=5)
+
+    assert stats["streams"] == ["rgb", "slam"]
+    assert stats["channels"] == ["rgb", "slam2"]
+    assert stats["frames"]["rgb"] == 10 and stats["frames"]["slam2"] == 40
+    # slam1 had no consumer: nothing was received, nothing even left its socket
+    assert stats["frames"]["slam1"] == 0 and sent[CAM_SLAM1] == 0
+
+
+def test_latest_only_source_returns_the_newest_message():
+    ctx = zmq.Context()
+    push = ctx.socket(zmq.PUSH)
+    push.setsockopt(zmq.LINGER, 0)
+    push.bind(LATEST_ENDPOINT)
+    received = {}
+    try:
+        for latest_only in (False, True):
+            source = open_source(ctx, LATEST_ENDPOINT, hwm=16, latest_only=latest_only)
+            time.sleep(0.3)
+            for seq in range(5):
+                header = pack_header(CAM_RGB, seq, 2, 2, 1, seq=seq, send_ns=0)
+                push.send_multipart([header, b"\0" * 4])
+            time.sleep(0.3)
+            header, _, _ = source.recv()
+            received[latest_only] = (unpack_header(header).seq, source.skipped)
+            source.close()
+    finally:
+        push.close()
+        ctx.term()
+    assert received == {False: (0, 0), True: (4, 4)}
+
+    # Skipped frames are not counted as lost in transport
+    drops = _StageDrops()
+    drops.update(unpack_header(pack_header(CAM_RGB, 0, 2, 2, 1, seq=0, send_ns=0)))
+    drops.update(unpack_header(pack_header(CAM_RGB, 0, 2, 2, 1, seq=6, send_ns=0)), superseded=4)
+    assert drops.as_dict()["transport"] == 1
+
+
+if __name__ == "__main__":
+    test_channel_endpoints_and_settings()
+    test_observer_receives_only_the_cameras_it_uses()
+    test_latest_only_source_returns_the_newest_message()
+    print("PASS — per-camera channels work")